@@ -0,0 +1,1442 @@
+"""
+bench.py
+Benchmark untuk bagian-bagian paket scraper yang sensitif performa. Hanya
+mengukur waktu; cek kebenaran (hasil sama dengan versi lama, dsb.) ada di
+tests/, jalankan dengan `python -m pytest`.
+
+Contoh pemakaian:
+    python bench.py store
+    python bench.py store --n 100000
+    python bench.py report --n 50000
+    python bench.py poster --n 50
+    python bench.py wrap --n 2000
+    python bench.py render --n 64
+    python bench.py renditions --n 5
+    python bench.py cache --n 40
+    python bench.py bgcache --n 40
+    python bench.py extract --corpus folder_html/
+    python bench.py clean --n 20000
+    python bench.py dedup --n 100000
+    python bench.py feed --n 500
+    python bench.py http --n 50
+    python bench.py ig --n 100
+    python bench.py publish --n 5
+    python bench.py body --n 200
+    python bench.py metrics --n 2000
+    python bench.py accounts --n 500
+    python bench.py startup
+    python bench.py e2e                 # 10, 100 dan 1000 artikel
+    python bench.py e2e --n 100 --results bench_results.jsonl
+"""
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter, deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from openpyxl import Workbook, load_workbook
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageFont
+import requests
+
+# Benchmark render mengukur render sungguhan, bukan hit RenderCache (lihat bench_cache)
+os.environ.setdefault("RENDER_CACHE_MB", "0")
+
+import scraper
+
+
+def _fake_article(i):
+    return {
+        "link": f"https://news.example.com/artikel/{i}",
+        "title": f"Judul berita nomor {i}",
+        "paragraphs": ["Lorem ipsum dolor sit amet " * 8] * 3,
+        "meta": {"og:title": f"Judul {i}", "og:image": None, "og:description": None},
+    }
+
+
+def bench_store(n=100_000, chunk=10_000):
+    """Waktu per insert harus datar walaupun isi store makin banyak."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = scraper.ArticleStore(os.path.join(tmp, "bench.db"))
+        print(f"{'artikel':>10} {'us/insert':>10} {'us/lookup':>10}")
+        for start in range(0, n, chunk):
+            t0 = time.perf_counter()
+            for i in range(start, start + chunk):
+                store.add(_fake_article(i))
+            t_insert = (time.perf_counter() - t0) / chunk
+
+            t0 = time.perf_counter()
+            for i in range(start, start + chunk, 10):
+                _ = f"https://news.example.com/artikel/{i}" in store
+            t_lookup = (time.perf_counter() - t0) / (chunk // 10)
+
+            store.update_status(f"https://news.example.com/artikel/{start}", "done", "abc")
+            print(f"{start + chunk:>10} {t_insert * 1e6:>10.1f} {t_lookup * 1e6:>10.1f}")
+        store.close()
+
+
+def _random_article(rng, i, words):
+    return {
+        "link": f"https://news{i % 50}.example.com/artikel/{i}",
+        "title": " ".join(rng.choice(words) for _ in range(10)),
+        "paragraphs": [" ".join(rng.choice(words) for _ in range(40)) for _ in range(4)],
+        "meta": {},
+    }
+
+
+def _edit_article(rng, article, edits, words):
+    """Salinan artikel di URL lain dengan beberapa kata diganti (berita sindikasi)."""
+    paragraphs = [p.split() for p in article["paragraphs"]]
+    for _ in range(edits):
+        p = rng.choice(paragraphs[:scraper.DEDUP_PARAGRAPHS])
+        p[rng.randrange(len(p))] = rng.choice(words)
+    return dict(article, link=article["link"].replace("news", "mirror"),
+                paragraphs=[" ".join(p) for p in paragraphs])
+
+
+def bench_dedup(n=100_000, probes=2_000):
+    """
+    Index SimHash: waktu load sketch dari store berisi n artikel, waktu
+    lookup, deteksi salinan yang diedit, dan false positive untuk artikel
+    lain dengan kosakata yang sama. URL kanonik dan ambang deteksi dicek di
+    tests/test_store.py.
+    """
+    rng = random.Random(5)
+    words = (SAMPLE_TITLE + " " + SAMPLE_BODY).split()
+    articles = [_random_article(rng, i, words) for i in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "legacy.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump(articles, f)
+        store = scraper.ArticleStore(os.path.join(tmp, "bench.db"))
+        t0 = time.perf_counter()
+        store.import_json(legacy)
+        print(f"import + sketch {n} artikel: {time.perf_counter() - t0:.1f} s")
+        store.close()
+
+        store = scraper.ArticleStore(os.path.join(tmp, "bench.db"))
+        t0 = time.perf_counter()
+        store.near_duplicate(0)
+        print(f"load index dari sketch tersimpan: {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+        for edits in (0, 2, 5):
+            copies = [_edit_article(rng, rng.choice(articles), edits, words) for _ in range(probes)]
+            sketches = [scraper.article_sketch(a) for a in copies]
+            t0 = time.perf_counter()
+            found = sum(store.near_duplicate(s) is not None for s in sketches)
+            elapsed = (time.perf_counter() - t0) / probes
+            print(f"salinan, {edits} kata diganti: terdeteksi {found}/{probes}, "
+                  f"{elapsed * 1e6:.0f} us/lookup")
+
+        fresh = [scraper.article_sketch(_random_article(rng, n + i, words)) for i in range(probes)]
+        false_positive = sum(store.near_duplicate(s) is not None for s in fresh)
+        print(f"artikel lain: false positive {false_positive}/{probes}")
+        store.close()
+
+
+def _trends_rss(n, news_per_item=3, changed=()):
+    """RSS mirip Google Trends: n item, tiap item punya beberapa ht:news_item."""
+    items = []
+    for i in range(n):
+        pub = "Mon, 01 Jan 2024 10:00:00 +0700" if i not in changed else "Mon, 01 Jan 2024 11:00:00 +0700"
+        news = "".join(
+            f"<ht:news_item><ht:news_item_title>Berita {i}-{k}</ht:news_item_title>"
+            f"<ht:news_item_url>https://news{k}.example.com/{i}/{k}?utm_source=trends</ht:news_item_url>"
+            f"</ht:news_item>"
+            for k in range(news_per_item + (1 if i in changed else 0))
+        )
+        items.append(f"<item><title>trend {i}</title><ht:approx_traffic>1000+</ht:approx_traffic>"
+                     f"<pubDate>{pub}</pubDate>{news}</item>")
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" '
+        'xmlns:ht="https://trends.google.com/trending/rss"><channel><title>Daily Search Trends</title>'
+        + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def _parse_news_urls_legacy(rss_content):
+    """parse_news_urls versi lama (ET.fromstring + findall), untuk pembanding."""
+    root = ET.fromstring(rss_content)
+    ns = {'ht': 'https://trends.google.com/trending/rss'}
+    urls = []
+    for item in root.findall('./channel/item'):
+        for news_item in item.findall('ht:news_item', ns):
+            url_tag = news_item.find('ht:news_item_url', ns)
+            if url_tag is not None and url_tag.text:
+                urls.append(url_tag.text)
+    return urls
+
+
+def bench_feed(n=500):
+    """
+    Parse feed (iterparse vs versi lama) dan FeedTracker: waktu run pertama
+    (semua URL baru), run kedua di feed yang sama, dan feed dengan satu item
+    berubah. Kebenarannya (termasuk rollback saat crash) dicek di
+    tests/test_feed.py.
+    """
+    content = _trends_rss(n)
+    for name, fn in [("lama", _parse_news_urls_legacy), ("baru", scraper.parse_news_urls)]:
+        t0 = time.perf_counter()
+        for _ in range(20):
+            fn(content)
+        print(f"{name:>5}: {(time.perf_counter() - t0) / 20 * 1e3:.1f} ms/feed ({n} item)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = scraper.FeedTracker(os.path.join(tmp, "feed.db"))
+        feed = "https://trends.google.com/trending/rss?geo=ID"
+        runs = [
+            ("run pertama", content),
+            ("feed sama", content),
+            ("1 item berubah", _trends_rss(n, changed={7})),
+        ]
+        for label, body in runs:
+            t0 = time.perf_counter()
+            fresh = tracker.new_urls(feed, body)
+            print(f"{label:>15}: {len(fresh):>5} URL baru, {(time.perf_counter() - t0) * 1e3:.1f} ms")
+        tracker.close()
+
+
+def _save_to_excel_legacy(data, filename):
+    """save_to_excel versi lama (load_workbook + save per baris), untuk pembanding."""
+    if not os.path.exists(filename):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(scraper.REPORT_HEADERS)
+        wb.save(filename)
+
+    wb = load_workbook(filename)
+    ws = wb.active
+    last_row = ws.max_row
+    if last_row > 1:
+        last_no = ws.cell(row=last_row, column=1).value
+        next_no = last_no + 1 if isinstance(last_no, int) else 1
+    else:
+        next_no = 1
+    ws.append([
+        next_no,
+        data.get("sosmed", ""),
+        data.get("username", ""),
+        data.get("url_site", ""),
+        data.get("url_sosmed", ""),
+        data.get("date_time_post", datetime.now().strftime("%Y-%m-%d %I:%M:%S")),
+        data.get("status", "done")
+    ])
+    wb.save(filename)
+
+
+def _fake_report_row(i):
+    return {
+        "sosmed": "IG",
+        "username": "Breaking News",
+        "url_site": f"https://news.example.com/artikel/{i}",
+        "url_sosmed": f"https://instagram.com/p/{i}",
+        "status": "done",
+    }
+
+
+def bench_report(n=50_000, samples=20):
+    """
+    Bandingkan ReportSink dengan save_to_excel lama.
+
+    Versi lama O(n) per baris, jadi untuk n besar hanya diukur `samples` baris
+    di sheet yang sudah berisi n baris lalu diekstrapolasi.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xlsx")
+
+        sink = scraper.ReportSink(path)
+        t0 = time.perf_counter()
+        for i in range(n):
+            sink.append(_fake_report_row(i))
+        sink.flush()
+        t_new = time.perf_counter() - t0
+        print(f"ReportSink      : {n} baris dalam {t_new:.2f}s ({t_new / n * 1e6:.0f} us/baris)")
+
+        t0 = time.perf_counter()
+        for i in range(samples):
+            _save_to_excel_legacy(_fake_report_row(n + i), path)
+        t_old = (time.perf_counter() - t0) / samples
+        print(f"save_to_excel lama: {t_old * 1e3:.0f} ms/baris di sheet {n} baris "
+              f"(~{t_old * n / 2:.0f}s untuk mengisi {n} baris dari nol)")
+
+    # Beberapa proses (worker + `report`) menulis ke file yang sama
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xlsx")
+        per_process = 200
+        procs = [multiprocessing.Process(target=_report_writer, args=(path, per_process, flush_every))
+                 for flush_every in (0, 0, 50)]
+        t0 = time.perf_counter()
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        scraper.ReportSink(path).flush()
+        numbers = [row[0] for row in load_workbook(path, read_only=True).active.iter_rows(min_row=2, values_only=True)]
+        print(f"{len(procs)} proses x {per_process} baris (1 proses flush tiap 50): {len(numbers)} baris "
+              f"dalam {time.perf_counter() - t0:.2f}s")
+
+
+def _report_writer(path, n, flush_every):
+    sink = scraper.ReportSink(path)
+    for i in range(n):
+        sink.append(_fake_report_row(i))
+        if flush_every and i % flush_every == flush_every - 1:
+            sink.flush()
+
+
+SAMPLE_TITLE = "Harga Emas Antam Hari Ini Naik Tajam, Investor Ramai Borong Logam Mulia"
+SAMPLE_BODY = (
+    "Harga emas batangan produksi PT Aneka Tambang Tbk (Antam) kembali naik pada "
+    "perdagangan hari ini. Kenaikan ini terjadi di tengah pelemahan dolar AS dan "
+    "meningkatnya permintaan aset aman. Sejumlah butik emas dilaporkan ramai "
+    "dikunjungi pembeli sejak pagi, bahkan beberapa pecahan sempat habis terjual."
+)
+
+
+def bench_render(n=64):
+    """Render n poster: berurutan di proses utama vs RenderPool."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bg_path, logo_path = _make_assets(tmp)
+        jobs = [
+            {
+                "title": SAMPLE_TITLE,
+                "body": SAMPLE_BODY,
+                "hashtag": "#KAMUHARUSTAU",
+                "bg_path": bg_path,
+                "output_file": os.path.join(tmp, f"poster_{i}.jpg"),
+            }
+            for i in range(n)
+        ]
+
+        t0 = time.perf_counter()
+        for job in jobs:
+            scraper.buat_poster(job["title"], job["body"], job["hashtag"], logo_path,
+                                job["bg_path"], job["output_file"])
+        t_seq = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        list(scraper.render_posters(jobs, logo_path=logo_path))
+        t_pool = time.perf_counter() - t0
+
+        print(f"berurutan : {n / t_seq:.1f} poster/s")
+        print(f"RenderPool: {n / t_pool:.1f} poster/s ({scraper.RENDER_WORKERS} worker)")
+
+
+def _clean_text_legacy(text):
+    """clean_text versi lama (5x replace + 2x re.sub), untuk pembanding."""
+    if not text:
+        return ""
+    text = text.replace('\u2013', '-')
+    text = text.replace('\u2014', '-')
+    text = text.replace('\u00A0', ' ')
+    text = text.replace('\u200B', '')
+    text = text.replace('\u2026', '...')
+    text = re.sub(r'[^\x20-\x7E\u00A0-\u00FF\u0100-\u017F\u0180-\u024F\u1E00-\u1EFF]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+# Rentang karakter untuk teks acak: ASCII, kontrol, whitespace Unicode,
+# Latin, karakter yang diganti clean_text, CJK, emoji, surrogate
+_CLEAN_RANGES = [
+    (0x00, 0x7F), (0x80, 0x24F), (0x1E00, 0x1EFF), (0x2000, 0x206F),
+    (0x2013, 0x2014), (0x2026, 0x2026), (0xA0, 0xA0), (0x200B, 0x200B),
+    (0x1680, 0x1680), (0x3000, 0x3000), (0x4E00, 0x4E50), (0x1F600, 0x1F64F),
+    (0xD800, 0xD810), (0xFEFF, 0xFEFF),
+]
+
+
+def _random_text(rng, max_len=200):
+    chars = []
+    for _ in range(rng.randint(0, max_len)):
+        lo, hi = rng.choice(_CLEAN_RANGES)
+        chars.append(chr(rng.randint(lo, hi)))
+    return "".join(chars)
+
+
+def bench_clean(n=20_000):
+    """
+    Throughput clean_text baru vs lama di teks berita (kesamaan hasil dicek
+    di tests/test_scrape.py).
+    """
+    rng = random.Random(2024)
+    # Ukuran teks seperti judul/paragraf hasil extractor (pemanggil utama)
+    words = (SAMPLE_TITLE + " " + SAMPLE_BODY + " Rp1,5 triliun \u2014 \u201ckutipan\u201d caf\u00e9").split()
+    corpus = [" ".join(rng.choice(words) for _ in range(rng.randint(5, 60))) + "\n\t "
+              for _ in range(n // 4)]
+    total_mb = sum(len(t.encode("utf-8")) for t in corpus) / 1e6
+    for name, fn in [("lama", _clean_text_legacy), ("baru", scraper.clean_text)]:
+        t0 = time.perf_counter()
+        for _ in range(5):
+            for text in corpus:
+                fn(text)
+        elapsed = time.perf_counter() - t0
+        print(f"{name:>5}: {total_mb * 5 / elapsed:.1f} MB/s")
+
+
+def _synthetic_pages(n):
+    """Halaman berita sintetis: head berat, script, nav, artikel dengan tag inline."""
+    rng = random.Random(7)
+    words = (SAMPLE_TITLE + " " + SAMPLE_BODY + " Rp1,5 triliun — “kutipan” café").split()
+    pages = []
+    for i in range(n):
+        paragraphs = "".join(
+            f"<p>{' '.join(rng.choice(words) for _ in range(rng.randint(5, 60)))} "
+            f"<a href='/tag/{k}'>tautan</a> <strong>penting</strong>.</p>\n"
+            for k in range(rng.randint(5, 25))
+        )
+        html = f"""<!DOCTYPE html><html lang="id"><head><meta charset="utf-8">
+<title>{SAMPLE_TITLE} ({i})</title>
+<meta name="description" content="deskripsi">
+<meta property="og:title" content="{SAMPLE_TITLE}">
+<meta property="og:image" content="https://cdn.example.com/img/{i}/image.jpg">
+<meta property="og:description" content="{SAMPLE_BODY[:120]}">
+{"<script>var x = '" + "a" * 2000 + "';</script>" * 20}
+<style>{".c{color:red}" * 500}</style></head>
+<body><nav>{"<a href='/k'>Kategori</a>" * 200}</nav>
+<article><h1>{SAMPLE_TITLE}</h1>{paragraphs}</article>
+<footer><p>Copyright (c) Media Contoh. Seluruh hak cipta dilindungi undang-undang.</p></footer>
+</body></html>"""
+        pages.append(html.encode("utf-8"))
+    return pages
+
+
+def bench_extract(n=200, corpus=None):
+    """
+    Bandingkan backend extractor HTML dengan backend referensi ("soup").
+
+    `corpus` = folder berisi file .html hasil simpan halaman berita; kalau
+    kosong dipakai halaman sintetis.
+    """
+    if corpus:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(corpus, "*.htm*"))):
+            with open(path, "rb") as f:
+                pages.append(f.read())
+    else:
+        pages = _synthetic_pages(n)
+    total_mb = sum(len(p) for p in pages) / 1e6
+    print(f"{len(pages)} halaman, {total_mb:.1f} MB")
+
+    reference = [scraper.get_extractor("soup")(page) for page in pages]
+    for name in sorted(scraper.EXTRACTORS):
+        extract = scraper.get_extractor(name)
+        t0 = time.perf_counter()
+        results = [extract(page) for page in pages]
+        elapsed = time.perf_counter() - t0
+
+        same = sum(r == ref for r, ref in zip(results, reference))
+        print(f"{name:>9}: {elapsed / len(pages) * 1e3:6.1f} ms/halaman "
+              f"{total_mb / elapsed:6.1f} MB/s, sama dengan referensi {same}/{len(pages)}")
+
+
+def _wrap_text_legacy(draw, text, font, max_width):
+    """wrap_text versi lama (textbbox untuk tiap baris percobaan), untuk pembanding."""
+    words = text.split()
+    lines, line = [], ""
+    for word in words:
+        test_line = line + " " + word if line else word
+        bbox = draw.textbbox((0, 0), test_line, font=font)
+        w = bbox[2] - bbox[0]
+        if w <= max_width:
+            line = test_line
+        else:
+            lines.append(line)
+            line = word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _buat_poster_legacy(content_title, content_body, hashtag, logo_path, bg_path, output_file):
+    """buat_poster versi lama (font & logo di-load tiap panggilan), untuk pembanding."""
+    bg = Image.open(bg_path).convert("RGB")
+    width, height = bg.size
+    font_hashtag = ImageFont.truetype(scraper.FONT_1, scraper.FONTSIZE_1)
+    font_title = ImageFont.truetype(scraper.FONT_2, scraper.FONTSIZE_2)
+    font_body = ImageFont.truetype(scraper.FONT_3, scraper.FONTSIZE_3)
+
+    dummy_img = Image.new("RGB", (width, height))
+    dummy_draw = ImageDraw.Draw(dummy_img)
+
+    lines_title = _wrap_text_legacy(dummy_draw, content_title, font_title, int(width*0.9))
+    lines_body = _wrap_text_legacy(dummy_draw, content_body, font_body, int(width*0.9))
+
+    spacing_title, spacing_body = 5, 6
+    total_text_height = (len(lines_title) * (font_title.size + spacing_title) +
+                         len(lines_body) * (font_body.size + spacing_body))
+    footer_height = total_text_height + 40*2 + 80
+
+    new_height = height + footer_height
+    img = Image.new("RGB", (width, new_height), "white")
+    img.paste(bg, (0, 0))
+    draw = ImageDraw.Draw(img)
+    footer_y = height
+    draw.rectangle([0, footer_y, width, new_height], fill=(253, 34, 66))
+
+    logo = Image.open(logo_path).convert("RGBA")
+    max_logo_width = int(width * 0.15)
+    ratio = max_logo_width / logo.width
+    logo = logo.resize((max_logo_width, int(logo.height * ratio)))
+    img.paste(logo, (30, 30), logo)
+
+    bbox = draw.textbbox((0, 0), hashtag, font=font_hashtag)
+    text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    pad_x, pad_y = 20, 10
+    box_x1 = (width - text_w)//2 - pad_x
+    box_y1 = footer_y + 20
+    box_x2 = box_x1 + text_w + pad_x*2
+    box_y2 = box_y1 + text_h + pad_y*2
+    draw.rectangle([box_x1, box_y1, box_x2, box_y2], fill="white")
+    draw.text(((width-text_w)//2, box_y1+pad_y), hashtag, font=font_hashtag, fill=(253,34,66))
+
+    y_text = box_y2 + 30
+    for line in lines_title:
+        draw.text((50, y_text), line, font=font_title, fill="white")
+        y_text += font_title.size + spacing_title
+    y_text += 20
+    for line in lines_body:
+        draw.text((50, y_text), line, font=font_body, fill="white")
+        y_text += font_body.size + spacing_body
+
+    img.save(output_file)
+
+
+def _make_assets(tmp, size=(1200, 675)):
+    """Background gradasi dan logo semi-transparan untuk benchmark."""
+    bg_path = os.path.join(tmp, "bg.jpg")
+    bg = Image.linear_gradient("L").resize(size).convert("RGB")
+    bg.save(bg_path, "JPEG")
+
+    logo_path = os.path.join(tmp, "logo.png")
+    logo = Image.new("RGBA", (400, 160), (255, 255, 255, 0))
+    ImageDraw.Draw(logo).ellipse([0, 0, 399, 159], fill=(253, 34, 66, 200))
+    logo.save(logo_path)
+    return bg_path, logo_path
+
+
+def bench_poster(n=50):
+    """PosterRenderer vs buat_poster lama (hasil identik per piksel, lihat tests/test_poster.py)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bg_path, logo_path = _make_assets(tmp)
+        out_path = os.path.join(tmp, "out.jpg")
+
+        timings = {}
+        for name, fn in [("lama", _buat_poster_legacy), ("PosterRenderer", scraper.buat_poster)]:
+            t0 = time.perf_counter()
+            for _ in range(n):
+                fn(SAMPLE_TITLE, SAMPLE_BODY, "#KAMUHARUSTAU", logo_path, bg_path, out_path)
+            timings[name] = (time.perf_counter() - t0) / n
+            print(f"{name:>15}: {timings[name] * 1e3:.1f} ms/poster")
+        print(f"speedup: {timings['lama'] / timings['PosterRenderer']:.1f}x")
+
+
+def _photo_background(tmp, size=(1200, 675)):
+    """Background mirip foto (gradasi + noise halus), jauh lebih sulit dikompres dari gradasi polos."""
+    bg_path = os.path.join(tmp, "photo.jpg")
+    noise = Image.effect_noise(size, 60).filter(ImageFilter.GaussianBlur(1))
+    gradient = Image.linear_gradient("L").resize(size)
+    Image.merge("RGB", (noise, gradient, ImageChops.multiply(noise, gradient))).save(bg_path, "JPEG", quality=90)
+    return bg_path
+
+
+def bench_renditions(n=5):
+    """
+    Byte yang di-upload per artikel: satu poster JPEG default ke semua platform
+    vs rendition per platform (RENDITIONS) yang di-encode di bawah batas KB-nya.
+    Kolom baseline = JPEG non-progressive, webp = POSTER_FORMAT=webp. Batas
+    KB per platform dicek di tests/test_poster.py.
+    """
+    platforms = sorted(scraper.RENDITIONS)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Background di pipeline sudah di-resize ImageCache ke POSTER_WIDTH
+        size = (scraper.POSTER_WIDTH, scraper.POSTER_WIDTH * 9 // 16)
+        bg_path, logo_path = _make_assets(tmp, size)
+        renderer = scraper.PosterRenderer(logo_path)
+        backgrounds = {"gradasi": bg_path, "foto": _photo_background(tmp, size)}
+
+        for name, bg_path in backgrounds.items():
+            img = renderer.compose(SAMPLE_TITLE, SAMPLE_BODY, "#KAMUHARUSTAU", bg_path)
+            baseline = len(renderer._save(img, None))
+
+            t0 = time.perf_counter()
+            for _ in range(n):
+                renditions = scraper.poster_renditions(img, platforms)
+            ms = (time.perf_counter() - t0) / n * 1e3
+
+            print(f"\n== background {name}, poster {img.width}x{img.height}, "
+                  f"rendition {ms:.0f} ms/artikel")
+            print(f"   {'platform':<9}{'ukuran':>11}{'lama KB':>9}{'baru KB':>9}{'batas':>7}{'q':>4}"
+                  f"{'baseline':>10}{'webp':>7}")
+            for platform in platforms:
+                size, max_kb = scraper.RENDITIONS[platform]
+                canvas = scraper.fit_canvas(img, size)
+                data = renditions[platform]
+                _, quality = scraper.encode_to_budget(canvas, max_kb * 1024, progressive=scraper.POSTER_PROGRESSIVE)
+                baseline_jpeg, _ = scraper.encode_to_budget(canvas, max_kb * 1024)
+                webp, _ = scraper.encode_to_budget(canvas, max_kb * 1024, "WEBP")
+                print(f"   {platform:<9}{'%dx%d' % canvas.size:>11}{baseline / 1024:>9.0f}{len(data) / 1024:>9.0f}"
+                      f"{max_kb:>7}{quality:>4}{len(baseline_jpeg) / 1024:>10.0f}{len(webp) / 1024:>7.0f}")
+            total = sum(len(data) for data in renditions.values())
+            change = (total / (baseline * len(platforms)) - 1) * 100
+            print(f"   total upload per artikel: {baseline * len(platforms) / 1024:.0f} KB -> "
+                  f"{total / 1024:.0f} KB ({change:+.1f}%)")
+
+
+def bench_cache(n=40):
+    """
+    RenderCache: batch n poster (+ rendition semua platform) yang crash di
+    tengah lalu diulang penuh; poster yang sudah jadi hanya lookup cache.
+    Hit/miss, hasil cache vs render ulang dan batas ukuran dicek di
+    tests/test_poster.py.
+    """
+    platforms = sorted(scraper.RENDITIONS)
+    with tempfile.TemporaryDirectory() as tmp:
+        size = (scraper.POSTER_WIDTH, scraper.POSTER_WIDTH * 9 // 16)
+        bg_path, logo_path = _make_assets(tmp, size)
+        scraper.poster._render_cache = cache = scraper.RenderCache(os.path.join(tmp, "cache"), max_bytes=200 * 1024 * 1024)
+        titles = [f"{SAMPLE_TITLE} ({i})" for i in range(n)]
+
+        def run(batch):
+            t0 = time.perf_counter()
+            for title in batch:
+                scraper.render_poster_set(title, SAMPLE_BODY, "#KAMUHARUSTAU", bg_path, None, platforms, logo_path)
+            return time.perf_counter() - t0
+
+        t_crash = run(titles[: n // 2])
+        before = cache.stats()
+        t_retry = run(titles)
+        after = cache.stats()
+        hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+        print(f"run pertama (crash di {n // 2}): {t_crash / (n // 2) * 1e3:.1f} ms/poster")
+        print(f"run ulang {n} poster: {hits} hit, {misses} miss, {t_retry:.2f} s "
+              f"(render penuh {t_crash / (n // 2) * n:.2f} s)")
+
+        t0 = time.perf_counter()
+        run(titles)
+        print(f"run ketiga, semua hit: {(time.perf_counter() - t0) / n * 1e3:.2f} ms/poster")
+        scraper.poster._render_cache = None
+
+
+def _text_corpus(n):
+    """
+    Judul dan isi artikel dari STORE kalau ada, ditambah teks sintetis
+    (kata acak dari contoh berita) sampai n teks.
+    """
+    corpus = []
+    if os.path.exists(scraper.STORE):
+        for entry in scraper.get_store().iter_articles():
+            if entry.get("title"):
+                corpus.append(entry["title"])
+            corpus.extend(entry.get("paragraphs", [])[:2])
+            if len(corpus) >= n:
+                break
+
+    rng = random.Random(42)
+    words = (SAMPLE_TITLE + " " + SAMPLE_BODY).split()
+    while len(corpus) < n:
+        corpus.append(" ".join(rng.choice(words) for _ in range(rng.randint(3, 60))))
+    return corpus
+
+
+def bench_wrap(n=2000):
+    """
+    wrap_text baru vs lama: waktu wrap n teks (judul/isi artikel) dan body
+    300 karakter. Pemotongan baris yang sama dicek di tests/test_poster.py.
+    """
+    draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    font = ImageFont.truetype(scraper.FONT_3, scraper.FONTSIZE_3)
+    corpus = _text_corpus(n)
+    for name, fn in [("lama", _wrap_text_legacy), ("baru", scraper.wrap_text)]:
+        t0 = time.perf_counter()
+        for text in corpus:
+            fn(draw, text, font, 972)
+        print(f"{name:>5}: {(time.perf_counter() - t0) / len(corpus) * 1e6:.0f} us per teks ({len(corpus)} teks)")
+
+    body = SAMPLE_BODY[:300]
+    reps = 500
+    for name, fn in [("lama", _wrap_text_legacy), ("baru", scraper.wrap_text)]:
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            fn(draw, body, font, 972)
+        print(f"{name:>5}: {(time.perf_counter() - t0) / reps * 1e6:.0f} us per body 300 karakter")
+
+
+def _build_poster_body_legacy(result):
+    """build_poster_body versi lama (300 karakter + rfind + re.split), untuk pembanding."""
+    body = " ".join(result["paragraphs"][:2]) if result["paragraphs"] else (result["meta"].get("og:description") or "")
+    body = body.strip()
+
+    if len(body) < 300:
+        clean_body = body
+    else:
+        truncated = body[:300]
+        if not truncated.endswith(('.', '!', '?')):
+            last_period = truncated.rfind('.')
+            if last_period != -1:
+                clean_body = truncated[:last_period+1].strip()
+            else:
+                clean_body = truncated.strip()
+        else:
+            clean_body = truncated.strip()
+
+    if len(clean_body) < 300 and not clean_body.endswith(('.', '!', '?')):
+        sentences = re.split(r'(?<=[.!?])\s+', body)
+        if len(sentences) > 1:
+            clean_body = sentences[-2].strip() + " " + sentences[-1].strip()
+    return clean_body
+
+
+def _fit_sentences_bruteforce(draw, sentences, font, max_width, max_lines):
+    """Referensi O(n^2): wrap ulang seluruh teks tiap kali kalimat ditambah."""
+    taken = []
+    for sentence in sentences:
+        if len(scraper.wrap_text(draw, " ".join(taken + [sentence]), font, max_width)) > max_lines:
+            break
+        taken.append(sentence)
+    return " ".join(taken)
+
+
+def bench_body(n=200):
+    """
+    build_poster_body baru vs lama di artikel panjang (golden case, referensi
+    brute-force fit_sentences dan batas baris dicek di tests/test_poster.py).
+    """
+    article = {"paragraphs": [SAMPLE_BODY] * 40, "meta": {}}
+    for name, fn in [("lama", _build_poster_body_legacy), ("baru", scraper.build_poster_body)]:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn(article)
+        print(f"{name:>5}: {(time.perf_counter() - t0) / n * 1e6:.0f} us per artikel 40 paragraf")
+    print(f"lama: {_build_poster_body_legacy(article)!r}")
+    print(f"baru: {scraper.build_poster_body(article)!r}")
+
+
+def bench_metrics(n=2000):
+    """
+    Overhead instrumentasi: biaya @timed per panggilan dibanding stage
+    termurah yang diinstrumentasi (save_to_json). Isi export dicek di
+    tests/test_telemetry.py.
+    """
+    m = scraper.Metrics()
+
+    def noop():
+        return None
+
+    reps = 200_000
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        noop()
+    bare = (time.perf_counter() - t0) / reps
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        with m.timer("noop"):
+            noop()
+    wrapped = (time.perf_counter() - t0) / reps
+    timed_noop = scraper.timed("noop")(noop)
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        timed_noop()
+    decorated = (time.perf_counter() - t0) / reps
+    overhead = max(wrapped, decorated) - bare
+    print(f"overhead per panggilan: timer {(wrapped - bare) * 1e6:.2f} us, "
+          f"@timed {(decorated - bare) * 1e6:.2f} us")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db")
+        t0 = time.perf_counter()
+        for i in range(n):
+            scraper.save_to_json(_fake_article(i), db)
+        stage = (time.perf_counter() - t0) / n
+        scraper.get_store(db).close()
+        print(f"save_to_json: {stage * 1e6:.0f} us/panggilan -> overhead {overhead / stage * 100:.2f}%")
+
+        summary = scraper.metrics.summary()["save_json"]
+        print(f"save_json p50<={summary['p50']}s p99<={summary['p99']}s")
+
+
+def _load_accounts_legacy(path):
+    """load_accounts versi lama: baca CSV tiap panggilan, hanya source pertama per baris."""
+    accounts = []
+    for r in scraper.read_csv(path):
+        res = scraper.process_row(r)
+        if not res["sources"]:
+            continue
+        accounts.append({"username": res["username"], "sosmed": res["sources"][0], "credentials": res["result"]})
+    return accounts
+
+
+def bench_accounts(n=500, articles=200):
+    """
+    AccountRegistry vs baca ulang CSV: waktu ambil akun per artikel dengan
+    n baris akun. Semua platform per baris dan reload saat file berubah
+    dicek di tests/test_accounts.py.
+    """
+    header = ["username", "ig_username", "ig_password", "fb_id", "fb_token", *scraper.X_FIELDS]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "accounts.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for i in range(n):
+                ig = [f"ig{i}", "pw"] if i % 2 == 0 else ["", ""]
+                fb = [str(1000 + i), "token"] if i % 3 == 0 else ["", ""]
+                x = ["k", "ks", f"a{i}", "at", "bt"] if i % 2 == 1 or i % 5 == 0 else [""] * 5
+                writer.writerow([f"akun {i}", *ig, *fb, *x])
+
+        registry = scraper.AccountRegistry(path)
+        legacy = _load_accounts_legacy(path)
+        accounts = registry.accounts()
+        print(f"{n} baris: {len(legacy)} akun (lama, source pertama saja) -> {len(accounts)} akun per platform")
+
+        for name, fn in [("lama", lambda: _load_accounts_legacy(path)), ("registry", registry.accounts)]:
+            t0 = time.perf_counter()
+            for _ in range(articles):
+                fn()
+            print(f"{name:>9}: {(time.perf_counter() - t0) / articles * 1e3:.2f} ms per artikel")
+
+        t0 = time.perf_counter()
+        for account in accounts * 10:
+            registry.get(scraper.account_key(account))
+        print(f"     get(): {(time.perf_counter() - t0) / (len(accounts) * 10) * 1e6:.1f} us per job publish")
+
+
+# === End-to-end offline: RSS -> scrape -> render -> publish -> Excel ===
+E2E_SIZES = (10, 100, 1000)
+E2E_HOSTS = 4  # server stub untuk situs berita (port beda = host beda)
+
+
+class _Stub:
+    """State bersama semua server stub: base URL, counter request, aset."""
+
+    def __init__(self):
+        self.news_bases = []
+        self.requests = Counter()
+        self.connections = 0
+        # (status, header) untuk response /x/ berikutnya, mis. limit habis atau 429
+        self.x_responses = deque()
+        self.lock = threading.Lock()
+        self.sequence = 0
+        img = Image.linear_gradient("L").resize((1200, 675)).convert("RGB")
+        buf = BytesIO()
+        img.save(buf, "JPEG", quality=85)
+        self.image = buf.getvalue()
+
+    def count(self, kind):
+        with self.lock:
+            self.requests[kind] += 1
+            self.sequence += 1
+            return self.sequence
+
+
+def _news_page(i, base):
+    rng = random.Random(i)
+    words = (SAMPLE_TITLE + " " + SAMPLE_BODY).split()
+    title = " ".join(rng.choice(words) for _ in range(10))
+    paragraphs = "".join(
+        f"<p>{' '.join(rng.choice(words) for _ in range(rng.randint(30, 60)))}.</p>\n" for _ in range(8)
+    )
+    return f"""<!DOCTYPE html><html lang="id"><head><meta charset="utf-8">
+<title>{title}</title>
+<meta property="og:title" content="{title}">
+<meta property="og:image" content="{base}/img/{i}.jpg">
+<meta property="og:description" content="{title}">
+<script>var x = '{"a" * 4000}';</script></head>
+<body><nav>{"<a href='/k'>Kategori</a>" * 50}</nav>
+<article><h1>{title}</h1>{paragraphs}</article></body></html>""".encode("utf-8")
+
+
+def _stub_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Header dan body dikirim terpisah; tanpa TCP_NODELAY tiap response
+        # keep-alive kena jeda ~40 ms (Nagle + delayed ACK)
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            # Satu instance handler per koneksi TCP
+            with stub.lock:
+                stub.connections += 1
+            super().setup()
+
+        def _send(self, status, body=b"", content_type="application/json", headers=None):
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # client sudah berhenti menunggu (timeout)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            base = f"http://{self.headers['Host']}"
+            if url.path == "/rss":
+                n = int(parse_qs(url.query).get("n", ["10"])[0])
+                etag = f'"rss-{n}"'
+                stub.count("rss")
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304)
+                items = "".join(
+                    f"<item><title>trend {i}</title><pubDate>Mon, 01 Jan 2024 10:00:00 +0700</pubDate>"
+                    f"<ht:news_item><ht:news_item_url>{stub.news_bases[i % len(stub.news_bases)]}"
+                    f"/news/{i}?utm_source=trends</ht:news_item_url></ht:news_item></item>"
+                    for i in range(n)
+                )
+                body = (f'<rss xmlns:ht="https://trends.google.com/trending/rss"><channel>{items}'
+                        f'</channel></rss>').encode("utf-8")
+                return self._send(200, body, "application/rss+xml", {"ETag": etag})
+            if url.path.startswith("/news/"):
+                stub.count("news")
+                i = int(url.path.rsplit("/", 1)[-1])
+                return self._send(200, _news_page(i, base), "text/html; charset=utf-8")
+            if url.path.startswith("/img/"):
+                stub.count("img")
+                return self._send(200, stub.image, "image/jpeg")
+            self._send(404)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            path = urlparse(self.path).path
+            if path.startswith("/graph/") or path.startswith("/slow/"):
+                if path.startswith("/slow/"):
+                    time.sleep(1.5)  # upload diterima, respon terlambat
+                seq = stub.count("upload_fb")
+                body = {"id": f"{path.split('/')[2]}_{seq}"}
+            elif path in ("/x/media", "/x/tweets"):
+                status, headers = 200, {"x-rate-limit-remaining": "100", "x-rate-limit-reset": "0"}
+                with stub.lock:
+                    if stub.x_responses:
+                        status, headers = stub.x_responses.popleft()
+                if status == 429:
+                    body = {"errors": [{"code": 88, "message": "Rate limit exceeded"}]}
+                    return self._send(429, json.dumps(body).encode("utf-8"), headers=headers)
+                if path == "/x/media":
+                    body = {"media_id": stub.count("upload_x_media")}
+                else:
+                    body = {"data": {"id": str(stub.count("upload_x"))}}
+                return self._send(status, json.dumps(body).encode("utf-8"), headers=headers)
+            elif path == "/ig/upload":
+                body = {"code": f"C{stub.count('upload_ig')}"}
+            else:
+                return self._send(404)
+            self._send(200, json.dumps(body).encode("utf-8"))
+
+    return Handler
+
+
+def _start_stub_servers(stub):
+    servers = []
+    for _ in range(E2E_HOSTS):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _stub_handler(stub))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        stub.news_bases.append(f"http://127.0.0.1:{server.server_address[1]}")
+    return servers
+
+
+
+def bench_http(n=50):
+    """
+    Client HTTP terhadap server stub lokal: jumlah koneksi dan waktu per
+    request requests.get vs get_session() (keep-alive), lalu waktu
+    conditional_get yang dapat 304 tanpa body. Kebenarannya dicek di
+    tests/test_net.py.
+    """
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+    stub = _Stub()
+    servers = _start_stub_servers(stub)
+    try:
+        base = stub.news_bases[0]
+        session = scraper.get_session()
+        for label, get in [("requests.get", requests.get), ("get_session", session.get)]:
+            before = stub.connections
+            t0 = time.perf_counter()
+            for i in range(n):
+                get(f"{base}/news/{i}", timeout=30)
+            print(f"{label:>12}: {(time.perf_counter() - t0) / n * 1e3:.2f} ms/request, "
+                  f"{stub.connections - before} koneksi untuk {n} request")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = os.path.join(tmp, "http_cache.json")
+            rss = f"{base}/rss?n=20"
+            first = scraper.conditional_get(rss, cache, timeout=30)
+            t0 = time.perf_counter()
+            again = scraper.conditional_get(rss, cache, timeout=30)
+            elapsed = time.perf_counter() - t0
+            print(f"feed 200: {len(first.content)} byte; request berikutnya: {again.status_code}, "
+                  f"{len(again.content)} byte, {elapsed * 1e3:.2f} ms")
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
+def bench_bgcache(n=40):
+    """
+    ImageCache terhadap server stub: waktu miss (download + resize) dan hit
+    (hanya update mtime). Batas ukuran dan hit tanpa tulis index dicek di
+    tests/test_images.py.
+    """
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+    stub = _Stub()
+    servers = _start_stub_servers(stub)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = os.path.join(tmp, "bg")
+            probe = scraper.ImageCache(directory, max_bytes=1 << 30)
+            image_size = os.path.getsize(probe.get(f"{stub.news_bases[0]}/img/probe.jpg"))
+            limit = image_size * (n // 2)
+
+            cache = scraper.ImageCache(directory, max_bytes=limit)
+            urls = [f"{stub.news_bases[i % len(stub.news_bases)]}/img/{i}.jpg" for i in range(n)]
+            t0 = time.perf_counter()
+            for url in urls:
+                cache.get(url)
+            t_miss = (time.perf_counter() - t0) / n
+            on_disk = sum(size for _, size, _ in cache._entries())
+
+            recent = urls[-(n // 4):]
+            t0 = time.perf_counter()
+            for _ in range(10):
+                for url in recent:
+                    cache.get(url)
+            t_hit = (time.perf_counter() - t0) / (10 * len(recent))
+            print(f"miss (download + resize): {t_miss * 1e3:.1f} ms, hit: {t_hit * 1e6:.0f} us")
+            print(f"{n} gambar, batas {limit // 1024} KB: {on_disk // 1024} KB di disk")
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
+def bench_publish_timeout(n=5, timeout=0.5):
+    """
+    publish_all dengan upload Facebook yang respon-nya terlambat (1.5 s) dan
+    timeout 0.5 s: lama publish_all dan seberapa cepat thread pool bebas lagi.
+    Status "unknown"/"failed" per akun dicek di tests/test_publish.py.
+    """
+    from scraper.platforms import facebook
+
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+    stub = _Stub()
+    servers = _start_stub_servers(stub)
+    graph_url = facebook.FB_GRAPH_URL
+    facebook.FB_GRAPH_URL = f"{stub.news_bases[0]}/slow"
+    try:
+        accounts = [{"sosmed": "FB", "username": f"fb {i}", "credentials": {"fb_id": str(i), "fb_token": "t"}}
+                    for i in range(n)]
+        t0 = time.perf_counter()
+        results = scraper.publish_all(accounts, None, "caption", timeout=timeout, image_data=stub.image)
+        elapsed = time.perf_counter() - t0
+        statuses = Counter(r["status"] for r in results)
+
+        t0 = time.perf_counter()
+        scraper.publish._publish_executors["FB"].submit(lambda: None).result(timeout=5)
+        free = time.perf_counter() - t0
+        print(f"{n} akun FB, timeout {timeout}s: {dict(statuses)} dalam {elapsed:.2f}s, "
+              f"pool bebas lagi setelah {free * 1e3:.0f} ms")
+        time.sleep(1.5)
+        print(f"upload yang diterima server: {stub.requests['upload_fb']} (= jumlah \"unknown\", tidak ada retry)")
+    finally:
+        facebook.FB_GRAPH_URL = graph_url
+        for server in servers:
+            server.shutdown()
+
+class _FakeInstagram:
+    """Pengganti instagrapi.Client: upload dikirim ke endpoint stub."""
+
+    def __init__(self, base):
+        self.base = base
+        self.settings = {}
+
+    def get_settings(self):
+        return dict(self.settings)
+
+    def set_settings(self, settings):
+        self.settings = dict(settings)
+
+    def load_settings(self, path):
+        with open(path, encoding="utf-8") as f:
+            self.set_settings(json.load(f))
+
+    def login(self, username, password, relogin=False):
+        # Client baru tanpa settings = device baru (UUID acak)
+        self.settings.setdefault("uuids", {"uuid": os.urandom(8).hex()})
+        return True
+
+    def dump_settings(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.settings, f)
+
+    def photo_upload(self, path, caption):
+        with open(path, "rb") as f:
+            response = scraper.get_session().post(f"{self.base}/ig/upload", files={"photo": f},
+                                                  data={"caption": caption}, timeout=30)
+        return SimpleNamespace(code=response.json()["code"])
+
+
+
+def bench_ig(n=100, accounts=3):
+    """
+    InstagramSessions dengan Client palsu (upload ke server stub): jumlah
+    login dan waktu per upload untuk n upload bergiliran ke `accounts` akun,
+    dengan satu session yang ditolak di tengah (LoginRequired). Versi lama
+    login + logout tiap upload = n login. Perilaku session dicek di
+    tests/test_instagram.py.
+    """
+    from instagrapi.exceptions import LoginRequired
+    from scraper.platforms import instagram
+
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+    stub = _Stub()
+    servers = _start_stub_servers(stub)
+    calls = Counter()
+
+    class _ExpiringInstagram(_FakeInstagram):
+        def photo_upload(self, path, caption):
+            calls["upload"] += 1
+            if calls["upload"] == n // 2:
+                raise LoginRequired("session expired")
+            return super().photo_upload(path, caption)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            poster = os.path.join(tmp, "poster.jpg")
+            with open(poster, "wb") as f:
+                f.write(stub.image)
+            sessions = instagram.InstagramSessions(os.path.join(tmp, "sessions"),
+                                                   lambda: _ExpiringInstagram(stub.news_bases[0]))
+            instagram._ig_sessions = sessions
+            t0 = time.perf_counter()
+            for i in range(n):
+                instagram.upload_media(f"ig_{i % accounts}", "rahasia", image_path=poster, caption="x")
+            elapsed = time.perf_counter() - t0
+            print(f"{n} upload ke {accounts} akun: {sessions.logins} login (1 session ditolak di tengah), "
+                  f"versi lama {n} login, {elapsed / n * 1e3:.1f} ms/upload")
+    finally:
+        instagram._ig_sessions = None
+        for server in servers:
+            server.shutdown()
+
+
+class _FakeXApi:
+    """Pengganti tweepy.API (media_upload) yang memanggil endpoint stub."""
+
+    def __init__(self, base):
+        self.base = base
+        self.last_response = None
+
+    def media_upload(self, filename, file=None):
+        if file is None:
+            with open(filename, "rb") as f:
+                self.last_response = scraper.get_session().post(f"{self.base}/x/media", files={"media": f}, timeout=30)
+        else:
+            self.last_response = scraper.get_session().post(f"{self.base}/x/media", files={"media": file}, timeout=30)
+        if self.last_response.status_code == 429:
+            import tweepy
+            raise tweepy.TooManyRequests(self.last_response)
+        return SimpleNamespace(media_id=self.last_response.json()["media_id"])
+
+
+class _FakeXClient:
+    """Pengganti tweepy.Client (create_tweet, return requests.Response)."""
+
+    def __init__(self, base):
+        self.base = base
+
+    def create_tweet(self, text, media_ids):
+        response = scraper.get_session().post(f"{self.base}/x/tweets",
+                                              json={"text": text, "media_ids": media_ids}, timeout=30)
+        if response.status_code == 429:
+            import tweepy
+            raise tweepy.TooManyRequests(response)
+        return response
+
+
+def _e2e_child(social_base, out_path):
+    """Satu run pipeline penuh di proses ini (dipanggil bench_e2e lewat subprocess)."""
+    import resource
+
+    scraper.setup_logging()
+
+    from scraper.platforms import instagram, x
+
+    instagram._ig_sessions = instagram.InstagramSessions(client_factory=lambda: _FakeInstagram(social_base))
+    x._x_clients = x.XClients(api_factory=lambda *c: _FakeXApi(social_base),
+                              client_factory=lambda *c: _FakeXClient(social_base))
+    queue = scraper.JobQueue()
+    t0 = time.perf_counter()
+    scraper.enqueue_feed(queue)
+    scraper.run_worker(queue, once=True)
+    scraper.get_report_sink().flush()
+    wall = time.perf_counter() - t0
+
+    counts = {f"{stage}/{status}": count for (stage, status), count in queue.counts().items()}
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "seconds": wall,
+            "jobs": counts,
+            "stages": scraper.metrics.summary(),
+            # ru_maxrss dalam KB di Linux; CHILDREN = worker render
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "peak_rss_workers_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        }, f)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _run_e2e(stub, workdir, n):
+    social = stub.news_bases[0]
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.path.dirname(os.path.abspath(__file__)),
+        NO_PROXY="127.0.0.1,localhost", no_proxy="127.0.0.1,localhost",
+        STORE="articles.db", LEGACY_JSON="legacy.json", REPORT_XLSX="report.xlsx",
+        DATA="accounts.csv", RSS_URLS=f"{social}/rss?n={n}", RSS_GEOS="",
+        FB_GRAPH_URL=f"{social}/graph", POST_INTERVAL="0",
+        BG_CACHE_DIR="bg_cache", HTTP_CACHE="http_cache.json", IG_SESSION_DIR="ig_sessions",
+        RENDER_CACHE_DIR="render_cache", RENDER_CACHE_MB="200",
+        METRICS_FILE="metrics.json", METRICS_SAMPLES="100000", LOG="app.log",
+    )
+    out = os.path.join(workdir, "result.json")
+    subprocess.run(
+        [sys.executable, "-c", "import sys, bench; bench._e2e_child(sys.argv[1], sys.argv[2])", social, out],
+        cwd=workdir, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    with open(out, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _previous_result(path, n):
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("n") == n:
+                previous = record
+    return previous
+
+
+def bench_e2e(n=None, results="bench_results.jsonl"):
+    """
+    Pipeline penuh tanpa internet: server stub lokal untuk feed RSS ala
+    Google Trends, halaman berita + og:image, dan endpoint upload palsu
+    Graph/X/Instagram (1 akun per platform). Tiap ukuran dijalankan di
+    subprocess baru dua kali: run pertama (semua artikel baru) dan run
+    kedua di feed yang sama (harus 0 request artikel).
+
+    Hasil (throughput, p50/p99 per stage, peak RSS) ditambahkan ke
+    `results` (JSON lines) dan dibandingkan dengan run sebelumnya untuk
+    ukuran yang sama. Font di .env / FONT_* harus ada.
+    """
+    stub = _Stub()
+    servers = _start_stub_servers(stub)
+    try:
+        for size in ([n] if n else E2E_SIZES):
+            with tempfile.TemporaryDirectory() as workdir:
+                with open(os.path.join(workdir, "accounts.csv"), "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["username", "ig_username", "ig_password", "fb_id", "fb_token",
+                                     *scraper.X_FIELDS])
+                    writer.writerow(["IG bench", "ig_bench", "rahasia", "", "", "", "", "", "", ""])
+                    writer.writerow(["FB bench", "", "", "1000", "token", "", "", "", "", ""])
+                    writer.writerow(["X bench", "", "", "", "", "k", "ks", "a", "at", "bt"])
+
+                stub.requests.clear()
+                cold = _run_e2e(stub, workdir, size)
+                cold_requests = dict(stub.requests)
+                stub.requests.clear()
+                warm = _run_e2e(stub, workdir, size)
+                warm_requests = dict(stub.requests)
+
+            published = cold["jobs"].get("publish/done", 0)
+            record = {
+                "n": size,
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "revision": _git_revision(),
+                "seconds": round(cold["seconds"], 3),
+                "articles_per_s": round(size / cold["seconds"], 2),
+                "published": published,
+                "poster_archive": os.getenv("POSTER_ARCHIVE", "1"),
+                "peak_rss_mb": round(cold["peak_rss_mb"], 1),
+                "peak_rss_workers_mb": round(cold["peak_rss_workers_mb"], 1),
+                "requests": cold_requests,
+                "warm_requests": warm_requests,
+                "warm_seconds": round(warm["seconds"], 3),
+                "stages": {
+                    stage: {k: v[k] for k in ("count", "p50", "p99", "errors", "bytes")}
+                    for stage, v in cold["stages"].items()
+                },
+            }
+            previous = _previous_result(results, size)
+
+            print(f"\n== {size} artikel: {record['seconds']:.1f} s, {record['articles_per_s']} artikel/s, "
+                  f"{published} post, peak RSS {record['peak_rss_mb']:.0f} MB "
+                  f"(worker {record['peak_rss_workers_mb']:.0f} MB)")
+            print(f"   request: {cold_requests}")
+            print(f"   run ulang feed sama: {record['warm_seconds']:.2f} s, "
+                  f"{warm_requests.get('news', 0)} request artikel")
+            print(f"   {'stage':<20}{'count':>7}{'p50 ms':>10}{'p99 ms':>10}{'error':>7}{'KB':>8}"
+                  + (f"{'p50 lalu':>10}" if previous else ""))
+            for stage, v in sorted(record["stages"].items()):
+                p50 = f"{v['p50'] * 1e3:.1f}" if v["p50"] is not None else "-"
+                p99 = f"{v['p99'] * 1e3:.1f}" if v["p99"] is not None else "-"
+                line = f"   {stage:<20}{v['count']:>7}{p50:>10}{p99:>10}{v['errors']:>7}{v['bytes'] / 1024:>8.0f}"
+                old = (previous or {}).get("stages", {}).get(stage)
+                if old and old.get("p50"):
+                    line += f"{old['p50'] * 1e3:>10.1f}"
+                print(line)
+            if previous:
+                change = (record["articles_per_s"] / previous["articles_per_s"] - 1) * 100
+                print(f"   throughput vs {previous.get('revision') or previous['date']}: {change:+.1f}%")
+
+            if results:
+                with open(results, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
+STARTUP_COMMANDS = (("--help",), ("report",), ("publish",), ("fetch",))
+HEAVY_MODULES = ("PIL.Image", "requests", "bs4", "openpyxl", "tweepy", "instagrapi", "cv2")
+
+
+def _importtime(args, cwd, env):
+    """Jalankan `python -X importtime ...`: (wall detik, total import us, {modul: cumulative us})."""
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    total, modules = 0, {}
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)", line)
+        if m:
+            modules.setdefault(m.group(4), int(m.group(2)))
+            if not m.group(3):
+                # Hanya import top-level; cumulative-nya sudah termasuk import di bawahnya
+                total += int(m.group(2))
+    return wall, total, modules
+
+
+def _legacy_script(tmp):
+    """scraper.py sebelum dipecah jadi paket (dari riwayat git), atau None."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    deleted = subprocess.run(["git", "rev-list", "-n", "1", "HEAD", "--", "scraper.py"],
+                             capture_output=True, text=True, cwd=root).stdout.strip()
+    for rev in ("HEAD", f"{deleted}~1" if deleted else None):
+        proc = subprocess.run(["git", "show", f"{rev}:scraper.py"], capture_output=True, text=True,
+                              cwd=root) if rev else None
+        if proc and proc.returncode == 0:
+            path = os.path.join(tmp, "legacy", "scraper_legacy.py")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(proc.stdout)
+            return path
+    return None
+
+
+def bench_startup(n=5):
+    """
+    Waktu start CLI (`python -X importtime -m scraper <subcommand>`) dengan
+    antrian kosong dan tanpa feed, median dari n run. Dibandingkan dengan
+    scraper.py lama (satu file, semua library di-import di atas) kalau masih
+    ada di riwayat git, lalu library yang ikut ter-import oleh
+    get_platform("X"). Import lazy dicek di tests/test_cli.py.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.path.dirname(os.path.abspath(__file__)),
+            RSS_URLS="", RSS_URL="", RSS_GEOS="", STORE="articles.db", LEGACY_JSON="legacy.json",
+            REPORT_XLSX="report.xlsx", HTTP_CACHE="http_cache.json", METRICS_FILE="metrics.prom",
+            LOG="app.log",
+        )
+        runs = [(" ".join(("-m", "scraper", *cmd)), ("-m", "scraper", *cmd)) for cmd in STARTUP_COMMANDS]
+        legacy = _legacy_script(tmp)
+        if legacy:
+            runs.append(("scraper.py lama --help", (legacy, "--help")))
+
+        print(f"{'perintah':<28}{'wall ms':>9}{'import ms':>11}  library berat")
+        for label, args in runs:
+            samples = [_importtime(args, tmp, env) for _ in range(n)]
+            samples.sort(key=lambda s: s[0])
+            wall, total, modules = samples[len(samples) // 2]
+            heavy = ", ".join(f"{name} {modules[name] / 1e3:.0f}" for name in HEAVY_MODULES if name in modules)
+            print(f"{label:<28}{wall * 1e3:>9.0f}{total / 1e3:>11.0f}  {heavy or '-'}")
+
+        probe = ("import sys, scraper; scraper.get_platform('X'); "
+                 f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+        loaded = subprocess.run([sys.executable, "-c", probe], cwd=tmp, env=env, capture_output=True,
+                                text=True, check=True).stdout.strip().split(",")
+        print(f"get_platform('X') meng-import: {', '.join(m for m in loaded if m) or '-'}")
+
+
+BENCHMARKS = {
+    "accounts": bench_accounts,
+    "bgcache": bench_bgcache,
+    "body": bench_body,
+    "cache": bench_cache,
+    "clean": bench_clean,
+    "dedup": bench_dedup,
+    "e2e": bench_e2e,
+    "feed": bench_feed,
+    "extract": bench_extract,
+    "http": bench_http,
+    "ig": bench_ig,
+    "metrics": bench_metrics,
+    "poster": bench_poster,
+    "publish": bench_publish_timeout,
+    "render": bench_render,
+    "renditions": bench_renditions,
+    "report": bench_report,
+    "startup": bench_startup,
+    "store": bench_store,
+    "wrap": bench_wrap,
+}
+
+
+if __name__ == "__main__":
+    scraper.setup_logging()
+    parser = argparse.ArgumentParser(description="Benchmark paket scraper")
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--n", type=int, default=None, help="jumlah item")
+    parser.add_argument("--corpus", default=None, help="folder halaman HTML (untuk extract)")
+    parser.add_argument("--results", default=None, help="file JSON lines hasil e2e (default bench_results.jsonl)")
+    args = parser.parse_args()
+
+    kwargs = {"n": args.n} if args.n else {}
+    if args.corpus:
+        kwargs["corpus"] = args.corpus
+    if args.results:
+        kwargs["results"] = args.results
+    BENCHMARKS[args.name](**kwargs)
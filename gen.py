@@ -1,4 +1,5 @@
 import ast
+import os
 
 # Modul-modul bawaan Python (tidak perlu dimasukkan ke requirements.txt)
 # Daftar ini bisa ditambah kalau kamu mau
@@ -27,10 +28,22 @@ def get_imports_from_file(filename):
             for alias in node.names:
                 imports.add(alias.name.split('.')[0])
         elif isinstance(node, ast.ImportFrom):
-            if node.module:
+            # Import relatif (from .config import ...) = modul di paket sendiri
+            if node.module and not node.level:
                 imports.add(node.module.split('.')[0])
     return sorted(imports)
 
+def get_imports_from_path(path):
+    """Sama seperti get_imports_from_file, tapi path boleh folder paket"""
+    if not os.path.isdir(path):
+        return get_imports_from_file(path)
+    imports = set()
+    for root, _, files in os.walk(path):
+        for name in files:
+            if name.endswith(".py"):
+                imports.update(get_imports_from_file(os.path.join(root, name)))
+    return sorted(imports)
+
 def filter_external_modules(modules):
     """Filter modul non-bawaan dan ubah ke nama paket pip"""
     external = set()
@@ -42,7 +55,7 @@ def filter_external_modules(modules):
     return sorted(external)
 
 def main(source_file, output_file="requirements.txt"):
-    modules = get_imports_from_file(source_file)
+    modules = get_imports_from_path(source_file)
     external = filter_external_modules(modules)
 
     with open(output_file, "w", encoding="utf-8") as f:
@@ -54,5 +67,5 @@ def main(source_file, output_file="requirements.txt"):
         print(" -", pkg)
 
 if __name__ == "__main__":
-    # Ganti 'script_kamu.py' dengan nama file Python yang mau dibaca
-    main("scraper.py")
+    # Ganti 'scraper' dengan nama file Python / folder paket yang mau dibaca
+    main("scraper")
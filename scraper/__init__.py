@@ -0,0 +1,100 @@
+"""
+Scraper berita trending -> poster -> sosmed.
+
+Jalankan dengan `python -m scraper` (lihat cli.py). Nama publik lama
+(`scraper.buat_poster`, `scraper.ArticleStore`, ...) tetap bisa dipakai, tapi
+submodule-nya baru di-import saat namanya pertama kali diakses, supaya
+`import scraper` tidak ikut meng-import Pillow, requests, instagrapi, dll.
+"""
+import importlib
+
+# Nama submodule tidak boleh sama dengan nama publik lama: `scraper.metrics`
+# harus tetap instance Metrics, jadi modulnya bernama telemetry.
+_EXPORTS = {
+    "config": (
+        "DATA", "HASHTAG", "LOGO", "RSS_URL", "RSS_URLS", "RSS_GEOS", "FONT_1",
+        "FONTSIZE_1", "FONT_2", "FONTSIZE_2", "FONT_3", "FONTSIZE_3", "LOG",
+        "SCRAPE_WORKERS", "SCRAPE_PER_HOST", "STORE", "LEGACY_JSON", "RENDER_WORKERS",
+        "REPORT_XLSX", "REPORT_BATCH", "REPORT_FLUSH_INTERVAL", "HTML_PARSER",
+        "SCRAPE_MAX_BYTES", "SCRAPE_MAX_PARAGRAPHS", "HTTP_CACHE", "BG_CACHE_DIR",
+        "BG_CACHE_MAX_MB", "BG_CACHE_TTL", "POSTER_WIDTH", "POSTER_BODY_HEIGHT",
+        "POSTER_ARCHIVE", "POSTER_BUFFERS", "POSTER_RENDITIONS", "RENDITIONS",
+        "POSTER_FORMAT", "POSTER_PROGRESSIVE", "POSTER_QUALITY", "RENDER_CACHE_DIR",
+        "RENDER_CACHE_MB", "IG_SESSION_DIR", "X_MAX_WAIT", "PUBLISH_LIMITS",
+        "PUBLISH_TIMEOUT", "QUEUE_DB", "RSS_INTERVAL", "POST_INTERVAL", "JOB_LEASE",
+        "JOB_MAX_ATTEMPTS", "JOB_RETRY_DELAY", "HTTP_RETRIES", "HTTP_BACKOFF",
+        "DEDUP_PARAGRAPHS", "DEDUP_MAX_DISTANCE", "METRICS_FILE", "METRICS_SAMPLES",
+        "FB_GRAPH_URL", "IG_FIELDS", "FB_FIELDS", "X_FIELDS", "setup_logging",
+    ),
+    "telemetry": (
+        "LATENCY_BUCKETS", "Metrics", "metrics", "timed",
+    ),
+    "filecache": (
+        "scan_files", "evict_lru",
+    ),
+    "net": (
+        "get_session", "conditional_get", "save_validators",
+    ),
+    "feed": (
+        "fetch_rss", "HT_NS", "feed_urls", "iter_feed_items", "parse_news_urls",
+        "FeedTracker", "get_feed_tracker",
+    ),
+    "scrape": (
+        "clean_text", "META_PROPS", "EXTRACTORS", "get_extractor", "scrape_website",
+        "scrape_concurrent",
+    ),
+    "store": (
+        "canonical_url", "article_sketch", "SimHashIndex", "ArticleStore", "get_store",
+        "save_to_json", "update_status_json",
+    ),
+    "images": (
+        "ImageCache", "get_image_cache", "get_background_image",
+    ),
+    "poster": (
+        "wrap_text", "iter_sentences", "fit_sentences", "PosterRenderer",
+        "encode_to_budget", "fit_canvas", "poster_renditions", "get_renderer",
+        "file_digest", "RenderCache", "get_render_cache", "render_poster_set",
+        "buat_poster", "get_safe_filename_from_url", "background_width",
+        "build_poster_body",
+    ),
+    "render": (
+        "RENDER_FIELDS", "RenderPool", "render_posters",
+    ),
+    "report": (
+        "REPORT_HEADERS", "ReportSink", "get_report_sink", "save_to_excel",
+    ),
+    "accounts": (
+        "has_values", "detect_sources", "build_payload_for_source", "process_row",
+        "read_csv", "save_json", "PLATFORM_FIELDS", "IDENTITY_FIELDS", "AccountRegistry",
+        "get_account_registry", "load_accounts", "account_key",
+    ),
+    "publish": (
+        "publish_all", "record_publish_results",
+    ),
+    "queue": (
+        "JobQueue",
+    ),
+    "jobs": (
+        "enqueue_feed", "run_scrape_jobs", "PosterBuffers", "poster_buffers", "load_poster",
+        "run_render_jobs", "run_publish_jobs", "run_worker", "run_scheduler",
+    ),
+    "platforms": (
+        "PLUGINS", "SOSMED_URLS", "get_platform",
+    ),
+}
+_OWNER = {name: module for module, names in _EXPORTS.items() for name in names}
+
+
+def __getattr__(name):
+    if name in _EXPORTS or name == "cli":
+        return importlib.import_module(f".{name}", __name__)
+    module = _OWNER.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_OWNER) | set(_EXPORTS))
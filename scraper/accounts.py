@@ -0,0 +1,225 @@
+"""
+Akun tujuan posting dari CSV (DATA).
+
+Membaca CSV baris-per-baris. Untuk setiap baris:
+ - Deteksi source(s) berdasarkan field yang berisi data
+ - Jika IG terdeteksi (ig_username & ig_password ada) -> source = "IG"
+ - Jika FB terdeteksi (fb_id & fb_token ada) -> source = "FB"
+ - Jika X/Twitter terdeteksi (ada kombinasi kunci/tokens) -> source = "X"
+
+Modul ini tidak melakukan login ke platform apa pun, hanya mengekstrak
+kredensial / identifier dan menandai sumbernya; upload ada di
+scraper.platforms.
+"""
+import csv
+import json
+import logging
+import os
+import threading
+from typing import Dict, List
+
+from .config import DATA, FB_FIELDS, IG_FIELDS, X_FIELDS
+
+
+def has_values(row: Dict[str, str], fields) -> bool:
+    """Return True if ALL fields exist in row and are non-empty after strip()."""
+    for f in fields:
+        val = row.get(f, "")
+        if val is None or str(val).strip() == "":
+            return False
+    return True
+
+
+def detect_sources(row: Dict[str, str]) -> List[str]:
+    """Detect which social sources are present for a given CSV row.
+
+    Returns a list of source codes: e.g. ["IG"], ["FB"], ["X"], or a combination.
+    """
+    sources = []
+    if has_values(row, IG_FIELDS):
+        sources.append("IG")
+    if has_values(row, FB_FIELDS):
+        sources.append("FB")
+    # For X we accept partial credentials as long as at least 1 token/key present
+    # but you can change the logic to require ALL fields.
+    if any(str(row.get(f, "")).strip() != "" for f in X_FIELDS):
+        sources.append("X")
+    return sources
+
+
+def build_payload_for_source(row: Dict[str, str], source: str) -> Dict[str, str]:
+    """Return a cleaned dict of the relevant fields for a source."""
+        
+    return {
+        "ig_username": row.get("ig_username", "").strip(),
+        "ig_password": row.get("ig_password", "").strip(),
+        "fb_id": row.get("fb_id", "").strip(),
+        "fb_token": row.get("fb_token", "").strip(),
+    }
+    
+    if source == "FB":
+        return {
+            "fb_id": row.get("fb_id", "").strip(),
+            "fb_token": row.get("fb_token", "").strip(),
+        }
+    if source == "X":
+        return {f: row.get(f, "").strip() for f in X_FIELDS}
+    # fallback: return empty
+    return {}
+
+def process_row(row: Dict[str, str]) -> Dict:
+    """Detect sources, build payloads and optionally call fetch functions.
+
+    Returned dict example:
+    {
+      "username": "Breaking News",
+      "sources": ["IG"],
+      "credentials": {"IG": {...}},
+      "fetch_results": {"IG": {...}}  # optional
+    }
+    """
+    username = row.get("username", "").strip()
+    detected = detect_sources(row)
+    result = dict(row)
+
+    return {
+        "username": username,
+        "sources": detected,
+        "result": result,
+    }
+
+def read_csv(path: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = []
+        for r in reader:
+            clean = {}
+            for k, v in r.items():
+                if k is None:
+                    continue  # lewati kolom tanpa nama
+                clean[k.strip()] = (v or "").strip()
+            rows.append(clean)
+    return rows
+
+def save_json(data, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+PLATFORM_FIELDS = {"IG": IG_FIELDS, "FB": FB_FIELDS, "X": X_FIELDS}
+# Field yang mengidentifikasi akun di platformnya (kolom username di CSV
+# hanya nama tampilan dan boleh sama untuk beberapa baris)
+IDENTITY_FIELDS = {"IG": "ig_username", "FB": "fb_id", "X": "x_access"}
+
+
+class AccountRegistry:
+    """
+    Akun tujuan posting dari CSV `path`, di-parse sekali per versi file.
+
+    Tiap baris menghasilkan satu record per platform yang kredensialnya ada
+    (IG, FB, X), jadi baris dengan kredensial IG dan X diposting ke dua
+    platform itu. Record berisi username, sosmed, dan credentials yang hanya
+    memuat field platform tersebut. Baris dengan identitas platform yang sama
+    (IDENTITY_FIELDS) adalah akun yang sama dan hanya dipakai sekali. File
+    dibaca ulang hanya kalau mtime atau ukurannya berubah; kalau file baru
+    rusak, data lama tetap dipakai.
+    """
+
+    def __init__(self, path=DATA):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._accounts = []
+        self._by_key = {}
+        self._by_legacy_key = {}
+        self._by_platform = {}
+        self._by_username = {}
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+        except OSError as e:
+            logging.error(f"[!] File akun {self.path} tidak bisa dibaca: {e}")
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+
+        try:
+            rows = read_csv(self.path)
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            logging.error(f"[!] Gagal baca {self.path}, pakai data akun lama: {e}")
+            return
+
+        accounts, by_key, by_platform, by_username = [], {}, {}, {}
+        legacy_keys = {}
+        for row in rows:
+            username = row.get("username", "").strip()
+            for platform in detect_sources(row):
+                account = {
+                    "username": username,
+                    "sosmed": platform,
+                    "credentials": {f: row.get(f, "") for f in PLATFORM_FIELDS[platform]},
+                }
+                key = account_key(account)
+                if key in by_key:
+                    continue
+                accounts.append(account)
+                by_key[key] = account
+                by_platform.setdefault(platform, []).append(account)
+                by_username.setdefault(username, []).append(platform)
+                legacy_keys.setdefault(f"{platform}:{username}", []).append(account)
+
+        self._accounts, self._by_key = accounts, by_key
+        # Key lama "IG:<username>" dari job yang sudah di antrian, hanya kalau tidak ambigu
+        self._by_legacy_key = {key: found[0] for key, found in legacy_keys.items() if len(found) == 1}
+        self._by_platform, self._by_username = by_platform, by_username
+        if self._stamp is not None:
+            logging.info(f"[+] {self.path} berubah, {len(accounts)} akun dimuat ulang")
+        self._stamp = stamp
+
+    def accounts(self):
+        """Semua record akun (satu per baris per platform)."""
+        with self._lock:
+            self._refresh()
+            return list(self._accounts)
+
+    def get(self, key):
+        """Record akun untuk account_key `key` ("IG:ig_username"), atau None."""
+        with self._lock:
+            self._refresh()
+            return self._by_key.get(key) or self._by_legacy_key.get(key)
+
+    def by_platform(self, platform):
+        with self._lock:
+            self._refresh()
+            return list(self._by_platform.get(platform, ()))
+
+    def platforms(self, username):
+        """Semua platform yang kredensialnya ada untuk baris `username`."""
+        with self._lock:
+            self._refresh()
+            return list(self._by_username.get(username, ()))
+
+
+_account_registries = {}
+_account_registries_lock = threading.Lock()
+
+
+def get_account_registry(path=DATA):
+    with _account_registries_lock:
+        registry = _account_registries.get(path)
+        if registry is None:
+            registry = _account_registries[path] = AccountRegistry(path)
+    return registry
+
+
+def load_accounts(path=DATA):
+    """Akun tujuan posting dari CSV: satu entry per baris per platform."""
+    return get_account_registry(path).accounts()
+
+
+def account_key(account):
+    """Key unik akun: platform + identitasnya di platform itu (bukan nama tampilan)."""
+    platform = account["sosmed"]
+    return f"{platform}:{account['credentials'][IDENTITY_FIELDS[platform]]}"
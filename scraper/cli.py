@@ -0,0 +1,147 @@
+"""
+CLI: python -m scraper [fetch|render|publish|report].
+
+Tanpa subcommand perilakunya sama seperti script lama (sekali jalan, atau
+--loop/--worker/--scheduler). Modul pipeline di-import di dalam handler
+subcommand, jadi tiap subcommand hanya membayar import yang dipakainya; library platform sosmed
+(instagrapi, tweepy) baru di-import saat posting ke platform itu.
+"""
+import argparse
+import atexit
+import logging
+import os
+import threading
+
+from .config import METRICS_FILE, REPORT_XLSX, setup_logging
+
+
+def metrics_path(long_running, path=METRICS_FILE):
+    """
+    File metrik untuk proses ini. Worker yang jalan terus biasanya lebih dari
+    satu sekaligus, jadi tiap proses menulis file sendiri (<nama>.<pid>.<ext>)
+    kecuali METRICS_FILE sudah memuat "{pid}".
+    """
+    if not path or not long_running or "{pid}" in path:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{{pid}}{ext}"
+
+
+def _start(args):
+    setup_logging()
+    if not args.pipeline:
+        return  # mis. `report`: tidak memproses apa pun, jangan timpa file metrik
+    from .telemetry import metrics
+
+    # Ditulis di proses utama saja (worker render tidak ikut menimpa file)
+    long_running = args.loop or getattr(args, "worker", False) or getattr(args, "scheduler", False)
+    atexit.register(metrics.export, metrics_path(long_running))
+
+
+def _run_stages(stages, loop, scheduler=False):
+    from .jobs import enqueue_feed, run_scheduler, run_worker
+    from .queue import JobQueue
+
+    queue = JobQueue()
+    if loop:
+        if scheduler:
+            threading.Thread(target=run_scheduler, args=(queue,), daemon=True).start()
+        run_worker(queue, stages)
+        return
+    if scheduler:
+        try:
+            enqueue_feed(queue)
+        except Exception as e:
+            logging.error(f"[!] Gagal ambil RSS: {e}")
+    run_worker(queue, stages, once=True)
+    logging.info(f"Antrian: {queue.counts()}")
+
+
+def cmd_run(args):
+    """Mode lama: RSS -> scrape -> render -> publish."""
+    from .jobs import run_scheduler, run_worker
+    from .queue import JobQueue
+
+    stages = tuple(s.strip() for s in args.stages.split(",") if s.strip())
+    if args.scheduler:
+        run_scheduler(JobQueue())
+    elif args.worker:
+        run_worker(JobQueue(), stages)
+    else:
+        # Sekali jalan: ambil RSS, lalu proses semua job yang siap (termasuk
+        # sisa job dari run sebelumnya yang crash)
+        _run_stages(stages, args.loop, scheduler=True)
+
+
+def cmd_fetch(args):
+    """Ambil feed RSS, masukkan URL baru ke antrian, lalu scrape."""
+    _run_stages(("scrape",), args.loop, scheduler=True)
+
+
+def cmd_render(args):
+    """Render poster untuk artikel yang sudah di-scrape."""
+    _run_stages(("render",), args.loop)
+
+
+def cmd_publish(args):
+    """Posting poster yang sudah dirender ke akun di DATA."""
+    _run_stages(("publish",), args.loop)
+
+
+def cmd_report(args):
+    """Gabungkan journal laporan ke .xlsx dan tampilkan isi antrian."""
+    from .queue import JobQueue
+    from .report import get_report_sink
+
+    get_report_sink(args.xlsx).flush()
+    for (stage, status), count in sorted(JobQueue().counts().items()):
+        print(f"{stage:<8} {status:<8} {count}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m scraper",
+                                     description="Scraper berita trending -> poster -> sosmed")
+    parser.add_argument("--loop", action="store_true",
+                        help="jalan terus: poll RSS tiap RSS_INTERVAL detik dan proses antrian "
+                             "(sebelum fetch/render/publish = `<subcommand> --loop`)")
+    parser.add_argument("--worker", action="store_true",
+                        help="hanya proses antrian (tanpa poll RSS), untuk worker terpisah")
+    parser.add_argument("--scheduler", action="store_true",
+                        help="hanya poll RSS dan isi antrian")
+    parser.add_argument("--stages", default="scrape,render,publish",
+                        help="stage yang dikerjakan worker, pisahkan dengan koma")
+    parser.set_defaults(handler=cmd_run, pipeline=True)
+
+    commands = parser.add_subparsers(title="subcommand", metavar="{fetch,render,publish,report}")
+    for name, handler in (("fetch", cmd_fetch), ("render", cmd_render), ("publish", cmd_publish)):
+        sub = commands.add_parser(name, help=handler.__doc__.strip().rstrip("."))
+        # SUPPRESS: tanpa --loop di sini, `--loop fetch` tetap memakai --loop level atas
+        sub.add_argument("--loop", action="store_true", default=argparse.SUPPRESS,
+                         help="jalan terus, jangan berhenti saat antrian kosong")
+        sub.set_defaults(handler=handler)
+    sub = commands.add_parser("report", help=cmd_report.__doc__.strip().rstrip("."))
+    sub.add_argument("--xlsx", default=REPORT_XLSX, help="file laporan (default REPORT_XLSX)")
+    sub.set_defaults(handler=cmd_report, pipeline=False)
+    return parser
+
+
+def _check_flags(parser, args):
+    """Opsi mode lama yang tidak berlaku untuk subcommand ditolak, jangan diam-diam diabaikan."""
+    if args.handler is cmd_run:
+        return
+    used = [flag for flag, value in (
+        ("--worker", args.worker),
+        ("--scheduler", args.scheduler),
+        ("--stages", args.stages != parser.get_default("stages")),
+        ("--loop", args.loop and args.handler is cmd_report),
+    ) if value]
+    if used:
+        parser.error(f"{', '.join(used)} tidak bisa dipakai bersama subcommand")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    _check_flags(parser, args)
+    _start(args)
+    args.handler(args)
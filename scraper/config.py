@@ -0,0 +1,118 @@
+"""Konfigurasi dari environment (.env) dan setup logging."""
+import logging
+import os
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+DATA = os.getenv("DATA")
+HASHTAG = os.getenv("HASHTAG")
+LOGO = os.getenv("LOGO")
+RSS_URL = os.getenv("RSS_URL")
+# Beberapa feed sekaligus: RSS_URLS dipisah koma, dan/atau RSS_GEOS (kode
+# negara Google Trends) yang diubah jadi URL feed trending per geo
+RSS_URLS = [u.strip() for u in os.getenv("RSS_URLS", RSS_URL or "").split(",") if u.strip()]
+RSS_GEOS = [g.strip().upper() for g in os.getenv("RSS_GEOS", "").split(",") if g.strip()]
+FONT_1 = os.getenv("FONT_1")
+FONTSIZE_1 = os.getenv("FONTSIZE_1")
+FONTSIZE_1 = int(os.getenv("FONTSIZE_1"))
+FONT_2 = os.getenv("FONT_2")
+FONTSIZE_2 = int(os.getenv("FONTSIZE_2"))
+FONT_3 = os.getenv("FONT_3")
+FONTSIZE_3 = int(os.getenv("FONTSIZE_3"))
+LOG = os.getenv("LOG")
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", 8))
+SCRAPE_PER_HOST = int(os.getenv("SCRAPE_PER_HOST", 2))
+STORE = os.getenv("STORE", "scraped_result.db")
+LEGACY_JSON = os.getenv("LEGACY_JSON", "scraped_result.json")
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", os.cpu_count() or 1))
+REPORT_XLSX = os.getenv("REPORT_XLSX", "data_sosmed.xlsx")
+REPORT_BATCH = int(os.getenv("REPORT_BATCH", 0))
+# Worker --loop menggabungkan journal laporan ke .xlsx tiap N detik (0 = hanya saat keluar)
+REPORT_FLUSH_INTERVAL = int(os.getenv("REPORT_FLUSH_INTERVAL", 60))
+HTML_PARSER = os.getenv("HTML_PARSER", "auto")
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", 3 * 1024 * 1024))
+SCRAPE_MAX_PARAGRAPHS = int(os.getenv("SCRAPE_MAX_PARAGRAPHS", 10))
+HTTP_CACHE = os.getenv("HTTP_CACHE", "http_cache.json")
+BG_CACHE_DIR = os.getenv("BG_CACHE_DIR", "bg_cache")
+BG_CACHE_MAX_MB = int(os.getenv("BG_CACHE_MAX_MB", 200))
+BG_CACHE_TTL = int(os.getenv("BG_CACHE_TTL", 7 * 24 * 3600))
+POSTER_WIDTH = int(os.getenv("POSTER_WIDTH", 1080))
+# Tinggi maksimal area body poster (piksel, FONT_3/FONTSIZE_3)
+POSTER_BODY_HEIGHT = int(os.getenv("POSTER_BODY_HEIGHT", 210))
+# POSTER_ARCHIVE=0: poster hanya disimpan di memori (tidak ada file .jpg)
+POSTER_ARCHIVE = os.getenv("POSTER_ARCHIVE", "1") != "0"
+POSTER_BUFFERS = int(os.getenv("POSTER_BUFFERS", 64))
+# Rendition per platform: ukuran kanvas (None = ukuran poster asli) dan
+# batas ukuran file (KB). POSTER_RENDITIONS=0: semua platform dapat poster asli.
+POSTER_RENDITIONS = os.getenv("POSTER_RENDITIONS", "1") != "0"
+RENDITIONS = {
+    "IG": ((1080, 1350), int(os.getenv("POSTER_KB_IG", 150))),  # 4:5
+    "X": ((1200, 675), int(os.getenv("POSTER_KB_X", 100))),     # 16:9
+    "FB": (None, int(os.getenv("POSTER_KB_FB", 150))),
+}
+# jpeg atau webp (Instagram selalu JPEG); progressive hanya untuk JPEG
+POSTER_FORMAT = os.getenv("POSTER_FORMAT", "jpeg").upper()
+POSTER_PROGRESSIVE = os.getenv("POSTER_PROGRESSIVE", "0") == "1"
+# Rentang kualitas pencarian; batas atas = kualitas default poster lama
+POSTER_QUALITY = (int(os.getenv("POSTER_MIN_QUALITY", 50)), int(os.getenv("POSTER_MAX_QUALITY", 75)))
+# Cache hasil render (poster + rendition) di disk; RENDER_CACHE_MB=0 mematikan
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "render_cache")
+RENDER_CACHE_MB = int(os.getenv("RENDER_CACHE_MB", 200))
+IG_SESSION_DIR = os.getenv("IG_SESSION_DIR", "ig_sessions")
+X_MAX_WAIT = int(os.getenv("X_MAX_WAIT", 900))
+PUBLISH_LIMITS = {
+    "IG": int(os.getenv("PUBLISH_IG", 2)),
+    "FB": int(os.getenv("PUBLISH_FB", 4)),
+    "X": int(os.getenv("PUBLISH_X", 4)),
+}
+PUBLISH_TIMEOUT = int(os.getenv("PUBLISH_TIMEOUT", 300))
+QUEUE_DB = os.getenv("QUEUE_DB", STORE)
+RSS_INTERVAL = int(os.getenv("RSS_INTERVAL", 900))
+POST_INTERVAL = int(os.getenv("POST_INTERVAL", 100000))
+JOB_LEASE = int(os.getenv("JOB_LEASE", 600))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_RETRY_DELAY = int(os.getenv("JOB_RETRY_DELAY", 300))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 3))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", 0.5))
+DEDUP_PARAGRAPHS = int(os.getenv("DEDUP_PARAGRAPHS", 3))
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", 6))
+# File metrik yang ditulis di akhir run: *.json = ringkasan JSON, selain
+# itu format teks Prometheus (untuk textfile collector node_exporter).
+# "{pid}" di nama file diganti PID proses; worker --loop/--worker/--scheduler
+# otomatis menulis ke <nama>.<pid>.<ext> supaya tidak saling menimpa
+METRICS_FILE = os.getenv("METRICS_FILE", "metrics.prom")
+# Simpan juga N sampel latency terakhir per stage untuk p50/p99 yang persis
+METRICS_SAMPLES = int(os.getenv("METRICS_SAMPLES", 0))
+FB_GRAPH_URL = os.getenv("FB_GRAPH_URL", "https://graph.facebook.com/v20.0")
+IG_FIELDS = ("ig_username", "ig_password")
+FB_FIELDS = ("fb_id", "fb_token")
+X_FIELDS = ("x_key", "x_keysecret", "x_access", "x_accesstoken", "x_bearertoken")
+
+
+_logging_ready = False
+
+
+def setup_logging(log_file=LOG):
+    """
+    Handler file (`log_file`) dan console di root logger. Dipanggil CLI saat
+    start, bukan saat import, jadi `import scraper` tidak membuat file log.
+    Aman dipanggil berulang.
+    """
+    global _logging_ready
+    logger = logging.getLogger()
+    if _logging_ready:
+        return logger
+    logger.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    if log_file:
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(formatter)
+        logger.addHandler(file_handler)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    logger.addHandler(console_handler)
+    _logging_ready = True
+    return logger
@@ -0,0 +1,152 @@
+"""Ambil dan parse feed RSS Google Trends, plus pelacak item yang sudah diproses."""
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+from .config import QUEUE_DB, RSS_GEOS, RSS_URLS
+from .telemetry import metrics, timed
+from .net import conditional_get
+from .store import canonical_url
+
+
+@timed("fetch_rss")
+def fetch_rss(url):
+    """
+    Ambil RSS. Return response (isi di `.content`), atau None kalau feed tidak
+    berubah sejak fetch terakhir (304). ETag/Last-Modified belum disimpan:
+    panggil save_validators(url, response) setelah item feed masuk antrian.
+    """
+    response = conditional_get(url, save=False, timeout=30)
+    if response.status_code == 304:
+        return None
+    if response.status_code == 200:
+        metrics.add_bytes("fetch_rss", len(response.content))
+        return response
+    else:
+        raise Exception(f"Failed to fetch RSS: {response.status_code}")
+
+HT_NS = "{https://trends.google.com/trending/rss}"
+
+
+def feed_urls():
+    """Daftar feed dari RSS_URLS + RSS_GEOS, tanpa duplikat."""
+    urls = RSS_URLS + [f"https://trends.google.com/trending/rss?geo={geo}" for geo in RSS_GEOS]
+    return list(dict.fromkeys(urls))
+
+
+def iter_feed_items(rss_content):
+    """
+    Parse RSS secara streaming (iterparse), yield satu dict per <item>:
+    guid (fallback ke judul), pub_date, dan urls dari ht:news_item_url.
+    Elemen item dibuang setelah diproses supaya memori tidak ikut membesar.
+    """
+    for _, el in ET.iterparse(BytesIO(rss_content), events=("end",)):
+        if el.tag != "item":
+            continue
+        title = el.findtext("title") or ""
+        urls = [
+            url.strip()
+            for url in (n.findtext(HT_NS + "news_item_url") for n in el.iter(HT_NS + "news_item"))
+            if url and url.strip()
+        ]
+        yield {
+            "guid": (el.findtext("guid") or title).strip(),
+            "pub_date": (el.findtext("pubDate") or "").strip(),
+            "urls": urls,
+        }
+        el.clear()
+
+
+def parse_news_urls(rss_content):
+    return [url for item in iter_feed_items(rss_content) for url in item["urls"]]
+
+
+class FeedTracker:
+    """
+    Ingat item feed (guid + pubDate) dan URL berita (kanonik) yang sudah
+    pernah diambil, di SQLite yang sama dengan antrian job.
+
+    Item yang guid dan pubDate-nya sama dengan run sebelumnya dilewati
+    tanpa cek URL sama sekali; item baru/berubah hanya menghasilkan URL
+    yang belum pernah terlihat dari feed mana pun.
+    """
+
+    def __init__(self, path=QUEUE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS feed_items (
+                feed TEXT NOT NULL,
+                guid TEXT NOT NULL,
+                pub_date TEXT,
+                seen REAL NOT NULL,
+                PRIMARY KEY (feed, guid)
+            );
+            CREATE TABLE IF NOT EXISTS feed_urls (
+                canonical TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                seen REAL NOT NULL
+            );
+            """
+        )
+
+    def new_urls(self, feed, rss_content, conn=None):
+        """
+        URL berita baru dari `rss_content`, lalu tandai semuanya sudah terlihat.
+
+        Dengan `conn` (koneksi ke database yang sama, mis. JobQueue.transaction())
+        penandaan ikut transaksi pemanggil, jadi bisa di-commit bersama job
+        yang di-enqueue untuk URL itu; crash sebelum commit = URL belum terlihat.
+        """
+        if conn is not None:
+            return self._mark_seen(conn, feed, rss_content)
+        with self._lock, self.conn:
+            return self._mark_seen(self.conn, feed, rss_content)
+
+    @staticmethod
+    def _mark_seen(conn, feed, rss_content):
+        now = time.time()
+        fresh = {}
+        for item in iter_feed_items(rss_content):
+            row = conn.execute(
+                "SELECT pub_date FROM feed_items WHERE feed = ? AND guid = ?", (feed, item["guid"])
+            ).fetchone()
+            if row is not None and row[0] == item["pub_date"]:
+                continue
+            conn.execute(
+                "INSERT OR REPLACE INTO feed_items (feed, guid, pub_date, seen) VALUES (?, ?, ?, ?)",
+                (feed, item["guid"], item["pub_date"], now),
+            )
+            for url in item["urls"]:
+                canonical = canonical_url(url)
+                if canonical in fresh:
+                    continue
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO feed_urls (canonical, url, seen) VALUES (?, ?, ?)",
+                    (canonical, url, now),
+                )
+                if cur.rowcount == 1:
+                    fresh[canonical] = url
+        return list(fresh.values())
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_feed_trackers = {}
+_feed_trackers_lock = threading.Lock()
+
+
+def get_feed_tracker(path=QUEUE_DB):
+    with _feed_trackers_lock:
+        tracker = _feed_trackers.get(path)
+        if tracker is None:
+            tracker = _feed_trackers[path] = FeedTracker(path)
+    return tracker
@@ -0,0 +1,41 @@
+"""Helper bersama untuk cache file di disk (ImageCache, RenderCache)."""
+import os
+
+
+def scan_files(directory, accept):
+    """
+    (path, ukuran, mtime) semua file di `directory` yang namanya lolos
+    `accept(name)`. File yang hilang di tengah scan (dihapus proses lain)
+    dilewati.
+    """
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and accept(entry.name):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # baru dihapus proses lain
+                entries.append((entry.path, st.st_size, st.st_mtime))
+    return entries
+
+
+def evict_lru(entries, max_bytes):
+    """
+    Hapus file dari `entries` (hasil scan_files) yang paling lama tidak
+    dipakai (mtime) sampai total ukurannya <= `max_bytes`. Return (total
+    ukuran sisa, list path yang dihapus).
+    """
+    entries = sorted(entries, key=lambda e: e[2])
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for path, size, _ in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed.append(path)
+    return total, removed
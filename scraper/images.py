@@ -0,0 +1,155 @@
+"""Download dan cache gambar background (og:image)."""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from .config import BG_CACHE_DIR, BG_CACHE_MAX_MB, BG_CACHE_TTL, POSTER_WIDTH
+from .filecache import evict_lru, scan_files
+from .telemetry import metrics, timed
+from .net import get_session
+
+
+# === 4. Fungsi bantu untuk download gambar OG:image ===
+class ImageCache:
+    """
+    Cache gambar background di disk, key = sha1(URL).
+
+    Gambar disimpan sebagai JPEG yang sudah diperkecil ke `width` (pakai
+    Image.draft supaya decoder JPEG langsung decode di skala kecil). Entry
+    yang umurnya < `ttl` dipakai tanpa request; yang lebih tua divalidasi
+    ulang dengan ETag/Last-Modified (disimpan di `index.db`, SQLite, jadi
+    aman dipakai beberapa proses). Total ukuran dibatasi `max_bytes` dan
+    dihitung dari file di disk; entry yang paling lama tidak dipakai (mtime,
+    di-update tiap hit) dihapus duluan (LRU), seperti RenderCache.
+    """
+
+    def __init__(self, directory=BG_CACHE_DIR, max_bytes=BG_CACHE_MAX_MB * 1024 * 1024,
+                 ttl=BG_CACHE_TTL, width=POSTER_WIDTH):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.width = width
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS images (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+        self._bytes = sum(size for _, size, _ in self._entries())
+
+    def path_for(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".jpg")
+
+    def _entries(self):
+        """(path, ukuran, mtime) semua gambar di cache, termasuk yang tidak ada di index."""
+        return scan_files(self.directory, lambda name: name.endswith(".jpg"))
+
+    def _evict(self):
+        # Hitung ulang dari disk: proses lain juga menulis ke direktori yang sama
+        self._bytes, removed = evict_lru(self._entries(), self.max_bytes)
+        if removed:
+            with self.conn:
+                self.conn.executemany("DELETE FROM images WHERE key = ?",
+                                      [(os.path.basename(path)[:-4],) for path in removed])
+
+    def _decode(self, content, path):
+        img = Image.open(BytesIO(content))
+        if img.width > self.width:
+            size = (self.width, max(1, round(img.height * self.width / img.width)))
+            img.draft("RGB", size)  # hanya berefek untuk JPEG
+            img = img.convert("RGB")
+            if img.width > self.width:
+                img = img.resize(size, Image.LANCZOS, reducing_gap=2.0)
+        else:
+            img = img.convert("RGB")  # ubah ke RGB agar bisa disimpan ke JPEG
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        img.save(tmp_path, "JPEG", quality=90)
+        os.replace(tmp_path, path)
+
+    def get(self, url):
+        """Path JPEG lokal untuk `url`, atau None kalau gagal diambil."""
+        path = self.path_for(url)
+        key = os.path.basename(path)[:-4]
+        now = time.time()
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, fetched FROM images WHERE key = ?", (key,)
+            ).fetchone()
+        entry = None
+        if row is not None and os.path.exists(path):
+            entry = {"etag": row[0], "last_modified": row[1], "fetched": row[2]}
+        if entry and now - entry["fetched"] < self.ttl:
+            os.utime(path)  # hit: cukup update mtime untuk LRU, index tidak ditulis
+            return path
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = get_session().get(url, headers=headers, timeout=10)
+        if response.status_code == 304 and entry:
+            os.utime(path)
+            with self._lock, self.conn:
+                self.conn.execute("UPDATE images SET fetched = ? WHERE key = ?", (now, key))
+            return path
+        if response.status_code != 200:
+            return None
+
+        metrics.add_bytes("background", len(response.content))
+        self._decode(response.content, path)
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO images (key, url, etag, last_modified, fetched) VALUES (?, ?, ?, ?, ?)",
+                    (key, url, response.headers.get("ETag"), response.headers.get("Last-Modified"), now),
+                )
+            self._bytes += os.path.getsize(path)
+            if self._bytes > self.max_bytes:
+                self._evict()
+        return path
+
+
+_image_cache = None
+
+
+def get_image_cache():
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache()
+    return _image_cache
+
+
+@timed("background")
+def get_background_image(og_image_url, default_path="background.png"):
+    if not og_image_url:
+        return default_path
+
+    try:
+        path = get_image_cache().get(og_image_url)
+        if path:
+            return path
+    except Exception as e:
+        metrics.error("background")
+        logging.error(f"[!] Gagal ambil gambar background: {e}")
+    return default_path
@@ -0,0 +1,295 @@
+"""Stage job persisten (scrape -> render -> publish) di atas JobQueue."""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .accounts import account_key, get_account_registry, load_accounts
+from .config import (
+    HASHTAG, POSTER_ARCHIVE, POSTER_BUFFERS, POSTER_RENDITIONS, RENDER_WORKERS, RENDITIONS,
+    REPORT_FLUSH_INTERVAL, RSS_INTERVAL, SCRAPE_WORKERS,
+)
+from .feed import feed_urls, fetch_rss, get_feed_tracker
+from .images import get_background_image
+from .telemetry import metrics
+from .net import save_validators
+from .poster import build_poster_body, get_safe_filename_from_url, render_poster_set
+from .publish import publish_all, record_publish_results
+from .queue import JobQueue  # noqa: F401  (nama lama: scraper.jobs.JobQueue)
+from .render import RenderPool
+from .report import get_report_sink
+from .scrape import scrape_concurrent
+from .store import canonical_url, get_store, save_to_json
+
+
+# === 8. Antrian job (scrape -> render -> publish) ===
+def enqueue_feed(queue, rss_urls=None, tracker=None):
+    """
+    Ambil semua feed lalu enqueue job scrape hanya untuk URL berita yang
+    belum pernah terlihat. Feed yang tidak berubah (304) atau isinya sudah
+    diproses semua tidak menghasilkan request artikel sama sekali. URL
+    ditandai terlihat dan di-enqueue dalam satu transaksi, jadi tidak ada
+    URL yang hilang kalau proses crash di antaranya.
+    """
+    tracker = tracker or get_feed_tracker(queue.path)
+    added = 0
+    for rss_url in rss_urls or feed_urls():
+        logging.info(f"Fetch RSS {rss_url}")
+        try:
+            response = fetch_rss(rss_url)
+        except Exception as e:
+            logging.error(f"[!] Gagal ambil RSS {rss_url}: {e}")
+            continue
+        if response is None:
+            logging.info("RSS tidak berubah, skip.")
+            continue
+        with queue.transaction() as conn:
+            news_urls = tracker.new_urls(rss_url, response.content, conn)
+            # Key = URL kanonik, jadi varian utm/AMP dari berita yang sama cukup sekali
+            count = sum(queue.enqueue("scrape", canonical_url(url), {"url": url}, conn=conn) for url in news_urls)
+        # Baru disimpan setelah URL masuk antrian: crash sebelum ini = feed diambil ulang (200)
+        save_validators(rss_url, response)
+        logging.info(f"{len(news_urls)} URL baru, {count} masuk antrian")
+        added += count
+    return added
+
+
+def run_scrape_jobs(queue, limit=SCRAPE_WORKERS * 4):
+    jobs = {}
+    with queue.claimed("scrape", limit) as claimed:
+        for job in claimed:
+            url = job["payload"]["url"]
+            if url in jobs:
+                queue.complete(job)  # job lama dengan key URL mentah
+            else:
+                jobs[url] = job
+        for i, result in enumerate(scrape_concurrent(list(jobs)), start=1):
+            url = result["link"]
+            logging.info(f"[{i}] {url}")
+            if save_to_json(result):
+                queue.enqueue("render", url, {"link": url})
+            queue.complete(jobs.pop(url))
+        for job in jobs.values():
+            queue.fail(job, "scrape gagal")
+    return len(jobs)
+
+
+class PosterBuffers:
+    """Poster yang sudah di-encode (dict bytes, lihat load_poster) per link, maks `size` terbaru (LRU)."""
+
+    def __init__(self, size=POSTER_BUFFERS):
+        self.size = size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, link, data):
+        with self._lock:
+            self._data[link] = data
+            self._data.move_to_end(link)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def get(self, link):
+        with self._lock:
+            data = self._data.get(link)
+            if data is not None:
+                self._data.move_to_end(link)
+            return data
+
+
+poster_buffers = PosterBuffers()
+
+
+def _poster_job(link, result, archive=POSTER_ARCHIVE):
+    """Input render poster untuk artikel `result` (output_file None = di memori)."""
+    # Background dulu: body di-fit ke lebar poster yang sebenarnya (= lebar background)
+    bg_path = get_background_image(result["meta"].get("og:image"))
+    return {
+        "title": result["title"] or "Berita Trending",
+        "body": build_poster_body(result, bg_path=bg_path),
+        "hashtag": HASHTAG,
+        "bg_path": bg_path,
+        "output_file": get_safe_filename_from_url(link) + ".jpg" if archive else None,
+    }
+
+
+def load_poster(link, output_file=None, platforms=()):
+    """
+    Poster untuk `link` sebagai dict bytes: "poster" (poster asli) dan satu
+    entry per rendition di `platforms`. Diambil dari PosterBuffers dan file
+    arsip; yang kurang dirender ulang di proses ini (mis. job publish diambil
+    worker lain atau setelah restart). Return None kalau gagal.
+    """
+    posters = dict(poster_buffers.get(link) or {})
+    if "poster" not in posters and output_file and os.path.exists(output_file):
+        with open(output_file, "rb") as f:
+            posters["poster"] = f.read()
+    missing = [p for p in platforms if p in RENDITIONS and p not in posters] if POSTER_RENDITIONS else []
+    if "poster" in posters and not missing:
+        return posters
+
+    result = get_store().get(link)
+    if result is None:
+        return None
+    job = _poster_job(link, result, archive=False)
+    with metrics.timer("poster"):
+        output, renditions, _ = render_poster_set(job["title"], job["body"], job["hashtag"],
+                                                  job["bg_path"], None, platforms)
+    if output is None:
+        metrics.error("poster")
+        return None
+    posters = dict(renditions, poster=output)
+    poster_buffers.put(link, posters)
+    return posters
+
+
+def run_render_jobs(queue, render_pool, limit=RENDER_WORKERS * 2):
+    with queue.claimed("render", limit) as claimed:
+        accounts = load_accounts()
+        platforms = sorted({account["sosmed"] for account in accounts})
+        for job in claimed:
+            result = get_store().get(job["key"])
+            if result is None:
+                queue.fail(job, "artikel tidak ada di store")
+                continue
+            if result["status"] == "duplicate":
+                queue.complete(job)
+                continue
+            render_pool.submit(dict(_poster_job(job["key"], result), job=job, platforms=platforms))
+
+        for rendered in render_pool.drain():
+            job = rendered.pop("job")
+            if not rendered["ok"]:
+                queue.fail(job, "render gagal")
+                continue
+            if rendered["data"]:
+                poster_buffers.put(job["key"], rendered["data"])
+            for account in accounts:
+                queue.enqueue("publish", f"{job['key']}|{account_key(account)}", {
+                    "link": job["key"],
+                    "title": rendered["title"],
+                    "output_file": rendered["output_file"],
+                    "account": account_key(account),
+                })
+            queue.complete(job)
+    return len(claimed)
+
+
+def run_publish_jobs(queue, limit=20):
+    with queue.claimed("publish", limit) as claimed:
+        # Akun yang slot-nya sudah di-reserve tapi belum mulai upload: dilepas
+        # lagi kalau stage ini gagal di tengah jalan
+        reserved = {}
+        try:
+            _publish_claimed(queue, claimed, reserved)
+        except Exception:
+            for account in reserved.values():
+                queue.release_slot(account)
+            raise
+    return len(claimed)
+
+
+def _publish_claimed(queue, claimed, reserved):
+    registry = get_account_registry()
+
+    # Kelompokkan per poster supaya satu poster dikirim ke semua akunnya sekaligus
+    batches = {}
+    for job in claimed:
+        payload = job["payload"]
+        account = registry.get(payload["account"])
+        if account is None:
+            queue.fail(job, "akun tidak ada di DATA", retry_in=0)
+            continue
+        next_at = queue.reserve_slot(payload["account"])
+        if next_at:
+            queue.defer(job, next_at)
+            continue
+        reserved[job["id"]] = payload["account"]
+        batches.setdefault((payload["link"], payload["output_file"], payload["title"]), []).append((job, account))
+
+    for (link, output_file, title), items in batches.items():
+        # Poster dibaca/di-encode sekali, lalu buffer yang sama dipakai semua akun
+        # di platform yang sama
+        image_data = load_poster(link, output_file, {account["sosmed"] for _, account in items})
+        if image_data is None:
+            for job, _ in items:
+                queue.release_slot(reserved.pop(job["id"]))
+                queue.fail(job, "poster tidak ada")
+            continue
+        logging.info("Start Post")
+        for job, _ in items:
+            reserved.pop(job["id"])
+        try:
+            results = publish_all([account for _, account in items], output_file, title, image_data=image_data)
+        except Exception as e:
+            # Upload mungkin sudah jalan sebagian: jangan di-retry
+            for job, _ in items:
+                queue.complete(job, "unknown", str(e))
+            raise
+        # Status antrian dulu, baru post_id di store: kalau store gagal ditulis,
+        # job yang sudah terposting tetap tidak diulang
+        for (job, _), result in zip(items, results):
+            if result["status"] == "done":
+                queue.complete(job)
+            elif result["status"] == "unknown":
+                # Upload mungkin sudah terposting: tidak di-retry dan slot akun tetap terpakai
+                queue.complete(job, "unknown", result["error"])
+            else:
+                queue.release_slot(job["payload"]["account"])
+                queue.fail(job, result["error"])
+        record_publish_results(link, results)
+
+
+def run_worker(queue, stages=("scrape", "render", "publish"), once=False, poll=5,
+               report_interval=REPORT_FLUSH_INTERVAL):
+    """
+    Proses job dari antrian. Dengan `once=True` berhenti saat tidak ada job
+    yang siap jalan (job publish yang masih menunggu jadwal akun tetap di
+    antrian untuk run berikutnya). Worker publish menggabungkan journal
+    laporan ke .xlsx tiap `report_interval` detik, jadi proses --loop yang
+    tidak pernah keluar tetap meng-update file Excel.
+    """
+    render_pool = RenderPool() if "render" in stages else None
+    runners = {
+        "scrape": lambda: run_scrape_jobs(queue),
+        "render": lambda: run_render_jobs(queue, render_pool),
+        "publish": lambda: run_publish_jobs(queue),
+    }
+    next_report = time.monotonic() + report_interval
+    try:
+        while True:
+            processed = 0
+            for stage in ("scrape", "render", "publish"):
+                if stage not in stages:
+                    continue
+                # Error sementara (mis. database terkunci) tidak boleh mematikan
+                # worker --loop: job yang sudah di-claim dikembalikan ke antrian
+                try:
+                    processed += runners[stage]()
+                except Exception as e:
+                    logging.error(f"[!] Stage {stage} gagal: {e!r}")
+            if "publish" in stages and report_interval and time.monotonic() >= next_report:
+                next_report = time.monotonic() + report_interval
+                try:
+                    get_report_sink().flush()
+                except Exception as e:
+                    logging.error(f"[!] Gagal flush laporan: {e!r}")
+            if not processed:
+                if once:
+                    break
+                time.sleep(poll)
+    finally:
+        if render_pool is not None:
+            render_pool.close()
+
+
+def run_scheduler(queue, interval=RSS_INTERVAL, stop=None):
+    """Poll RSS tiap `interval` detik sampai `stop` (threading.Event) di-set."""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        try:
+            enqueue_feed(queue)
+        except Exception as e:
+            logging.error(f"[!] Gagal ambil RSS: {e}")
+        stop.wait(interval)
@@ -0,0 +1,114 @@
+"""Session HTTP bersama dan GET kondisional (ETag/Last-Modified)."""
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import HTTP_BACKOFF, HTTP_CACHE, HTTP_RETRIES, SCRAPE_WORKERS
+
+
+# === 0. HTTP client bersama ===
+
+
+try:
+    import brotli  # noqa: F401  (urllib3 otomatis decode "br" kalau ada)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Session requests yang dipakai semua fungsi network.
+
+    Koneksi di-pool per host (keep-alive), request GET/HEAD di-retry dengan
+    backoff untuk 429/5xx, dan response gzip/brotli di-decode otomatis.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=HTTP_RETRIES,
+                    backoff_factor=HTTP_BACKOFF,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=32,
+                    pool_maxsize=max(SCRAPE_WORKERS, 10),
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "User-Agent": "Mozilla/5.0",
+                    "Accept-Encoding": ACCEPT_ENCODING,
+                })
+                _session = session
+    return _session
+
+
+_validators_lock = threading.Lock()
+
+
+def _load_validators(path=HTTP_CACHE):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def conditional_get(url, cache_path=HTTP_CACHE, save=True, **kwargs):
+    """
+    GET dengan If-None-Match / If-Modified-Since dari request sebelumnya.
+
+    ETag dan Last-Modified disimpan per URL di `cache_path`. Dengan
+    `save=False` belum disimpan; panggil save_validators() setelah isi
+    response selesai diproses, supaya crash di tengah tidak membuat run
+    berikutnya dapat 304 untuk konten yang belum pernah diproses.
+    Return response; status 304 berarti konten tidak berubah.
+    """
+    with _validators_lock:
+        validators = _load_validators(cache_path)
+    cached = validators.get(url, {})
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = get_session().get(url, headers=headers, **kwargs)
+    if save:
+        save_validators(url, response, cache_path)
+    return response
+
+
+def save_validators(url, response, cache_path=HTTP_CACHE):
+    """Simpan ETag/Last-Modified response 200 untuk conditional_get berikutnya."""
+    if response.status_code != 200:
+        return
+    entry = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    if entry["etag"] or entry["last_modified"]:
+        with _validators_lock:
+            validators = _load_validators(cache_path)
+            validators[url] = entry
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(validators, f, indent=4)
+            os.replace(tmp_path, cache_path)
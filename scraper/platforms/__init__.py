@@ -0,0 +1,31 @@
+"""
+Plugin publisher per platform.
+
+Tiap plugin adalah modul di paket ini dengan fungsi
+`publish(credentials, image, caption, timeout=None)` yang return post_id
+(raise kalau gagal); `image` berupa path atau file-like, `timeout` = sisa
+detik untuk upload ini (plugin berhenti sendiri, bukan hanya ditinggal
+pemanggilnya). Raise TimeoutError kalau request sudah terkirim tapi respon
+tidak datang: post mungkin sudah ada, jadi tidak boleh di-retry. Modul plugin beserta library
+platformnya (instagrapi, tweepy) baru di-import saat platform itu pertama
+dipakai, lihat get_platform(), jadi run yang hanya posting ke satu platform
+tidak membayar import platform lain.
+"""
+import importlib
+
+# Kode platform (kolom "sosmed") -> nama modul plugin
+PLUGINS = {"IG": "instagram", "X": "x", "FB": "facebook"}
+
+SOSMED_URLS = {
+    "IG": "https://instagram.com/p/",
+    "X": "https://x.com/user/status/",
+    "FB": "https://fb.com/",
+}
+
+
+def get_platform(code):
+    """Modul plugin untuk `code` ("IG", "X", "FB"), di-import saat pertama dipanggil."""
+    name = PLUGINS.get(code)
+    if name is None:
+        raise ValueError(f"platform tidak dikenal: {code}")
+    return importlib.import_module(f"{__name__}.{name}")
@@ -0,0 +1,78 @@
+"""Plugin Facebook Page: upload foto lewat Graph API."""
+import logging
+
+import requests
+
+from ..config import FB_GRAPH_URL
+from ..telemetry import timed
+from ..net import get_session
+
+
+@timed("upload_fb", ok=lambda response: bool(response.get("id")))
+def upload_photo_facebook(page_id, page_token, file_path, caption="", timeout=60):
+    """
+    Upload foto lokal ke Facebook Page menggunakan Graph API.
+    
+    Args:
+        page_id (str): ID halaman Facebook
+        page_token (str): Access token halaman
+        file_path (str | file-like): Path file gambar lokal, atau buffer gambar
+        caption (str): Caption untuk foto
+        timeout (float): Batas detik koneksi/baca request upload
+    
+    Returns:
+        dict: Hasil respon JSON dari Facebook API
+    """
+    url = f"{FB_GRAPH_URL}/{page_id}/photos"
+    payload = {
+        "caption": caption or "Upload foto 🚀",
+        "access_token": page_token
+    }
+
+    try:
+        if hasattr(file_path, "read"):
+            name = getattr(file_path, "name", "poster.jpg")
+            mime = "image/webp" if name.endswith(".webp") else "image/jpeg"
+            files = {"source": (name, file_path, mime)}
+            res = get_session().post(url, data=payload, files=files, timeout=timeout)
+        else:
+            with open(file_path, "rb") as f:
+                files = {"source": f}
+                res = get_session().post(url, data=payload, files=files, timeout=timeout)
+
+        # Coba ambil JSON-nya
+        try:
+            response_data = res.json()
+        except Exception:
+            response_data = {"error": "Tidak bisa parse respon", "raw": res.text}
+
+        # Cek status kode
+        if res.status_code == 200:
+            logging.info(f"✅ Berhasil upload ke Facebook Page ID {page_id}")
+        else:
+            logging.error(f"❌ Gagal upload (status {res.status_code})")
+
+        return response_data
+
+    except requests.exceptions.ReadTimeout:
+        # Foto sudah terkirim tapi respon tidak datang: bisa saja sudah terposting
+        logging.error(f"⚠️ Respon Facebook lewat {timeout:.1f}s, status upload tidak diketahui")
+        raise TimeoutError(f"respon Facebook lewat {timeout:.1f}s")
+
+    except FileNotFoundError:
+        logging.error(f"⚠️ File tidak ditemukan: {file_path}")
+        return {"error": "File tidak ditemukan"}
+
+    except Exception as e:
+        logging.error(f"⚠️ Terjadi kesalahan: {e}")
+        return {"error": str(e)}
+
+
+def publish(credentials, image, caption, timeout=None):
+    """Upload poster ke Facebook Page. Return id post."""
+    response = upload_photo_facebook(credentials["fb_id"], credentials["fb_token"], image, caption,
+                                     timeout=min(timeout, 60) if timeout else 60)
+    post_id = response.get("id")
+    if not post_id:
+        raise RuntimeError(response.get("error") or "tidak ada id di respon")
+    return post_id
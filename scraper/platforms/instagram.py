@@ -0,0 +1,165 @@
+"""Plugin Instagram: upload foto/video lewat instagrapi."""
+import logging
+import os
+import re
+import tempfile
+import threading
+
+from instagrapi import Client
+from instagrapi.exceptions import LoginRequired
+
+from ..config import IG_SESSION_DIR
+from ..telemetry import timed
+
+
+# === 2. Upload media (foto/video) ===
+class InstagramSessions:
+    """
+    Client instagrapi yang sudah login, satu per akun, dipakai ulang antar upload.
+
+    Settings session disimpan di `session_dir/<username>.json` dan di-load
+    lagi saat proses berikutnya start, jadi login penuh hanya terjadi kalau
+    session belum ada atau ditolak (LoginRequired). `logins` menghitung
+    berapa kali `Client.login` dipanggil. `client_factory` bisa diganti
+    dengan Client palsu untuk pengujian.
+    """
+
+    def __init__(self, session_dir=IG_SESSION_DIR, client_factory=Client):
+        self.session_dir = session_dir
+        self.client_factory = client_factory
+        self.clients = {}
+        self.logins = 0
+        self._locks = {}
+        self._lock = threading.Lock()
+        os.makedirs(session_dir, exist_ok=True)
+
+    def _settings_path(self, username):
+        safe_name = re.sub(r'[<>:"/\\|?*]', '_', username)
+        return os.path.join(self.session_dir, safe_name + ".json")
+
+    def _account_lock(self, username):
+        with self._lock:
+            return self._locks.setdefault(username, threading.Lock())
+
+    def _login(self, username, password, previous=None):
+        """
+        Login dengan Client baru. Untuk login ulang (`previous` = client yang
+        session-nya ditolak) settings lama ikut dipakai, jadi device dan UUID
+        tetap sama; device baru tiap session expired lebih sering kena challenge.
+        """
+        cl = self.client_factory()
+        path = self._settings_path(username)
+        if previous is not None:
+            cl.set_settings(previous.get_settings())
+        elif os.path.exists(path):
+            try:
+                cl.load_settings(path)
+            except Exception as e:
+                logging.warning(f"[!] Session IG {username} rusak, login ulang: {e}")
+
+        logging.info(f"[*] Login ke akun Instagram {username}...")
+        cl.login(username, password, relogin=previous is not None)
+        self.logins += 1
+        cl.dump_settings(path)
+        logging.info("[+] Login berhasil!")
+
+        self.clients[username] = cl
+        return cl
+
+    def call(self, username, password, fn):
+        """
+        Jalankan `fn(client)` dengan client akun `username`.
+
+        Kalau gagal karena LoginRequired, login ulang sekali lalu coba lagi.
+        Satu akun hanya dipakai satu thread dalam satu waktu.
+        """
+        with self._account_lock(username):
+            cl = self.clients.get(username) or self._login(username, password)
+            try:
+                return fn(cl)
+            except LoginRequired:
+                logging.warning(f"[!] Session IG {username} expired, login ulang")
+                self.clients.pop(username, None)
+                cl = self._login(username, password, previous=cl)
+                return fn(cl)
+
+
+_ig_sessions = None
+
+
+def get_ig_sessions():
+    global _ig_sessions
+    if _ig_sessions is None:
+        _ig_sessions = InstagramSessions()
+    return _ig_sessions
+
+
+@timed("upload_ig", ok=bool)
+def upload_media(username: str, password: str = None, image_path=None, video_path: str = None, caption: str = ""):
+    """Upload foto/video ke Instagram. `image_path` boleh path atau file-like (buffer poster)."""
+    if image_path is None or not hasattr(image_path, "read"):
+        return _upload_media(username, password, image_path, video_path, caption)
+
+    # instagrapi hanya menerima path, jadi buffer ditulis ke file sementara
+    fd, temp_path = tempfile.mkstemp(suffix=".jpg")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(image_path.read())
+        return _upload_media(username, password, temp_path, video_path, caption)
+    finally:
+        os.remove(temp_path)
+
+
+def _upload_media(username, password, image_path, video_path, caption):
+    thumb_path = None
+    if image_path:
+        if not os.path.exists(image_path):
+            logging.error(f"[!] File gambar tidak ditemukan: {image_path}")
+            return False
+
+    elif video_path:
+        if not os.path.exists(video_path):
+            logging.error(f"[!] File video tidak ditemukan: {video_path}")
+            return False
+
+        # Buat thumbnail otomatis
+        thumb_path = os.path.splitext(video_path)[0] + "_thumb.jpg"
+        if not os.path.exists(thumb_path):
+            logging.info("[*] Membuat thumbnail otomatis...")
+            import cv2  # lazy: hanya untuk upload video
+
+            cap = cv2.VideoCapture(video_path)
+            ret, frame = cap.read()
+            if ret:
+                cv2.imwrite(thumb_path, frame)
+            cap.release()
+    else:
+        logging.error("[!] Harus isi image_path atau video_path.")
+        return False
+
+    def upload(cl):
+        if image_path:
+            logging.info("[*] Upload foto...")
+            return cl.photo_upload(image_path, caption)
+        logging.info("[*] Upload video...")
+        return cl.video_upload(video_path, caption, thumbnail=thumb_path)
+
+    # === Upload (session dipakai ulang, tidak logout) ===
+    try:
+        media = get_ig_sessions().call(username, password, upload)
+        return getattr(media, "code", None)
+
+    except Exception as e:
+        logging.error(f"[!] Upload gagal: {e}")
+        return False
+
+
+def publish(credentials, image, caption, timeout=None):
+    """
+    Upload poster ke akun Instagram. Return kode media.
+
+    instagrapi tidak punya timeout per request, jadi `timeout` tidak bisa
+    diteruskan; upload yang lewat batas dicatat "unknown" oleh publish_all.
+    """
+    return upload_media(credentials["ig_username"], credentials["ig_password"],
+                        image_path=image, caption=caption)
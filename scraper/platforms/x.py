@@ -0,0 +1,224 @@
+"""Plugin X (Twitter): upload media lewat tweepy v1.1, tweet lewat v2."""
+import logging
+import threading
+import time
+from collections import deque
+
+import requests
+import tweepy
+from requests.adapters import HTTPAdapter
+
+from ..config import X_FIELDS, X_MAX_WAIT
+from ..telemetry import metrics, timed
+
+
+class _TimeoutAdapter(HTTPAdapter):
+    """Adapter dengan timeout default: tweepy.Client tidak punya opsi timeout."""
+
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or self.timeout, **kwargs)
+
+
+class XClients:
+    """
+    Registry client tweepy per akun X.
+
+    `tweepy.API` (v1.1, upload media) dan `tweepy.Client` (v2, tweet) dibuat
+    sekali per kombinasi kredensial. Header x-rate-limit-remaining/reset dari
+    tiap response dicatat per akun, jadi post berikutnya menunggu sampai
+    limit reset (maks `max_wait` detik) daripada langsung kena 429.
+    Latency upload dan tweet dicatat di `latency` (hanya `samples` terakhir
+    per endpoint, jadi tidak membesar di mode --loop), ringkasannya di
+    metrics(). Latency yang sama, plus 429 sebagai error, juga masuk ke
+    metrik pipeline sebagai stage x_upload/x_tweet (ikut di METRICS_FILE).
+    """
+
+    def __init__(self, max_wait=X_MAX_WAIT, api_factory=None, client_factory=None, samples=1000):
+        self.max_wait = max_wait
+        self.api_factory = api_factory or self._make_api
+        self.client_factory = client_factory or self._make_client
+        self.accounts = {}
+        self.latency = {"upload": deque(maxlen=samples), "tweet": deque(maxlen=samples)}
+        self.counts = {"upload": 0, "tweet": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _make_api(x_key, x_keysecret, x_access, x_accesstoken, x_bearertoken):
+        # --- Autentikasi OAuth 1.0a untuk upload media ---
+        auth = tweepy.OAuth1UserHandler(
+            x_key, x_keysecret,
+            x_access, x_accesstoken
+        )
+        return tweepy.API(auth)
+
+    @staticmethod
+    def _make_client(x_key, x_keysecret, x_access, x_accesstoken, x_bearertoken):
+        # --- Client v2 untuk bikin tweet (response mentah supaya header terbaca) ---
+        client = tweepy.Client(
+            bearer_token=x_bearertoken,
+            consumer_key=x_key,
+            consumer_secret=x_keysecret,
+            access_token=x_access,
+            access_token_secret=x_accesstoken,
+            return_type=requests.Response,
+        )
+        # Samakan dengan tweepy.API (timeout 60s) supaya tweet tidak menggantung
+        client.session.mount("https://", _TimeoutAdapter(60))
+        return client
+
+    def account(self, credentials):
+        """State akun: api, client, dan waktu reset rate limit per endpoint."""
+        credentials = tuple(credentials)
+        with self._lock:
+            account = self.accounts.get(credentials)
+            if account is None:
+                account = self.accounts[credentials] = {
+                    "api": self.api_factory(*credentials),
+                    "client": self.client_factory(*credentials),
+                    "blocked_until": {},
+                    "lock": threading.Lock(),
+                }
+        return account
+
+    @staticmethod
+    def _record_limits(account, endpoint, headers):
+        if not headers:
+            return
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+        if remaining is not None and reset is not None and int(remaining) <= 0:
+            account["blocked_until"][endpoint] = int(reset)
+        else:
+            account["blocked_until"].pop(endpoint, None)
+
+    def wait_time(self, credentials):
+        """Detik sampai akun boleh posting lagi (0 kalau tidak sedang kena limit)."""
+        blocked = self.account(credentials)["blocked_until"]
+        return max([until - time.time() for until in blocked.values()] + [0])
+
+    def _timed(self, account, endpoint, fn, deadline=None):
+        # Tunggu rate limit maks max_wait, dan tidak melewati `deadline` (time.monotonic)
+        max_wait = self.max_wait if deadline is None else min(self.max_wait, deadline - time.monotonic())
+        wait_s = max(account["blocked_until"].get(endpoint, 0) - time.time(), 0)
+        if wait_s > max_wait:
+            raise RuntimeError(f"rate limit {endpoint} baru reset {wait_s:.0f}s lagi")
+        if wait_s:
+            logging.info(f"[*] Rate limit X {endpoint}, tunggu {wait_s:.0f}s")
+            time.sleep(wait_s)
+
+        for attempt in range(2):
+            t0 = time.perf_counter()
+            try:
+                result = fn()
+            except tweepy.TooManyRequests as e:
+                metrics.error(f"x_{endpoint}")
+                headers = getattr(e.response, "headers", None) or {}
+                reset = e.reset_time or int(headers.get("x-rate-limit-reset", 0)) or int(time.time()) + 60
+                account["blocked_until"][endpoint] = reset
+                wait_s = reset - time.time()
+                if attempt or wait_s > max_wait:
+                    raise
+                logging.info(f"[*] 429 dari X {endpoint}, tunggu {max(wait_s, 0):.0f}s")
+                time.sleep(max(wait_s, 0))
+                continue
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self.latency[endpoint].append(elapsed)
+                self.counts[endpoint] += 1
+            metrics.observe(f"x_{endpoint}", elapsed)
+            return result
+
+    def post(self, credentials, image_path, tweet_text, timeout=None):
+        """
+        Upload gambar (path atau file-like) lalu tweet. Return id tweet.
+        Dengan `timeout` (detik) tidak ada tunggu rate limit yang melewati
+        batas itu: lebih baik gagal sebelum tweet daripada tweet terlambat.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        account = self.account(credentials)
+        with account["lock"]:
+            api, client = account["api"], account["client"]
+
+            def upload():
+                if hasattr(image_path, "read"):
+                    image_path.seek(0)  # bisa dipanggil ulang setelah 429
+                    return api.media_upload(filename=getattr(image_path, "name", "poster.jpg"), file=image_path)
+                return api.media_upload(image_path)
+
+            media = self._timed(account, "upload", upload, deadline)
+            last = getattr(api, "last_response", None)
+            self._record_limits(account, "upload", getattr(last, "headers", None))
+
+            try:
+                response = self._timed(account, "tweet", lambda: client.create_tweet(
+                    text=tweet_text,
+                    media_ids=[media.media_id]
+                ), deadline)
+            except requests.exceptions.ReadTimeout as e:
+                # Tweet sudah terkirim tapi respon tidak datang: bisa saja sudah terposting
+                raise TimeoutError(f"respon tweet tidak datang: {e}") from e
+            self._record_limits(account, "tweet", response.headers)
+            return response.json()["data"]["id"]
+
+    def metrics(self):
+        with self._lock:
+            latency = {endpoint: sorted(values) for endpoint, values in self.latency.items()}
+            counts = dict(self.counts)
+        summary = {}
+        for endpoint, ordered in latency.items():
+            if not ordered:
+                continue
+            summary[endpoint] = {
+                "count": counts[endpoint],
+                "avg": sum(ordered) / len(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "max": ordered[-1],
+            }
+        return summary
+
+
+_x_clients = None
+
+
+def get_x_clients():
+    global _x_clients
+    if _x_clients is None:
+        _x_clients = XClients()
+    return _x_clients
+
+
+@timed("upload_x", ok=bool)
+def tweet_image(x_key, x_keysecret, x_access, x_accesstoken, x_bearertoken, image_path, tweet_text, timeout=None):
+    """
+    Upload gambar dan buat tweet di X (Twitter).
+
+    Args:
+        image_path (str): Path file gambar yang akan diunggah.
+        tweet_text (str): Isi tweet.
+        timeout (float): Batas detik termasuk tunggu rate limit (None = X_MAX_WAIT).
+    """
+
+    try:
+        credentials = (x_key, x_keysecret, x_access, x_accesstoken, x_bearertoken)
+        tweet_id = get_x_clients().post(credentials, image_path, tweet_text, timeout)
+
+        tweet_url = f"https://x.com/user/status/{tweet_id}"
+        logging.info(tweet_url)
+
+        return tweet_id
+
+    except TimeoutError as e:
+        logging.error(f"[!] Status tweet tidak diketahui: {e}")
+        raise
+
+    except Exception as e:
+        logging.error(f"[!] Gagal upload tweet: {e}")
+
+
+def publish(credentials, image, caption, timeout=None):
+    """Upload poster lalu tweet. Return id tweet."""
+    return tweet_image(*(credentials[f] for f in X_FIELDS), image, caption, timeout=timeout)
@@ -0,0 +1,560 @@
+"""Layout, encode dan cache poster."""
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from io import BytesIO
+from urllib.parse import urlparse
+
+from PIL import Image, ImageDraw, ImageFont
+
+from .config import (
+    FONTSIZE_1, FONTSIZE_2, FONTSIZE_3, FONT_1, FONT_2, FONT_3, LOGO, POSTER_BODY_HEIGHT,
+    POSTER_FORMAT, POSTER_PROGRESSIVE, POSTER_QUALITY, POSTER_RENDITIONS, POSTER_WIDTH,
+    RENDER_CACHE_DIR, RENDER_CACHE_MB, RENDITIONS,
+)
+from .filecache import evict_lru, scan_files
+from .telemetry import metrics, timed
+
+
+# === 5. Fungsi pembuat poster ===
+@functools.lru_cache(maxsize=65536)
+def _text_length(font, text):
+    """Lebar advance teks, di-cache per (font, teks) supaya tiap kata diukur sekali."""
+    return font.getlength(text)
+
+
+def _text_width(draw, text, font):
+    bbox = draw.textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0]
+
+
+def _split_long_word(draw, word, font, max_width):
+    """Potong kata yang lebih lebar dari max_width jadi beberapa baris."""
+    chunks = []
+    while word:
+        # Cari prefix terpanjang yang masih muat (minimal 1 karakter)
+        lo, hi = 1, len(word)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if _text_width(draw, word[:mid], font) <= max_width:
+                lo = mid
+            else:
+                hi = mid - 1
+        chunks.append(word[:lo])
+        word = word[lo:]
+    return chunks
+
+
+def wrap_text(draw, text, font, max_width):
+    """
+    Pecah teks jadi baris-baris yang lebarnya <= max_width.
+
+    Lebar baris dihitung incremental dari lebar kata yang di-cache. Lebar itu
+    bisa beda beberapa piksel dari textbbox (bearing glyph), jadi kalau
+    hasilnya dekat batas (selisih < font.size) baris diukur ulang dengan
+    textbbox supaya pemotongan baris sama persis dengan cara lama.
+    Kata yang lebih lebar dari max_width dipotong per karakter.
+    """
+    words = text.split()
+    lines, line, line_w = [], [], 0.0
+    space_w = _text_length(font, " ")
+    margin = font.size
+
+    for word in words:
+        word_w = _text_length(font, word)
+
+        if word_w > max_width - margin and _text_width(draw, word, font) > max_width:
+            if line:
+                lines.append(" ".join(line))
+            chunks = _split_long_word(draw, word, font, max_width)
+            lines.extend(chunks[:-1])
+            line, line_w = [chunks[-1]], _text_length(font, chunks[-1])
+            continue
+
+        if not line:
+            line, line_w = [word], word_w
+            continue
+
+        est = line_w + space_w + word_w
+        if est <= max_width - margin:
+            fits = True
+        elif est > max_width + margin:
+            fits = False
+        else:
+            fits = _text_width(draw, " ".join(line) + " " + word, font) <= max_width
+
+        if fits:
+            line.append(word)
+            line_w = est
+        else:
+            lines.append(" ".join(line))
+            line, line_w = [word], word_w
+
+    if line:
+        lines.append(" ".join(line))
+    return lines
+
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def iter_sentences(paragraphs):
+    """Kalimat dari paragraf-paragraf secara berurutan (lazy, satu pass per paragraf)."""
+    for paragraph in paragraphs:
+        for sentence in _SENTENCE_END.split(paragraph.strip()):
+            if sentence:
+                yield sentence
+
+
+def fit_sentences(draw, sentences, font, max_width, max_lines, ellipsis="..."):
+    """
+    Ambil kalimat berurutan sebanyak mungkin selama hasil wrap_text-nya
+    <= max_lines baris.
+
+    Wrap greedy tidak mengubah baris sebelumnya saat teks ditambah, jadi
+    tiap kalimat baru cukup di-wrap bersama baris terakhir saja; total kerja
+    linear terhadap panjang teks yang dipakai. Kalau kalimat pertama saja
+    sudah tidak muat, kata-katanya dipotong dan diakhiri `ellipsis`.
+    """
+    if max_lines <= 0:
+        return ""
+    taken, lines = [], []
+    for sentence in sentences:
+        tail = (lines[-1] + " " + sentence) if lines else sentence
+        new_lines = lines[:-1] + wrap_text(draw, tail, font, max_width)
+        if len(new_lines) > max_lines:
+            if not taken:
+                return _truncate_words(draw, sentence, font, max_width, max_lines, ellipsis)
+            break
+        taken.append(sentence)
+        lines = new_lines
+    return " ".join(taken)
+
+
+def _truncate_words(draw, text, font, max_width, max_lines, ellipsis):
+    """Prefix kata terpanjang dari `text` + ellipsis yang masih muat max_lines baris."""
+    words = text.split()
+    lo, hi = 0, len(words)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        candidate = " ".join(words[:mid]).rstrip(",;:") + ellipsis
+        if len(wrap_text(draw, candidate, font, max_width)) <= max_lines:
+            lo = mid
+        else:
+            hi = mid - 1
+    return (" ".join(words[:lo]).rstrip(",;:") + ellipsis) if lo else ""
+
+
+class PosterRenderer:
+    """
+    Pembuat poster yang menyimpan resource mahal antar panggilan.
+
+    Font di-load sekali, logo di-load sekali lalu hasil resize-nya di-cache per
+    lebar poster, dan pengukuran teks memakai canvas 1x1 (textbbox tidak
+    bergantung pada ukuran canvas). Hasilnya identik dengan versi lama.
+    Dibuat sekali per proses, lihat get_renderer().
+    """
+
+    spacing_title, spacing_body = 5, 6
+    padding_top_bottom = 40
+
+    def __init__(self, logo_path=LOGO):
+        self.logo_path = logo_path
+        self.font_hashtag = ImageFont.truetype(FONT_1, FONTSIZE_1)
+        self.font_title = ImageFont.truetype(FONT_2, FONTSIZE_2)
+        self.font_body = ImageFont.truetype(FONT_3, FONTSIZE_3)
+        self.measure = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+        self._logo = None
+        self._logo_failed = False
+        self._logos = {}
+
+    def fit_body(self, paragraphs, width=POSTER_WIDTH, max_height=POSTER_BODY_HEIGHT):
+        """Kalimat awal dari `paragraphs` yang muat di area body poster selebar `width`."""
+        max_lines = max_height // (self.font_body.size + self.spacing_body)
+        return fit_sentences(self.measure, iter_sentences(paragraphs), self.font_body,
+                             int(width*0.9), max_lines)
+
+    def logo(self, width):
+        """Logo RGBA yang sudah di-resize untuk poster selebar `width` (atau None)."""
+        max_logo_width = int(width * 0.15)
+        if max_logo_width in self._logos:
+            return self._logos[max_logo_width]
+        if self._logo is None and not self._logo_failed:
+            try:
+                self._logo = Image.open(self.logo_path).convert("RGBA")
+            except Exception as e:
+                self._logo_failed = True
+                logging.error(f"Gagal load logo: {e}")
+        if self._logo is None:
+            return None
+
+        ratio = max_logo_width / self._logo.width
+        logo = self._logo.resize((max_logo_width, int(self._logo.height * ratio)))
+        self._logos[max_logo_width] = logo
+        return logo
+
+    def compose(self, content_title, content_body, hashtag, bg_path):
+        """Layout poster (satu kali) sebagai Image RGB; None kalau background gagal di-load."""
+        try:
+            bg = Image.open(bg_path).convert("RGB")
+        except Exception as e:
+            logging.error(f"[x] Gagal load background: {e}")
+            return None
+
+        width, height = bg.size
+        font_hashtag, font_title, font_body = self.font_hashtag, self.font_title, self.font_body
+
+        lines_title = wrap_text(self.measure, content_title, font_title, int(width*0.9))
+        lines_body = wrap_text(self.measure, content_body, font_body, int(width*0.9))
+
+        spacing_title, spacing_body = self.spacing_title, self.spacing_body
+        total_text_height = (len(lines_title) * (font_title.size + spacing_title) +
+                             len(lines_body) * (font_body.size + spacing_body))
+
+        footer_height = total_text_height + self.padding_top_bottom*2 + 80
+
+        new_height = height + footer_height
+        img = Image.new("RGB", (width, new_height), "white")
+        img.paste(bg, (0, 0))
+
+        draw = ImageDraw.Draw(img)
+        footer_y = height
+        draw.rectangle([0, footer_y, width, new_height], fill=(253, 34, 66))
+
+        # Logo
+        logo = self.logo(width)
+        if logo is not None:
+            img.paste(logo, (30, 30), logo)
+
+        bbox = draw.textbbox((0, 0), hashtag, font=font_hashtag)
+        text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+        pad_x, pad_y = 20, 10
+        box_x1 = (width - text_w)//2 - pad_x
+        box_y1 = footer_y + 20
+        box_x2 = box_x1 + text_w + pad_x*2
+        box_y2 = box_y1 + text_h + pad_y*2
+
+        draw.rectangle([box_x1, box_y1, box_x2, box_y2], fill="white")
+        draw.text(((width-text_w)//2, box_y1+pad_y), hashtag,
+                  font=font_hashtag, fill=(253,34,66))
+
+        y_text = box_y2 + 30
+        for line in lines_title:
+            draw.text((50, y_text), line, font=font_title, fill="white")
+            y_text += font_title.size + spacing_title
+
+        y_text += 20
+        for line in lines_body:
+            draw.text((50, y_text), line, font=font_body, fill="white")
+            y_text += font_body.size + spacing_body
+        return img
+
+    @staticmethod
+    def _save(img, output_file):
+        if output_file is None:
+            # Mode di memori: encode sekali, return bytes JPEG
+            buf = BytesIO()
+            img.save(buf, "JPEG")
+            return buf.getvalue()
+        img.save(output_file)
+        return output_file
+
+    def render(self, content_title, content_body, hashtag, bg_path, output_file):
+        """Simpan poster ke `output_file` dan return path-nya; kalau None, return bytes JPEG."""
+        img = self.compose(content_title, content_body, hashtag, bg_path)
+        return None if img is None else self._save(img, output_file)
+
+
+def encode_to_budget(img, max_bytes, fmt="JPEG", progressive=False, quality=POSTER_QUALITY):
+    """
+    Encode `img` dengan kualitas tertinggi (dalam rentang `quality`) yang
+    hasilnya <= `max_bytes`. Kalau kualitas terendah pun masih lebih besar,
+    hasil kualitas terendah yang dipakai. Return (bytes, kualitas).
+
+    Encode final (optimize/progressive) 2-3x lebih lambat dari encode biasa,
+    jadi binary search memakai encode biasa dengan batas yang diskalakan
+    rasio ukuran keduanya di kualitas tertinggi, lalu hasilnya di-encode
+    ulang sekali dengan setting final.
+    """
+    def encode(q, final=True):
+        buf = BytesIO()
+        if fmt == "WEBP":
+            img.save(buf, "WEBP", quality=q, method=4 if final else 0)
+        elif final:
+            img.save(buf, "JPEG", quality=q, optimize=True, progressive=progressive)
+        else:
+            img.save(buf, "JPEG", quality=q)
+        return buf.getvalue()
+
+    lo, hi = quality
+    data = encode(hi)
+    if len(data) <= max_bytes:
+        return data, hi
+    ratio = len(data) / len(encode(hi, final=False))
+    target, best_q, hi = max_bytes / ratio, lo, hi - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if len(encode(mid, final=False)) <= target:
+            best_q, lo = mid, mid + 1
+        else:
+            hi = mid - 1
+    # Rasio tidak persis sama di semua kualitas: turunkan sedikit kalau masih lewat
+    data = encode(best_q)
+    while len(data) > max_bytes and best_q > quality[0]:
+        best_q = max(best_q - 2, quality[0])
+        data = encode(best_q)
+    return data, best_q
+
+
+def fit_canvas(img, size, fill=(253, 34, 66)):
+    """Poster diperkecil (tidak pernah diperbesar) agar muat utuh di kanvas `size`, sisanya diisi warna footer."""
+    if size is None or img.size == tuple(size):
+        return img
+    width, height = size
+    scale = min(width / img.width, height / img.height)
+    resized = img
+    if scale < 1:
+        resized = img.resize((max(round(img.width * scale), 1), max(round(img.height * scale), 1)),
+                             Image.BICUBIC)
+    canvas = Image.new("RGB", (width, height), fill)
+    canvas.paste(resized, ((width - resized.width) // 2, (height - resized.height) // 2))
+    return canvas
+
+
+def poster_renditions(img, platforms):
+    """Bytes poster per platform (lihat RENDITIONS), masing-masing di bawah batas KB-nya."""
+    if not POSTER_RENDITIONS:
+        return {}
+    renditions = {}
+    for platform in platforms:
+        if platform not in RENDITIONS or platform in renditions:
+            continue
+        size, max_kb = RENDITIONS[platform]
+        fmt = "JPEG" if platform == "IG" else POSTER_FORMAT
+        renditions[platform], _ = encode_to_budget(fit_canvas(img, size), max_kb * 1024,
+                                                   fmt, POSTER_PROGRESSIVE)
+    return renditions
+
+
+_renderers = {}
+
+
+def get_renderer(logo_path=LOGO):
+    """PosterRenderer per logo, dibuat sekali per proses."""
+    renderer = _renderers.get(logo_path)
+    if renderer is None:
+        renderer = _renderers[logo_path] = PosterRenderer(logo_path)
+    return renderer
+
+
+@functools.lru_cache(maxsize=1024)
+def _file_digest(path, mtime_ns, size):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_digest(path):
+    """Hash isi file (di-cache per path+mtime+ukuran), None kalau file tidak ada."""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return _file_digest(path, st.st_mtime_ns, st.st_size)
+
+
+class RenderCache:
+    """
+    Cache hasil render poster di disk, key = hash semua input poster.
+
+    Input = judul, body, hashtag, isi file background dan logo, file dan
+    ukuran font, plus setting encode (RENDITIONS, POSTER_FORMAT, dst.). Tiap
+    varian ("poster" dan rendition per platform) disimpan sebagai file
+    `<key>.<varian>`, ditulis dengan os.replace jadi aman dipakai bersama
+    worker RenderPool. LRU memakai mtime file (di-update tiap hit); total
+    ukuran dibatasi `max_bytes`. Naikkan `version` kalau layout poster berubah.
+    """
+
+    version = 1
+
+    def __init__(self, directory=RENDER_CACHE_DIR, max_bytes=RENDER_CACHE_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        """(path, ukuran, mtime) semua file cache."""
+        return scan_files(self.directory, lambda name: not name.endswith(".tmp"))
+
+    def key(self, content_title, content_body, hashtag, bg_path, renderer):
+        fonts = [(font.path, file_digest(font.path), font.size)
+                 for font in (renderer.font_hashtag, renderer.font_title, renderer.font_body)]
+        inputs = [
+            self.version, content_title, content_body, hashtag,
+            file_digest(bg_path), file_digest(renderer.logo_path), fonts,
+            POSTER_RENDITIONS, RENDITIONS, POSTER_FORMAT, POSTER_PROGRESSIVE, POSTER_QUALITY,
+        ]
+        data = json.dumps(inputs, ensure_ascii=False).encode("utf-8")
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    def get(self, key, variants):
+        """Dict {varian: bytes} kalau semua `variants` ada di cache, selain itu None."""
+        posters = {}
+        for variant in variants:
+            path = os.path.join(self.directory, f"{key}.{variant}")
+            try:
+                with open(path, "rb") as f:
+                    posters[variant] = f.read()
+                os.utime(path)
+            except FileNotFoundError:
+                with self._lock:
+                    self.misses += 1
+                return None
+        with self._lock:
+            self.hits += 1
+        return posters
+
+    def put(self, key, posters):
+        added = 0
+        for variant, data in posters.items():
+            path = os.path.join(self.directory, f"{key}.{variant}")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            added += len(data)
+        with self._lock:
+            self._bytes += added
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Hitung ulang dari disk: worker lain juga menulis ke direktori yang sama
+        self._bytes, _ = evict_lru(self._entries(), self.max_bytes)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "bytes": self._bytes}
+
+
+_render_cache = None
+
+
+def get_render_cache():
+    """RenderCache per proses, None kalau dimatikan (RENDER_CACHE_MB=0)."""
+    global _render_cache
+    if _render_cache is None and RENDER_CACHE_MB > 0:
+        _render_cache = RenderCache()
+    return _render_cache
+
+
+def render_poster_set(content_title, content_body, hashtag, bg_path, output_file,
+                      platforms=(), logo_path=LOGO):
+    """
+    Poster dan rendition untuk tiap platform di `platforms` dari satu layout,
+    lewat RenderCache: kalau semua varian sudah ada, tidak ada render sama
+    sekali. Poster ditulis ke `output_file` (JPEG) kalau diisi.
+
+    Return (output, {platform: bytes}, cached); output = path `output_file`
+    atau bytes JPEG poster, None kalau gagal. Hit/miss dicatat ke metrics
+    sebagai stage render_cache_hit/render_cache_miss.
+    """
+    t0 = time.perf_counter()
+    renderer = get_renderer(logo_path)
+    cache = get_render_cache()
+    variants = ["poster"]
+    if POSTER_RENDITIONS:
+        variants += sorted({p for p in platforms if p in RENDITIONS})
+    key = cache.key(content_title, content_body, hashtag, bg_path, renderer) if cache else None
+    posters = cache.get(key, variants) if cache else None
+    cached = posters is not None
+    if not cached:
+        img = renderer.compose(content_title, content_body, hashtag, bg_path)
+        if img is not None:
+            posters = dict(poster_renditions(img, platforms), poster=renderer._save(img, None))
+            if cache:
+                cache.put(key, posters)
+    if cache:
+        metrics.observe("render_cache_hit" if cached else "render_cache_miss", time.perf_counter() - t0)
+    if posters is None:
+        return None, {}, False
+
+    output = posters.pop("poster")
+    if output_file:
+        tmp_path = output_file + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(output)
+        os.replace(tmp_path, output_file)
+        output = output_file
+    return output, posters, cached
+
+
+def _is_jpeg_output(output_file):
+    return output_file is None or output_file.lower().endswith((".jpg", ".jpeg"))
+
+
+@timed("poster", ok=bool)
+def buat_poster(content_title, content_body, hashtag, logo_path, bg_path, output_file):
+    if get_render_cache() is None or not _is_jpeg_output(output_file):
+        return get_renderer(logo_path).render(content_title, content_body, hashtag, bg_path, output_file)
+    output, _, _ = render_poster_set(content_title, content_body, hashtag, bg_path,
+                                     output_file, logo_path=logo_path)
+    return output
+
+
+# def get_safe_filename_from_url(url):
+#     parsed = urlparse(url)
+#     basename = os.path.basename(parsed.path)
+#     name, _ = os.path.splitext(basename)
+#     safe_name = re.sub(r'[<>:"/\\|?*]', '_', name)
+#     safe_name = safe_name.strip().replace(' ', '_')
+#     return safe_name
+
+def get_safe_filename_from_url(url):
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/")  # hapus slash di akhir jika ada
+    basename = os.path.basename(path)
+    name, _ = os.path.splitext(basename)
+
+    # Kalau kosong, fallback pakai domain (biar gak kosong total)
+    if not name:
+        name = parsed.netloc.replace('.', '_')
+
+    safe_name = re.sub(r'[<>:"/\\|?*]', '_', name)
+    safe_name = safe_name.strip().replace(' ', '_')
+    return safe_name
+
+
+def background_width(bg_path, default=POSTER_WIDTH):
+    """Lebar gambar `bg_path` (hanya header yang dibaca), `default` kalau gagal dibuka."""
+    if not bg_path:
+        return default
+    try:
+        with Image.open(bg_path) as img:
+            return img.width
+    except Exception:
+        return default
+
+
+def build_poster_body(result, renderer=None, bg_path=None):
+    """
+    Teks body poster dari hasil scrape: kalimat-kalimat awal artikel (atau
+    og:description) sebanyak yang muat di POSTER_BODY_HEIGHT piksel. Lebar
+    poster = lebar background `bg_path` (og:image yang lebih kecil dari
+    POSTER_WIDTH tidak di-upscale), jadi body di-fit ke lebar itu.
+    """
+    paragraphs = result.get("paragraphs") or []
+    if not any(p.strip() for p in paragraphs):
+        description = (result.get("meta") or {}).get("og:description") or ""
+        paragraphs = [description] if description.strip() else []
+    return (renderer or get_renderer()).fit_body(paragraphs, background_width(bg_path))
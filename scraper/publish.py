@@ -0,0 +1,142 @@
+"""Kirim poster ke semua akun tujuan secara paralel."""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from .config import PUBLISH_LIMITS, PUBLISH_TIMEOUT
+from .telemetry import metrics
+from .platforms import SOSMED_URLS, get_platform
+from .report import get_report_sink
+from .store import get_store
+
+
+# === 7. Publish ke semua akun ===
+
+# Satu pool per platform, ukurannya = batas upload bersamaan platform itu
+_publish_executors = {
+    platform: ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"publish-{platform}")
+    for platform, n in PUBLISH_LIMITS.items()
+}
+
+
+def _publish_one(account, image_path, caption, image_data=None, deadline=None):
+    """
+    Upload ke satu akun lewat plugin platformnya. Return post_id, raise
+    kalau gagal.
+
+    Kalau `image_data` (bytes poster) ada, uploader dapat BytesIO sendiri di
+    atas buffer yang sama, bukan membuka file lagi. Sisa waktu sampai
+    `deadline` (time.monotonic) diteruskan ke plugin sebagai timeout.
+    """
+    platform, credentials = account["sosmed"], account["credentials"]
+    timeout = None
+    if deadline is not None:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            raise RuntimeError("batas waktu habis sebelum upload dimulai")
+    if image_data is not None:
+        image_path = BytesIO(image_data)
+        image_path.name = "poster.webp" if image_data[:4] == b"RIFF" else "poster.jpg"
+    post_id = get_platform(platform).publish(credentials, image_path, caption, timeout=timeout)
+    if not post_id:
+        raise RuntimeError("upload gagal")
+    size = len(image_data) if image_data is not None else os.path.getsize(image_path)
+    metrics.add_bytes(f"upload_{platform.lower()}", size)
+    return str(post_id)
+
+
+def publish_all(accounts, image_path, caption, timeout=PUBLISH_TIMEOUT, image_data=None):
+    """
+    Kirim satu poster ke semua akun secara paralel.
+
+    Poster dari `image_data` (bytes, dibaca/di-encode sekali untuk semua
+    akun, atau dict hasil load_poster: rendition per platform dengan
+    fallback "poster") atau dari file `image_path`. Instagram memakai
+    `image_path` kalau tidak ada rendition IG, karena instagrapi butuh path.
+
+    Jumlah upload bersamaan dibatasi per platform (PUBLISH_IG/FB/X). Akun
+    yang gagal atau lewat `timeout` tidak menggagalkan akun lain. Return list
+    dict per akun: sosmed, username, post_id, url_sosmed, status, error, seconds.
+
+    Status "unknown": upload sudah jalan tapi belum selesai saat `timeout`
+    habis, atau plugin raise TimeoutError (request terkirim, respon tidak
+    datang), jadi mungkin tetap terposting. Jangan di-retry (bisa dobel).
+    Upload yang belum sempat mulai dibatalkan dan dicatat "failed".
+    """
+    deadline = time.monotonic() + timeout
+    futures = []
+    for account in accounts:
+        t0 = time.perf_counter()
+        platform = account["sosmed"]
+        data = image_data
+        if isinstance(image_data, dict):
+            data = image_data.get(platform)
+            if data is None and not (platform == "IG" and image_path):
+                data = image_data.get("poster")
+        elif platform == "IG" and image_path:
+            data = None
+        fut = _publish_executors[platform].submit(_publish_one, account, image_path, caption, data, deadline)
+        futures.append((account, t0, fut))
+
+    results = []
+    for account, t0, fut in futures:
+        result = {
+            "sosmed": account["sosmed"],
+            "username": account["username"],
+            "post_id": "",
+            "url_sosmed": "",
+            "status": "pending",
+            "error": None,
+        }
+        remaining = max(deadline - time.monotonic(), 0)
+        try:
+            post_id = fut.result(timeout=remaining)
+            result.update(
+                post_id=post_id,
+                url_sosmed=SOSMED_URLS[account["sosmed"]] + post_id,
+                status="done",
+            )
+        except TimeoutError as e:
+            # TimeoutError dari plugin juga berarti respon tidak datang setelah upload terkirim
+            if not fut.done() and fut.cancel():
+                result.update(status="failed", error=f"belum mulai upload setelah {timeout}s")
+            else:
+                result.update(status="unknown", error=str(e) or f"upload lebih dari {timeout}s, status tidak diketahui")
+        except Exception as e:
+            result.update(status="failed", error=str(e))
+        result["seconds"] = time.perf_counter() - t0
+
+        if result["error"]:
+            logging.error(f"[x] Post {account['sosmed']} {account['username']} gagal: {result['error']}")
+        results.append(result)
+    return results
+
+
+def record_publish_results(url_site, results):
+    """Simpan hasil publish: satu update status artikel dan satu batch baris Excel."""
+    done = [r for r in results if r["status"] == "done"]
+    if done:
+        # Digabung dengan post_id dari batch sebelumnya (akun lain, worker lain)
+        # di dalam satu transaksi store
+        try:
+            if get_store().merge_post_ids(url_site, [f"{r['sosmed']}:{r['post_id']}" for r in done]):
+                logging.info(f"[✓] Status 'done' diupdate untuk: {url_site}")
+            else:
+                logging.warning(f"[!] Link {url_site} tidak ditemukan di database.")
+        except Exception as e:
+            logging.error(f"[!] Gagal update status: {e}")
+
+    with metrics.timer("save_excel"):
+        get_report_sink().extend(
+            {
+                "sosmed": r["sosmed"],
+                "username": r["username"],
+                "url_site": url_site,
+                "url_sosmed": r["url_sosmed"],
+                "status": r["status"],
+            }
+            for r in results
+        )
+    logging.info(f"Success Post ({len(done)}/{len(results)} akun)")
@@ -0,0 +1,202 @@
+"""
+Antrian job SQLite (JobQueue). Hanya memakai stdlib dan config, jadi bisa
+di-import perintah ringan seperti `report` tanpa ikut memuat Pillow,
+requests atau modul poster.
+"""
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from .config import JOB_LEASE, JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY, POST_INTERVAL, QUEUE_DB
+
+
+class JobQueue:
+    """
+    Antrian job persisten di SQLite, bisa dipakai beberapa proses sekaligus.
+
+    Tiap job punya `stage` dan `key` unik per stage (URL, link artikel, atau
+    link|akun), jadi enqueue ulang item yang sama diabaikan. Worker mengambil
+    job dengan claim() yang memberi lease `JOB_LEASE` detik; job "running"
+    yang lease-nya habis (worker mati/crash) diambil ulang oleh worker lain
+    atau run berikutnya. Jadwal posting per akun disimpan di tabel cadence.
+    """
+
+    def __init__(self, path=QUEUE_DB, lease=JOB_LEASE, max_attempts=JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                run_after REAL NOT NULL DEFAULT 0,
+                lease_until REAL,
+                error TEXT,
+                created REAL NOT NULL,
+                UNIQUE (stage, key)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (stage, status, run_after);
+            CREATE TABLE IF NOT EXISTS cadence (
+                account TEXT PRIMARY KEY,
+                next_at REAL NOT NULL
+            );
+            """
+        )
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Transaksi (BEGIN IMMEDIATE) di koneksi antrian, yield koneksinya.
+        Tabel lain di database yang sama (mis. FeedTracker) bisa ikut di-commit
+        bersama; enqueue di dalamnya harus memakai `conn=`.
+        """
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def enqueue(self, stage, key, payload, run_after=0, conn=None):
+        """Tambah job. Return False kalau (stage, key) sudah pernah di-enqueue."""
+        sql = "INSERT OR IGNORE INTO jobs (stage, key, payload, run_after, created) VALUES (?, ?, ?, ?, ?)"
+        args = (stage, key, json.dumps(payload, ensure_ascii=False), run_after, time.time())
+        if conn is not None:
+            return conn.execute(sql, args).rowcount == 1
+        with self._lock:
+            cur = self.conn.execute(sql, args)
+        return cur.rowcount == 1
+
+    def claim(self, stage, limit=1):
+        """Ambil maks `limit` job siap jalan untuk `stage` dan tandai running."""
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.conn.execute(
+                    """
+                    SELECT id, key, payload, attempts FROM jobs
+                    WHERE stage = ? AND (
+                        (status = 'pending' AND run_after <= ?)
+                        OR (status = 'running' AND lease_until < ?)
+                    )
+                    ORDER BY run_after, id LIMIT ?
+                    """,
+                    (stage, now, now, limit),
+                ).fetchall()
+                self.conn.executemany(
+                    "UPDATE jobs SET status = 'running', lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(now + self.lease, row[0]) for row in rows],
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return [
+            {"id": job_id, "stage": stage, "key": key, "payload": json.loads(payload), "attempts": attempts + 1}
+            for job_id, key, payload, attempts in rows
+        ]
+
+    @contextlib.contextmanager
+    def claimed(self, stage, limit=1):
+        """
+        claim() untuk satu putaran stage. Kalau blok gagal dengan exception,
+        job yang masih "running" (belum complete/fail/defer) langsung
+        dikembalikan ke antrian lewat abandon(), tidak menunggu lease habis.
+        """
+        jobs = self.claim(stage, limit)
+        try:
+            yield jobs
+        except Exception as e:
+            self.abandon(jobs, e)
+            raise
+
+    def abandon(self, jobs, error, retry_in=JOB_RETRY_DELAY):
+        """fail() untuk job di `jobs` yang masih "running"; job yang sudah selesai tidak disentuh."""
+        try:
+            with self._lock:
+                cur = self.conn.executemany(
+                    """
+                    UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                                    error = ?, run_after = ?
+                    WHERE id = ? AND status = 'running'
+                    """,
+                    [(self.max_attempts, str(error), time.time() + retry_in, job["id"]) for job in jobs],
+                )
+        except sqlite3.Error as e:
+            # Database masih terkunci: job diambil ulang setelah lease habis
+            logging.error(f"[!] Gagal mengembalikan {len(jobs)} job ke antrian: {e}")
+            return 0
+        return cur.rowcount
+
+    def complete(self, job, status="done", error=None):
+        """Job selesai, tidak diambil lagi (status "unknown" = hasilnya tidak pasti, jangan diulang)."""
+        with self._lock:
+            self.conn.execute("UPDATE jobs SET status = ?, error = ? WHERE id = ?", (status, error, job["id"]))
+
+    def fail(self, job, error, retry_in=JOB_RETRY_DELAY):
+        """Job gagal: dicoba lagi setelah `retry_in` detik sampai max_attempts."""
+        status = "failed" if job["attempts"] >= self.max_attempts else "pending"
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, run_after = ? WHERE id = ?",
+                (status, str(error), time.time() + retry_in, job["id"]),
+            )
+        logging.error(f"[x] Job {job['stage']} {job['key']} gagal ({job['attempts']}x): {error}")
+
+    def defer(self, job, run_after):
+        """Kembalikan job ke antrian tanpa dihitung sebagai percobaan."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'pending', run_after = ?, attempts = attempts - 1 WHERE id = ?",
+                (run_after, job["id"]),
+            )
+
+    def reserve_slot(self, account, interval=POST_INTERVAL):
+        """
+        Rate limit posting per akun: kalau akun boleh posting sekarang, slot
+        berikutnya digeser `interval` detik dan return 0. Kalau belum, return
+        waktu (epoch) kapan akun boleh posting lagi.
+        """
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute("SELECT next_at FROM cadence WHERE account = ?", (account,)).fetchone()
+                if row and row[0] > now:
+                    self.conn.execute("COMMIT")
+                    return row[0]
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cadence (account, next_at) VALUES (?, ?)",
+                    (account, now + interval),
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return 0
+
+    def release_slot(self, account):
+        """Batalkan slot yang baru di-reserve (posting gagal, akun boleh coba lagi)."""
+        with self._lock:
+            self.conn.execute("UPDATE cadence SET next_at = ? WHERE account = ?", (time.time(), account))
+
+    def counts(self):
+        """Jumlah job per (stage, status)."""
+        with self._lock:
+            rows = self.conn.execute("SELECT stage, status, COUNT(*) FROM jobs GROUP BY stage, status").fetchall()
+        return {(stage, status): n for stage, status, n in rows}
@@ -0,0 +1,127 @@
+"""Render poster paralel di process pool."""
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .config import LOGO, RENDER_CACHE_MB, RENDER_WORKERS
+from .telemetry import metrics
+from .poster import get_renderer, render_poster_set
+
+
+# === 5b. Render poster paralel (multi-proses) ===
+RENDER_FIELDS = ("title", "body", "hashtag", "bg_path", "output_file")
+
+
+def _init_render_worker(logo_path):
+    # Font dan logo di-load sekali saat worker start
+    get_renderer(logo_path)
+
+
+def _render_job(args, logo_path, platforms=()):
+    title, body, hashtag, bg_path, output_file = args
+    t0 = time.perf_counter()
+    output, renditions, cached = render_poster_set(title, body, hashtag, bg_path, output_file,
+                                                   platforms, logo_path)
+    return output, renditions, cached, time.perf_counter() - t0
+
+
+class RenderPool:
+    """
+    Render poster di process pool, satu worker per core.
+
+    Job berupa dict dengan key RENDER_FIELDS, plus "platforms" opsional
+    (rendition yang ikut dibuat, lihat RENDITIONS); key lain (mis. "result")
+    ikut dikembalikan apa adanya tanpa dikirim ke worker. Job yang selesai
+    ditambah "ok" (poster berhasil dibuat), "seconds" (waktu render di
+    worker), "cached" (diambil dari RenderCache) dan "data" (dict bytes:
+    "poster" kalau "output_file" None, dan satu entry per rendition platform).
+
+        with RenderPool() as pool:
+            pool.submit(job)
+            for job in pool.completed():   # yang sudah selesai, tidak blocking
+                ...
+            for job in pool.drain():       # tunggu sisanya
+                ...
+    """
+
+    def __init__(self, max_workers=RENDER_WORKERS, logo_path=LOGO, samples=1000):
+        self.logo_path = logo_path
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_render_worker,
+            initargs=(logo_path,),
+        )
+        self.pending = {}
+        # Waktu render sejak drain() terakhir (dibatasi: pool worker hidup selama proses)
+        self.timings = deque(maxlen=samples)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close(cancel=exc[0] is not None)
+
+    def close(self, cancel=False):
+        self.executor.shutdown(wait=True, cancel_futures=cancel)
+
+    def submit(self, job):
+        args = tuple(job[f] for f in RENDER_FIELDS)
+        fut = self.executor.submit(_render_job, args, self.logo_path, tuple(job.get("platforms", ())))
+        self.pending[fut] = job
+        return fut
+
+    def _finish(self, fut):
+        job = self.pending.pop(fut)
+        try:
+            output, renditions, cached, seconds = fut.result()
+        except Exception as e:
+            logging.error(f"[x] Gagal render {job['output_file']}: {e}")
+            output, renditions, cached, seconds = None, {}, False, 0.0
+        job["ok"] = output is not None
+        job["cached"] = cached
+        job["seconds"] = seconds
+        job["data"] = dict(renditions, poster=output) if isinstance(output, bytes) else renditions
+        self.timings.append(seconds)
+        # Render jalan di proses worker, jadi metriknya dicatat di sini
+        metrics.observe("poster", seconds)
+        if RENDER_CACHE_MB > 0:
+            metrics.observe("render_cache_hit" if cached else "render_cache_miss", seconds)
+        if job["ok"]:
+            size = sum(len(data) for data in job["data"].values())
+            if not isinstance(output, bytes):
+                size += os.path.getsize(output)
+            metrics.add_bytes("poster", size)
+        else:
+            metrics.error("poster")
+        name = job["output_file"] or "di memori"
+        logging.info(f"[✓] Poster {name} ({seconds:.2f}s{', cache' if cached else ''})" if job["ok"]
+                     else f"[x] Poster {name} gagal")
+        return job
+
+    def completed(self):
+        """Yield job yang sudah selesai tanpa menunggu yang masih jalan."""
+        for fut in [f for f in self.pending if f.done()]:
+            yield self._finish(fut)
+
+    def drain(self):
+        """Yield semua job yang tersisa sesuai urutan selesai."""
+        drained = 0
+        while self.pending:
+            done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                drained += 1
+                yield self._finish(fut)
+        if drained:
+            avg = sum(self.timings) / len(self.timings)
+            logging.info(f"Render: {len(self.timings)} poster, rata-rata {avg:.2f}s, maks {max(self.timings):.2f}s")
+            self.timings.clear()
+
+
+def render_posters(jobs, max_workers=RENDER_WORKERS, logo_path=LOGO):
+    """Render banyak job sekaligus, yield job begitu selesai."""
+    with RenderPool(max_workers, logo_path) as pool:
+        for job in jobs:
+            pool.submit(job)
+        yield from pool.drain()
@@ -0,0 +1,221 @@
+"""Laporan posting ke Excel (journal + export batch)."""
+import atexit
+import contextlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .config import REPORT_BATCH, REPORT_XLSX
+from .telemetry import metrics, timed
+
+
+REPORT_HEADERS = ["no", "sosmed", "username", "url site", "url sosmed", "date time post", "status"]
+
+
+class ReportSink:
+    """
+    Penampung baris laporan Excel.
+
+    Baris baru ditulis ke journal (JSON per baris) di samping file .xlsx, lalu
+    digabung ke .xlsx saat `flush()` (otomatis di akhir proses) atau tiap
+    `batch_size` baris kalau diisi. Export memakai mode write-only openpyxl,
+    jadi workbook tidak pernah di-load penuh.
+
+    Beberapa proses (worker, `python -m scraper report`) boleh memakai file
+    yang sama: append dan flush memegang file lock `<xlsx>.lock`. Nomor `no`
+    diambil dari baris terakhir journal, atau dari sheet kalau journal
+    kosong (sheet hanya dibaca ulang kalau file .xlsx berubah).
+    """
+
+    def __init__(self, filename=REPORT_XLSX, batch_size=REPORT_BATCH):
+        self.filename = filename
+        self.journal = filename + ".journal"
+        self.lock_path = filename + ".lock"
+        self.batch_size = batch_size
+        self.pending = 0
+        self._sheet_no = (None, None)  # (stat .xlsx, no terakhir di sheet)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Lock antar proses untuk journal dan .xlsx (dipegang bersama self._lock)."""
+        with open(self.lock_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_journal(self):
+        rows = []
+        if os.path.exists(self.journal):
+            with open(self.journal, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rows.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # baris terakhir terpotong karena crash
+        return rows
+
+    def _journal_last_no(self):
+        """`no` baris terakhir di journal (cukup baca ekornya), None kalau kosong."""
+        try:
+            with open(self.journal, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 8192))
+                tail = f.read()
+        except FileNotFoundError:
+            return None
+        for line in reversed(tail.splitlines()):
+            try:
+                row = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue  # terpotong karena crash, atau awal baris di luar 8 KB
+            if isinstance(row, list) and row and isinstance(row[0], int):
+                return row[0]
+        return None
+
+    def _iter_sheet_rows(self):
+        if not os.path.exists(self.filename):
+            return
+        from openpyxl import load_workbook  # lazy: openpyxl lambat di-import
+
+        wb = load_workbook(self.filename, read_only=True)
+        try:
+            for row in wb.active.iter_rows(min_row=2, values_only=True):
+                yield list(row)
+        finally:
+            wb.close()
+
+    def _sheet_last_no(self):
+        try:
+            st = os.stat(self.filename)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+        if self._sheet_no[0] != stamp:
+            last_no = None
+            for row in self._iter_sheet_rows():
+                if row and row[0] is not None:
+                    last_no = row[0]
+            self._sheet_no = (stamp, last_no)
+        return self._sheet_no[1]
+
+    def _next_no(self):
+        last_no = self._journal_last_no()
+        if last_no is None:
+            last_no = self._sheet_last_no()
+        return last_no + 1 if isinstance(last_no, int) else 1
+
+    def append(self, data):
+        """Tambah satu baris laporan. Return nomor `no` yang dipakai."""
+        return self.extend([data])[0]
+
+    def extend(self, rows):
+        """Tambah banyak baris dengan satu kali tulis ke journal. Return list nomor `no`."""
+        with self._lock, self._file_lock():
+            next_no = self._next_no()
+            numbers, lines = [], []
+            for data in rows:
+                no = next_no + len(numbers)
+                row_data = [
+                    no,
+                    data.get("sosmed", ""),
+                    data.get("username", ""),
+                    data.get("url_site", ""),
+                    data.get("url_sosmed", ""),
+                    data.get("date_time_post", datetime.now().strftime("%Y-%m-%d %I:%M:%S")),
+                    data.get("status", "done")
+                ]
+                numbers.append(no)
+                lines.append(json.dumps(row_data, ensure_ascii=False) + "\n")
+
+            with open(self.journal, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+            self.pending += len(numbers)
+
+            if self.batch_size and self.pending >= self.batch_size:
+                self._flush()
+        return numbers
+
+    def flush(self):
+        """Gabungkan journal ke file .xlsx."""
+        with self._lock, self._file_lock(), metrics.timer("report_flush"):
+            self._flush()
+
+    def _flush(self):
+        # Dipanggil dengan self._lock dan file lock dipegang: tidak ada proses
+        # lain yang bisa menambah baris antara baca journal dan hapus journal
+        journal = self._read_journal()
+        self.pending = 0
+        if not journal:
+            return
+
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(REPORT_HEADERS)
+        for row in self._iter_sheet_rows():
+            ws.append(row)
+        for row in journal:
+            ws.append(row)
+
+        tmp_path = self.filename + ".tmp.xlsx"
+        wb.save(tmp_path)
+        os.replace(tmp_path, self.filename)
+        os.remove(self.journal)
+        last_no = journal[-1][0]
+        st = os.stat(self.filename)
+        self._sheet_no = ((st.st_mtime_ns, st.st_size), last_no)
+
+        logging.info(f"[+] {len(journal)} baris disimpan ke {self.filename}")
+
+
+_report_sinks = {}
+_report_sinks_lock = threading.Lock()
+
+
+def get_report_sink(filename=REPORT_XLSX):
+    """ReportSink per file; sisa journal otomatis di-flush saat proses selesai."""
+    with _report_sinks_lock:
+        sink = _report_sinks.get(filename)
+        if sink is None:
+            sink = ReportSink(filename)
+            atexit.register(sink.flush)
+            _report_sinks[filename] = sink
+    return sink
+
+
+@timed("save_excel")
+def save_to_excel(data, filename=REPORT_XLSX):
+    """
+    Menyimpan data ke file Excel dengan header:
+    no | sosmed | username | url site | url sosmed | date time post | status
+
+    Jika file belum ada, otomatis dibuat dengan header.
+    Kolom 'no' akan auto increment berdasarkan data terakhir.
+    Baris ditampung dulu di journal dan ditulis ke Excel per batch
+    (lihat ReportSink).
+    """
+    next_no = get_report_sink(filename).append(data)
+
+    log = f"[+] Data dicatat untuk {filename} (no={next_no})"
+    logging.info(log)
+    return next_no
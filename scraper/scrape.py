@@ -0,0 +1,343 @@
+"""Scrape halaman berita: judul, meta og:* dan paragraf."""
+import logging
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from .config import (
+    HTML_PARSER, SCRAPE_MAX_BYTES, SCRAPE_MAX_PARAGRAPHS, SCRAPE_PER_HOST, SCRAPE_WORKERS,
+)
+from .telemetry import metrics, timed
+from .net import get_session
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+# === Fungsi pembersih teks ===
+# Karakter yang diganti sebelum difilter (urutan sama dengan versi lama)
+_CLEAN_REPLACEMENTS = (
+    ('\u2013', '-'),    # en dash
+    ('\u2014', '-'),    # em dash
+    ('\u00A0', ' '),    # non-breaking space
+    ('\u200B', ''),     # zero-width space
+    ('\u2026', '...'),  # ellipsis
+)
+# Semua karakter di luar ASCII cetak + Latin (termasuk \n, \t, emoji, CJK)
+_CLEAN_DISALLOWED = re.compile(r'[^\x20-\x7E\u00A0-\u00FF\u0100-\u017F\u0180-\u024F\u1E00-\u1EFF]+')
+
+
+def clean_text(text):
+    if not text:
+        return ""
+
+    for old, new in _CLEAN_REPLACEMENTS:
+        if old in text:
+            text = text.replace(old, new)
+    text = _CLEAN_DISALLOWED.sub('', text)
+    # Setelah filter, satu-satunya whitespace yang tersisa adalah spasi
+    # biasa, jadi split()/join sama dengan re.sub(r'\s+', ' ').strip()
+    return " ".join(text.split())
+
+
+# === 2. Scraper untuk setiap link ===
+META_PROPS = ("og:title", "og:image", "og:description")
+
+
+def _extract_soup(content, encoding=None):
+    """Backend referensi: parse seluruh dokumen dengan html.parser."""
+    from bs4 import BeautifulSoup  # lazy: tidak dipakai kalau backend lxml
+
+    soup = BeautifulSoup(content, "html.parser", from_encoding=encoding)
+
+    title = clean_text(soup.title.string.strip()) if soup.title and soup.title.string else None
+
+    paragraphs = []
+    for p in soup.find_all("p"):
+        # text = clean_text(p.get_text(strip=True))
+        text = clean_text(p.get_text(strip=False))
+        if len(text) > 50:
+            paragraphs.append(text)
+
+    meta_data = {}
+    for prop in META_PROPS:
+        tag = soup.find("meta", property=prop)
+        meta_data[prop] = clean_text(tag["content"]) if tag and tag.has_attr("content") else None
+
+    return title, paragraphs, meta_data
+
+
+def _collect_meta(tags):
+    """Ambil og:* dari iterable tag meta dalam satu kali jalan (tag pertama yang menang)."""
+    found = {}
+    for tag in tags:
+        prop = tag.get("property")
+        if prop in META_PROPS and prop not in found:
+            content = tag.get("content")
+            found[prop] = clean_text(content) if content is not None else None
+            if len(found) == len(META_PROPS):
+                break
+    return {prop: found.get(prop) for prop in META_PROPS}
+
+
+def _extract_strainer(content, encoding=None):
+    """BeautifulSoup, tapi hanya <title>, <meta> dan <p> yang dibangun jadi tree."""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(
+        content,
+        "lxml" if lxml is not None else "html.parser",
+        parse_only=SoupStrainer(["title", "meta", "p"]),
+        from_encoding=encoding,
+    )
+
+    title = clean_text(soup.title.string.strip()) if soup.title and soup.title.string else None
+
+    paragraphs = []
+    for p in soup.find_all("p"):
+        text = clean_text(p.get_text(strip=False))
+        if len(text) > 50:
+            paragraphs.append(text)
+
+    return title, paragraphs, _collect_meta(soup.find_all("meta"))
+
+
+def _extract_lxml(content, encoding=None):
+    """Parse langsung dengan lxml.html (C), tanpa BeautifulSoup."""
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    try:
+        root = lxml.html.document_fromstring(content, parser=parser)
+    except lxml.etree.ParserError:
+        return None, [], _collect_meta([])
+
+    title = None
+    for tag in root.iter("title"):
+        # Sama seperti soup.title.string: hanya kalau isinya teks tunggal
+        if tag.text and len(tag) == 0:
+            title = clean_text(tag.text.strip())
+        break
+
+    paragraphs = []
+    for p in root.iter("p"):
+        text = clean_text(p.text_content())
+        if len(text) > 50:
+            paragraphs.append(text)
+
+    return title, paragraphs, _collect_meta(root.iter("meta"))
+
+
+EXTRACTORS = {
+    "soup": _extract_soup,
+    "strainer": _extract_strainer,
+}
+if lxml is not None:
+    EXTRACTORS["lxml"] = _extract_lxml
+
+
+def get_extractor(name=HTML_PARSER):
+    """
+    Fungsi extractor HTML: content (bytes), encoding -> (title, paragraphs, meta).
+
+    "auto" memakai lxml kalau terpasang, kalau tidak "strainer".
+    "soup" adalah implementasi lama (referensi).
+    """
+    if name == "auto":
+        name = "lxml" if "lxml" in EXTRACTORS else "strainer"
+    return EXTRACTORS[name]
+
+
+class _StreamExtractor:
+    """
+    Extractor incremental di atas lxml HTMLPullParser.
+
+    Chunk HTML di-feed satu per satu; hasilnya sama dengan backend lxml
+    untuk bagian dokumen yang sudah dibaca. `done` jadi True kalau title,
+    meta og: (atau </head> sudah lewat) dan `max_paragraphs` paragraf sudah
+    terkumpul, jadi sisa body tidak perlu di-download. Elemen yang sudah
+    diproses dibuang dari tree supaya memori tetap kecil.
+    """
+
+    def __init__(self, encoding=None, max_paragraphs=SCRAPE_MAX_PARAGRAPHS):
+        self.parser = lxml.etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self.p_depth = 0
+        self.max_paragraphs = max_paragraphs
+        self.title = None
+        self.title_seen = False
+        self.head_closed = False
+        self.paragraphs = []
+        self.meta = {}
+
+    @property
+    def done(self):
+        if not self.max_paragraphs or len(self.paragraphs) < self.max_paragraphs:
+            return False
+        return self.title_seen and (self.head_closed or len(self.meta) == len(META_PROPS))
+
+    def feed(self, chunk):
+        self.parser.feed(chunk)
+        self._drain()
+
+    def close(self):
+        try:
+            self.parser.close()
+        except lxml.etree.XMLSyntaxError:
+            pass  # dokumen kosong / terpotong
+        self._drain()
+        # Setelah berhenti lebih awal, close() ikut menutup <p> yang baru
+        # terbaca sebagian; buang supaya hasilnya tidak tergantung ukuran chunk
+        if self.max_paragraphs:
+            del self.paragraphs[self.max_paragraphs:]
+        return self.title, self.paragraphs, {prop: self.meta.get(prop) for prop in META_PROPS}
+
+    def _drain(self):
+        for event, el in self.parser.read_events():
+            tag = el.tag
+            if event == "start":
+                if tag == "p":
+                    self.p_depth += 1
+                continue
+
+            if tag == "title" and not self.title_seen:
+                self.title_seen = True
+                if el.text and len(el) == 0:
+                    self.title = clean_text(el.text.strip())
+            elif tag == "meta":
+                prop = el.get("property")
+                if prop in META_PROPS and prop not in self.meta:
+                    content = el.get("content")
+                    self.meta[prop] = clean_text(content) if content is not None else None
+            elif tag == "p":
+                self.p_depth -= 1
+                text = clean_text(lxml.etree.tostring(el, method="text", encoding="unicode", with_tail=False))
+                if len(text) > 50:
+                    self.paragraphs.append(text)
+            elif tag == "head":
+                self.head_closed = True
+
+            # Elemen di luar <p> sudah tidak diperlukan lagi, buang dari tree
+            if self.p_depth == 0:
+                el.clear(keep_tail=True)
+                parent = el.getparent()
+                while parent is not None and el.getprevious() is not None:
+                    del parent[0]
+
+
+def _charset_from_headers(headers):
+    """Charset dari header Content-Type, atau None (biar parser deteksi sendiri)."""
+    match = re.search(r"charset=[\"']?([\w.:-]+)", headers.get("Content-Type", ""), re.I)
+    return match.group(1) if match else None
+
+
+def _is_html(headers):
+    content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+    # Tanpa Content-Type dianggap HTML (banyak server lupa mengirim header)
+    return not content_type or content_type in ("text/html", "application/xhtml+xml")
+
+
+@timed("scrape", ok=bool)
+def scrape_website(url, extractor=None, max_bytes=SCRAPE_MAX_BYTES):
+    """
+    Ambil satu halaman berita.
+
+    Response dibaca secara streaming: yang bukan HTML atau Content-Length-nya
+    lebih dari `max_bytes` ditolak dari header saja, dan download berhenti di
+    `max_bytes`. Dengan backend lxml, chunk langsung di-parse dan download
+    berhenti begitu title, meta og: dan SCRAPE_MAX_PARAGRAPHS paragraf
+    terkumpul.
+    """
+    try:
+        with get_session().get(url, timeout=10, stream=True) as response:
+            if response.status_code != 200:
+                logging.error(f"[x] Gagal ambil {url}: {response.status_code}")
+                return None
+            if not _is_html(response.headers):
+                logging.error(f"[x] Bukan HTML {url}: {response.headers.get('Content-Type')}")
+                return None
+            length = response.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) > max_bytes:
+                logging.error(f"[x] Halaman terlalu besar {url}: {length} bytes")
+                return None
+
+            encoding = _charset_from_headers(response.headers)
+            stream = extractor is None and lxml is not None and HTML_PARSER in ("auto", "lxml")
+            received = 0
+
+            if stream:
+                parser = _StreamExtractor(encoding)
+                for chunk in response.iter_content(chunk_size=16 * 1024):
+                    parser.feed(chunk)
+                    received += len(chunk)
+                    if parser.done or received >= max_bytes:
+                        break
+                title, paragraphs, meta_data = parser.close()
+            else:
+                chunks = []
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if received >= max_bytes:
+                        break
+                extract = extractor or get_extractor()
+                title, paragraphs, meta_data = extract(b"".join(chunks)[:max_bytes], encoding)
+            metrics.add_bytes("scrape", received)
+
+        return {
+            "link": url,
+            "title": title,
+            "paragraphs": paragraphs,
+            "meta": meta_data
+        }
+
+    except Exception as e:
+        logging.error(f"[!] Error scraping {url}: {e}")
+        return None
+
+
+def scrape_concurrent(urls, max_workers=SCRAPE_WORKERS, per_host=SCRAPE_PER_HOST):
+    """
+    Scrape banyak URL secara paralel dengan thread pool.
+
+    Total request dibatasi `max_workers`, request ke host yang sama dibatasi
+    `per_host`. Hasil (dict yang sama dengan `scrape_website`) di-yield begitu
+    selesai, jadi urutannya tidak sama dengan `urls`. URL yang gagal di-skip.
+    """
+    queues = {}
+    for url in urls:
+        host = urlparse(url).netloc.lower()
+        queues.setdefault(host, deque()).append(url)
+
+    active = dict.fromkeys(queues, 0)
+    futures = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        def fill():
+            # Round-robin antar host supaya satu situs tidak memonopoli pool
+            progress = True
+            while progress and len(futures) < max_workers:
+                progress = False
+                for host, queue in queues.items():
+                    if len(futures) >= max_workers:
+                        break
+                    if queue and active[host] < per_host:
+                        fut = pool.submit(scrape_website, queue.popleft())
+                        futures[fut] = host
+                        active[host] += 1
+                        progress = True
+
+        fill()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            results = []
+            for fut in done:
+                active[futures.pop(fut)] -= 1
+                results.append(fut.result())
+            # Isi slot kosong dulu sebelum yield, biar fetch jalan terus
+            # selama consumer sibuk render
+            fill()
+            for result in results:
+                if result:
+                    yield result
@@ -0,0 +1,419 @@
+"""Penyimpanan artikel (SQLite) dengan deteksi duplikat URL dan near-duplicate."""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from .config import DEDUP_MAX_DISTANCE, DEDUP_PARAGRAPHS, LEGACY_JSON, STORE
+from .telemetry import timed
+
+
+# === 3. Simpan artikel tanpa duplikasi ===
+# Parameter tracking yang tidak mengubah isi halaman
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "amp", "outputtype", "_ga", "_gl", "cmpid",
+}
+_HOST_PREFIXES = ("www.", "m.", "amp.")
+
+
+def canonical_url(url):
+    """
+    Bentuk kanonik URL berita untuk cek duplikasi.
+
+    Parameter utm_* dan tracking lain dibuang, host di-lowercase tanpa
+    www./m./amp. dan port default, versi AMP (/amp, .amp, cdn.ampproject.org)
+    diarahkan ke URL aslinya, fragment dibuang, query diurutkan.
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    path = parsed.path or "/"
+
+    # https://www-kompas-com.cdn.ampproject.org/c/s/www.kompas.com/read/...
+    if host.endswith(".cdn.ampproject.org"):
+        parts = path.split("/", 4)
+        if len(parts) == 5 and parts[1] in ("c", "v") and parts[2] == "s":
+            return canonical_url(urlunparse(("https", parts[3], "/" + parts[4], "", parsed.query, "")))
+
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    if path.startswith("/amp/"):
+        path = path[4:]
+    path = path.rstrip("/")
+    if path.endswith("/amp"):
+        path = path[:-4]
+    elif path.endswith(".amp"):
+        path = path[:-4]
+    path = path or "/"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    return urlunparse(("https", host, path, "", urlencode(query), ""))
+
+
+_WORD = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+
+
+def article_sketch(data, paragraphs=DEDUP_PARAGRAPHS):
+    """
+    SimHash 64-bit dari judul + `paragraphs` paragraf pertama.
+
+    Fitur = pasangan kata berurutan (lowercase), di-hash pakai blake2b supaya
+    nilainya sama antar proses (hash() Python diacak per proses). Return None
+    kalau teksnya kosong.
+    """
+    text = " ".join([data.get("title") or ""] + list((data.get("paragraphs") or [])[:paragraphs]))
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    features = words if len(words) < 2 else [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    # Bit ke-i sketch = 1 kalau mayoritas hash fitur punya bit ke-i = 1.
+    # Hitung per kolom string biner (zip + count jalan di C), bukan loop 64x
+    # per fitur di Python.
+    bits = [
+        format(int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big"), "064b")
+        for f in features
+    ]
+    total = len(bits)
+    return int("".join("1" if col.count("1") * 2 > total else "0" for col in zip(*bits)), 2)
+
+
+# int.bit_count baru ada di Python 3.10
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
+
+class SimHashIndex:
+    """
+    Index SimHash di memori untuk cari artikel yang hampir sama.
+
+    64 bit dibagi jadi `max_distance + 1` band. Dua sketch dengan jarak
+    Hamming <= max_distance pasti sama persis di minimal satu band
+    (pigeonhole), jadi lookup cukup cek isi bucket band-nya saja, bukan
+    membandingkan dengan semua artikel.
+    """
+
+    def __init__(self, max_distance=DEDUP_MAX_DISTANCE):
+        self.max_distance = max_distance
+        count = max_distance + 1
+        bounds = [64 * i // count for i in range(count + 1)]
+        self._bands = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(bounds, bounds[1:])]
+        self._buckets = [{} for _ in self._bands]
+        self._links = {}
+
+    def __len__(self):
+        return len(self._links)
+
+    def add(self, sketch, link):
+        if sketch in self._links:
+            return
+        self._links[sketch] = link
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            buckets.setdefault(sketch >> shift & mask, []).append(sketch)
+
+    def find(self, sketch):
+        """Link artikel dengan jarak Hamming <= max_distance, atau None."""
+        max_distance = self.max_distance
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            for other in buckets.get(sketch >> shift & mask, ()):
+                if _popcount(sketch ^ other) <= max_distance:
+                    return self._links[other]
+        return None
+
+
+def _to_sqlite_int(sketch):
+    """SQLite INTEGER itu signed 64-bit."""
+    return sketch - (1 << 64) if sketch is not None and sketch >> 63 else sketch
+
+
+class ArticleStore:
+    """
+    Penyimpanan artikel di SQLite (mode WAL).
+
+    `link` jadi primary key, jadi cek duplikasi dan update status cukup satu
+    lookup index, tidak perlu baca/tulis ulang seluruh riwayat. Tiap operasi
+    commit sendiri sehingga aman kalau proses mati di tengah jalan.
+
+    Tiap artikel juga menyimpan `canonical` (URL tanpa tracking/AMP) dan
+    `simhash` (sketch judul + paragraf awal). Sketch dimuat ke SimHashIndex
+    di memori saat pertama kali dibutuhkan.
+    """
+
+    def __init__(self, path=STORE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    link TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    post_id TEXT,
+                    date TEXT
+                )
+                """
+            )
+        self._migrate()
+        self._index = None
+
+    def _migrate(self):
+        """Tambah kolom canonical/simhash ke database lama lalu isi nilainya."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(articles)")}
+        with self.conn:
+            if "canonical" not in columns:
+                self.conn.execute("ALTER TABLE articles ADD COLUMN canonical TEXT")
+            if "simhash" not in columns:
+                self.conn.execute("ALTER TABLE articles ADD COLUMN simhash INTEGER")
+            rows = self.conn.execute(
+                "SELECT link, data FROM articles WHERE canonical IS NULL"
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE articles SET canonical = ?, simhash = ? WHERE link = ?",
+                [
+                    (canonical_url(link), _to_sqlite_int(article_sketch(json.loads(data))), link)
+                    for link, data in rows
+                ],
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS articles_canonical ON articles (canonical)"
+            )
+        if rows:
+            logging.info(f"[+] {len(rows)} artikel lama diberi canonical/simhash")
+
+    def _load_index(self):
+        index = SimHashIndex()
+        for link, sketch in self.conn.execute(
+            "SELECT link, simhash FROM articles WHERE simhash IS NOT NULL AND status != 'duplicate'"
+        ):
+            index.add(sketch & _MASK64, link)
+        return index
+
+    def near_duplicate(self, sketch):
+        """Link artikel tersimpan yang isinya hampir sama dengan `sketch`, atau None."""
+        if sketch is None:
+            return None
+        with self._lock:
+            if self._index is None:
+                self._index = self._load_index()
+            return self._index.find(sketch)
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def __contains__(self, link):
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM articles WHERE link = ?", (link,)).fetchone()
+        return row is not None
+
+    def add(self, data, sketch=None):
+        """
+        Simpan artikel baru. Return False kalau link atau URL kanoniknya
+        sudah ada. `sketch` boleh diisi kalau sudah dihitung pemanggil.
+        """
+        record = {k: v for k, v in data.items() if k not in ("status", "post_id", "date")}
+        canonical = canonical_url(data["link"])
+        if sketch is None:
+            sketch = article_sketch(data)
+        status = data.get("status", "pending")
+        with self._lock, self.conn:
+            if self.conn.execute(
+                "SELECT 1 FROM articles WHERE canonical = ?", (canonical,)
+            ).fetchone():
+                return False
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO articles (link, data, status, post_id, date, canonical, simhash)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    data["link"],
+                    json.dumps(record, ensure_ascii=False),
+                    status,
+                    data.get("post_id"),
+                    data.get("date"),
+                    canonical,
+                    _to_sqlite_int(sketch),
+                ),
+            )
+            if cur.rowcount == 1 and self._index is not None and sketch is not None and status != "duplicate":
+                self._index.add(sketch, data["link"])
+        return cur.rowcount == 1
+
+    def get(self, link):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data, status, post_id, date FROM articles WHERE link = ?", (link,)
+            ).fetchone()
+        if row is None:
+            return None
+        return self._to_entry(*row)
+
+    @staticmethod
+    def _to_entry(data, status, post_id, date):
+        entry = json.loads(data)
+        entry["status"] = status
+        if post_id:
+            entry["post_id"] = post_id
+        entry["date"] = date
+        return entry
+
+    def update_status(self, link, status="done", post_id=None):
+        """Update status (dan post_id kalau ada). Return False kalau link tidak ada."""
+        with self._lock, self.conn:
+            if post_id:
+                cur = self.conn.execute(
+                    "UPDATE articles SET status = ?, post_id = ? WHERE link = ?",
+                    (status, str(post_id), link),
+                )
+            else:
+                cur = self.conn.execute(
+                    "UPDATE articles SET status = ? WHERE link = ?", (status, link)
+                )
+        return cur.rowcount == 1
+
+    def merge_post_ids(self, link, post_ids, status="done"):
+        """
+        Tambahkan `post_ids` ke post_id tersimpan (dipisah koma, tanpa dobel)
+        dan set status. Baca-gabung-tulis jalan dalam satu BEGIN IMMEDIATE,
+        jadi worker lain yang mem-publish artikel yang sama (platform lain)
+        tidak bisa menimpa ID di antaranya. Return False kalau link tidak ada.
+        """
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute("SELECT post_id FROM articles WHERE link = ?", (link,)).fetchone()
+                if row is not None:
+                    merged = [p for p in (row[0] or "").split(",") if p] + [str(p) for p in post_ids]
+                    self.conn.execute(
+                        "UPDATE articles SET status = ?, post_id = ? WHERE link = ?",
+                        (status, ",".join(dict.fromkeys(merged)), link),
+                    )
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+        return row is not None
+
+    def import_json(self, filename=LEGACY_JSON):
+        """Import sekali jalan dari format lama (list JSON). Return jumlah artikel baru."""
+        with open(filename, "r", encoding="utf-8") as f:
+            all_data = json.load(f)
+
+        rows = []
+        for entry in all_data:
+            if not entry.get("link"):
+                continue
+            record = {k: v for k, v in entry.items() if k not in ("status", "post_id", "date")}
+            rows.append((
+                entry["link"],
+                json.dumps(record, ensure_ascii=False),
+                entry.get("status", "pending"),
+                str(entry["post_id"]) if entry.get("post_id") else None,
+                entry.get("date"),
+                canonical_url(entry["link"]),
+                _to_sqlite_int(article_sketch(entry)),
+            ))
+
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles (link, data, status, post_id, date, canonical, simhash)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._index = None
+            return self.conn.total_changes - before
+
+    def iter_articles(self):
+        """Iterasi semua artikel (urut waktu simpan)."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT data, status, post_id, date FROM articles ORDER BY rowid"
+            ).fetchall()
+        for row in rows:
+            yield self._to_entry(*row)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=STORE):
+    """
+    ArticleStore per path (dibuat sekali per proses).
+
+    Kalau database masih kosong dan file JSON lama ada, isinya di-import dulu.
+    """
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = ArticleStore(path)
+            if len(store) == 0 and os.path.exists(LEGACY_JSON):
+                try:
+                    count = store.import_json(LEGACY_JSON)
+                    logging.info(f"[+] {count} artikel di-import dari {LEGACY_JSON}")
+                except (OSError, json.JSONDecodeError) as e:
+                    logging.error(f"[!] Gagal import {LEGACY_JSON}: {e}")
+            _stores[path] = store
+    return store
+
+
+@timed("save_json")
+def save_to_json(data, filename=STORE):
+    """
+    Simpan hasil scrape. Return True hanya untuk artikel baru yang perlu
+    dirender: link/URL kanonik yang sudah ada di-skip, dan artikel yang
+    hampir sama dengan berita tersimpan (SimHash) disimpan dengan status
+    'duplicate' supaya tidak dirender dan diposting ulang.
+    """
+    if not data:
+        return False
+
+    store = get_store(filename)
+    sketch = article_sketch(data)
+    original = store.near_duplicate(sketch)
+
+    data["status"] = "pending"  # Tambahkan status awal
+    data["date"] = datetime.now().strftime("%Y-%m-%d %I:%M:%S")
+    if original and original != data["link"]:
+        data["status"] = "duplicate"
+        data["duplicate_of"] = original
+
+    if not store.add(data, sketch):
+        logging.info("skip.")
+        return False
+    if data["status"] == "duplicate":
+        logging.info(f"[!] Mirip dengan {original}, skip.")
+        return False
+    return True
+
+def update_status_json(link, status="done", post_id=None, filename=STORE):
+    """Update status artikel berdasarkan link."""
+    try:
+        if get_store(filename).update_status(link, status, post_id):
+            logging.info(f"[✓] Status '{status}' diupdate untuk: {link}")
+        else:
+            logging.warning(f"[!] Link {link} tidak ditemukan di database.")
+
+    except Exception as e:
+        logging.error(f"[!] Gagal update status: {e}")
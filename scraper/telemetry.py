@@ -0,0 +1,177 @@
+"""Metrik latency, byte dan error per stage pipeline."""
+import bisect
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from .config import METRICS_FILE, METRICS_SAMPLES
+
+
+# === Metrik per stage (latency, byte, error) ===
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Metrics:
+    """
+    Histogram latency, counter error dan counter byte per stage pipeline.
+
+    Satu observasi = dua perf_counter, satu bisect dan satu lock, jadi
+    overhead-nya mikrodetik, jauh di bawah waktu stage yang diukur (request
+    HTTP, render, upload). Hasilnya ditulis sekali di akhir run, lihat
+    export(). Dengan `samples` > 0, N latency terakhir per stage juga
+    disimpan supaya kuantil di summary() persis, bukan batas bucket.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, samples=METRICS_SAMPLES):
+        self.buckets = tuple(buckets)
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._latency = {}  # stage -> [count per bucket (+Inf), sum, count]
+        self._samples = {}
+        self._errors = {}
+        self._bytes = {}
+
+    def observe(self, stage, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            hist = self._latency.get(stage)
+            if hist is None:
+                hist = self._latency[stage] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            hist[0][index] += 1
+            hist[1] += seconds
+            hist[2] += 1
+            if self.samples:
+                self._samples.setdefault(stage, deque(maxlen=self.samples)).append(seconds)
+
+    def error(self, stage, count=1):
+        with self._lock:
+            self._errors[stage] = self._errors.get(stage, 0) + count
+
+    def add_bytes(self, stage, count):
+        with self._lock:
+            self._bytes[stage] = self._bytes.get(stage, 0) + count
+
+    @contextlib.contextmanager
+    def timer(self, stage):
+        """Ukur waktu blok `with`; exception dihitung sebagai error lalu diteruskan."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.error(stage)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - t0)
+
+    def _quantile(self, counts, total, q):
+        """Perkiraan kuantil = batas atas bucket tempat kuantil itu jatuh."""
+        target, seen = q * total, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def summary(self):
+        """Ringkasan per stage: count, total/rata-rata detik, p50/p95/p99, error, byte."""
+        with self._lock:
+            latency = {k: (list(v[0]), v[1], v[2]) for k, v in self._latency.items()}
+            samples = {k: sorted(v) for k, v in self._samples.items()}
+            errors, nbytes = dict(self._errors), dict(self._bytes)
+        stages = {}
+        for stage in sorted(set(latency) | set(errors) | set(nbytes)):
+            counts, total, count = latency.get(stage, ([0] * (len(self.buckets) + 1), 0.0, 0))
+            ordered = samples.get(stage)
+            if ordered:
+                quantile = lambda q: round(ordered[min(int(q * len(ordered)), len(ordered) - 1)], 6)
+            else:
+                quantile = lambda q: self._quantile(counts, count, q) if count else None
+            stages[stage] = {
+                "count": count,
+                "seconds_total": round(total, 6),
+                "seconds_mean": round(total / count, 6) if count else None,
+                "p50": quantile(0.5),
+                "p95": quantile(0.95),
+                "p99": quantile(0.99),
+                "errors": errors.get(stage, 0),
+                "bytes": nbytes.get(stage, 0),
+            }
+        return stages
+
+    def prometheus(self, prefix="scraper"):
+        """Metrik dalam format teks Prometheus."""
+        with self._lock:
+            latency = {k: (list(v[0]), v[1], v[2]) for k, v in self._latency.items()}
+            errors, nbytes = dict(self._errors), dict(self._bytes)
+        lines = [
+            f"# HELP {prefix}_stage_seconds Latency per stage pipeline.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, (counts, total, count) in sorted(latency.items()):
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {total}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {count}')
+        for name, help_text, values in (
+            ("errors", "Jumlah error per stage.", errors),
+            ("bytes", "Jumlah byte yang diproses per stage.", nbytes),
+        ):
+            lines.append(f"# HELP {prefix}_stage_{name}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_stage_{name}_total counter")
+            for stage, value in sorted(values.items()):
+                lines.append(f'{prefix}_stage_{name}_total{{stage="{stage}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path=METRICS_FILE):
+        """
+        Tulis metrik ke `path` (atomic replace, "{pid}" diganti PID proses).
+        Return path, atau None kalau path kosong.
+        """
+        if not path:
+            return None
+        path = path.replace("{pid}", str(os.getpid()))
+        if path.endswith(".json"):
+            content = json.dumps(self.summary(), indent=2)
+        else:
+            content = self.prometheus()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return path
+
+
+metrics = Metrics()
+
+
+def timed(stage, ok=None):
+    """
+    Decorator: catat latency fungsi ke `metrics` dengan nama `stage`.
+
+    Exception dihitung sebagai error. Untuk fungsi yang menangkap error
+    sendiri dan mengembalikan None/False, isi `ok` dengan fungsi yang
+    menilai hasilnya (mis. `ok=bool`).
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                metrics.error(stage)
+                raise
+            finally:
+                metrics.observe(stage, time.perf_counter() - t0)
+            if ok is not None and not ok(result):
+                metrics.error(stage)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,43 @@
+"""
+Fixture bersama. Reference implementation versi lama dan server stub lokal
+(RSS, situs berita, API sosmed) diambil dari bench.py, jadi test dan
+benchmark memakai data yang sama.
+"""
+import os
+import sys
+import threading
+
+import pytest
+from PIL import ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+
+import bench  # noqa: E402  (set RENDER_CACHE_MB=0 sebelum scraper di-import)
+import scraper  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    """Server stub lokal (lihat bench._Stub), dimatikan setelah test."""
+    stub = bench._Stub()
+    servers = bench._start_stub_servers(stub)
+    yield stub
+    # shutdown() menunggu poll serve_forever (0.5 s), jadi semua server sekaligus
+    threads = [threading.Thread(target=server.shutdown) for server in servers]
+    for thread in threads:
+        thread.start()
+    for thread, server in zip(threads, servers):
+        thread.join()
+        server.server_close()
+
+
+@pytest.fixture
+def fonts():
+    """Test yang merender poster di-skip kalau FONT_1..3 tidak ada di mesin ini."""
+    for path, size in ((scraper.FONT_1, scraper.FONTSIZE_1), (scraper.FONT_2, scraper.FONTSIZE_2),
+                       (scraper.FONT_3, scraper.FONTSIZE_3)):
+        try:
+            ImageFont.truetype(path, size)
+        except OSError as e:
+            pytest.skip(f"font {path} tidak tersedia: {e}")
@@ -0,0 +1,66 @@
+"""AccountRegistry: satu record per baris per platform, key dari identitas platform."""
+import csv
+
+import bench
+import scraper
+
+HEADER = ["username", "ig_username", "ig_password", "fb_id", "fb_token", *scraper.X_FIELDS]
+
+
+def _write_csv(path, rows, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if mode == "w":
+            writer.writerow(HEADER)
+        for row in rows:
+            writer.writerow([row.get(field, "") for field in HEADER])
+
+
+def test_same_display_name_stays_two_accounts(tmp_path):
+    path = str(tmp_path / "accounts.csv")
+    _write_csv(path, [
+        {"username": "Berita", "ig_username": "ig_satu", "ig_password": "pw"},
+        {"username": "Berita", "ig_username": "ig_dua", "ig_password": "pw"},
+        # Identitas IG sama dengan baris pertama: akun yang sama, dipakai sekali
+        {"username": "Berita Lain", "ig_username": "ig_satu", "ig_password": "pw"},
+    ])
+    registry = scraper.AccountRegistry(path)
+    keys = [scraper.account_key(a) for a in registry.by_platform("IG")]
+    assert keys == ["IG:ig_satu", "IG:ig_dua"]
+    assert registry.get("IG:ig_dua")["credentials"]["ig_username"] == "ig_dua"
+    # Key lama "IG:<nama tampilan>" yang ambigu tidak dipetakan ke akun mana pun
+    assert registry.get("IG:Berita") is None
+
+
+def _mixed_rows(n):
+    """Baris dengan kombinasi platform berbeda (IG/FB/X) seperti di bench_accounts."""
+    rows = []
+    for i in range(n):
+        row = {"username": f"akun {i}"}
+        if i % 2 == 0:
+            row.update(ig_username=f"ig{i}", ig_password="pw")
+        if i % 3 == 0:
+            row.update(fb_id=str(1000 + i), fb_token="token")
+        if i % 2 == 1 or i % 5 == 0:
+            row.update(zip(scraper.X_FIELDS, ["k", "ks", f"a{i}", "at", "bt"]))
+        rows.append(row)
+    return rows
+
+
+def test_every_platform_per_row(tmp_path):
+    path = str(tmp_path / "accounts.csv")
+    _write_csv(path, _mixed_rows(30))
+    registry = scraper.AccountRegistry(path)
+    accounts = {(a["username"], a["sosmed"]) for a in registry.accounts()}
+    # Versi lama hanya memakai platform pertama tiap baris
+    assert {(a["username"], a["sosmed"]) for a in bench._load_accounts_legacy(path)} < accounts
+    assert registry.platforms("akun 0") == ["IG", "FB", "X"]
+
+
+def test_reload_after_file_changes(tmp_path):
+    path = str(tmp_path / "accounts.csv")
+    _write_csv(path, _mixed_rows(5))
+    registry = scraper.AccountRegistry(path)
+    assert registry.get("IG:igbaru") is None
+    _write_csv(path, [{"username": "akun baru", "ig_username": "igbaru", "ig_password": "pw"}], mode="a")
+    assert registry.get("IG:igbaru") is not None
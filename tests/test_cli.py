@@ -0,0 +1,55 @@
+"""Start CLI: perintah ringan tidak meng-import library berat."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import bench
+import scraper.config  # noqa: F401  (load_dotenv: isi .env ikut ke environment subprocess)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def env(tmp_path):
+    """Environment subprocess: data di tmp_path, tanpa feed."""
+    return dict(
+        os.environ,
+        PYTHONPATH=ROOT, RSS_URLS="", RSS_URL="", RSS_GEOS="", STORE="articles.db", LEGACY_JSON="legacy.json",
+        QUEUE_DB="queue.db", REPORT_XLSX="report.xlsx", HTTP_CACHE="http_cache.json", METRICS_FILE="", LOG="app.log",
+    )
+
+
+@pytest.mark.parametrize("command", ["--help", "report"])
+def test_light_commands_skip_heavy_imports(tmp_path, env, command):
+    _, _, modules = bench._importtime(("-m", "scraper", command), str(tmp_path), env)
+    assert not set(bench.HEAVY_MODULES) & set(modules)
+    assert "scraper.jobs" not in modules
+
+
+def test_get_platform_imports_only_its_plugin(tmp_path, env):
+    probe = ("import sys, scraper; scraper.get_platform('X'); "
+             f"print(','.join(m for m in {bench.HEAVY_MODULES!r} if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, "-c", probe], cwd=str(tmp_path), env=env, capture_output=True,
+                            text=True, check=True).stdout.strip().split(",")
+    assert "instagrapi" not in loaded and "cv2" not in loaded
+
+
+@pytest.mark.parametrize("argv", [["--loop", "fetch"], ["fetch", "--loop"], ["--loop"]])
+def test_loop_applies_to_subcommand(argv):
+    from scraper.cli import build_parser
+
+    assert build_parser().parse_args(argv).loop
+
+
+@pytest.mark.parametrize("argv", [
+    ["--worker", "publish"], ["--scheduler", "fetch"], ["--stages", "render", "render"], ["--loop", "report"],
+])
+def test_run_flags_rejected_with_subcommand(argv, capsys):
+    from scraper.cli import main
+
+    with pytest.raises(SystemExit) as exc:
+        main(argv)
+    assert exc.value.code == 2
+    assert "tidak bisa dipakai bersama subcommand" in capsys.readouterr().err
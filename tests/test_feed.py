@@ -0,0 +1,44 @@
+"""parse_news_urls dan FeedTracker (URL yang sudah pernah dilihat tidak diproses ulang)."""
+import sqlite3
+
+import pytest
+
+import bench
+import scraper
+
+FEED = "https://trends.google.com/trending/rss?geo=ID"
+CONTENT = bench._trends_rss(50)
+
+
+def test_parse_news_urls_matches_legacy():
+    assert scraper.parse_news_urls(CONTENT) == bench._parse_news_urls_legacy(CONTENT)
+
+
+def test_tracker_returns_only_new_urls(tmp_path):
+    tracker = scraper.FeedTracker(str(tmp_path / "feed.db"))
+    urls = scraper.parse_news_urls(CONTENT)
+    assert len(tracker.new_urls(FEED, CONTENT)) == len(urls)
+    assert tracker.new_urls(FEED, CONTENT) == []
+    # Item 7 dapat satu berita tambahan: hanya URL itu yang baru
+    changed = bench._trends_rss(50, changed={7})
+    assert tracker.new_urls(FEED, changed) == ["https://news3.example.com/7/3?utm_source=trends"]
+    # Berita yang sama di feed negara lain juga sudah terlihat
+    assert tracker.new_urls("https://trends.google.com/trending/rss?geo=MY", CONTENT) == []
+    tracker.close()
+
+
+def test_crash_before_enqueue_rolls_back(tmp_path):
+    db = str(tmp_path / "queue.db")
+    queue, tracker = scraper.JobQueue(db), scraper.FeedTracker(db)
+    # Crash antara tandai-terlihat dan enqueue: transaksi di-rollback, URL tidak hilang
+    with pytest.raises(sqlite3.OperationalError):
+        with queue.transaction() as conn:
+            tracker.new_urls(FEED, CONTENT, conn)
+            raise sqlite3.OperationalError("database is locked")
+
+    with queue.transaction() as conn:
+        fresh = tracker.new_urls(FEED, CONTENT, conn)
+        added = sum(queue.enqueue("scrape", scraper.canonical_url(url), {"url": url}, conn=conn)
+                    for url in fresh)
+    assert added == len(fresh) == len(set(map(scraper.canonical_url, scraper.parse_news_urls(CONTENT))))
+    tracker.close()
@@ -0,0 +1,35 @@
+"""ImageCache terhadap server stub: batas ukuran, file di luar index, hit tanpa tulis index."""
+import glob
+import os
+
+import scraper
+
+
+def _index_stamp(directory):
+    # index.db + file -wal/-shm SQLite
+    return sorted((p, os.stat(p).st_mtime_ns) for p in glob.glob(os.path.join(directory, "index.db*")))
+
+
+def test_image_cache_limit_and_hits(stub, tmp_path):
+    n = 8
+    directory = str(tmp_path / "bg")
+    probe = scraper.ImageCache(directory, max_bytes=1 << 30)
+    image_size = os.path.getsize(probe.get(f"{stub.news_bases[0]}/img/probe.jpg"))
+    limit = image_size * (n // 2)
+    # File yang tidak tercatat di index (sisa proses lain) ikut dihitung dan dihapus
+    orphan = os.path.join(directory, "0" * 40 + ".jpg")
+    with open(orphan, "wb") as f:
+        f.write(b"x" * image_size)
+    os.utime(orphan, (0, 0))
+
+    cache = scraper.ImageCache(directory, max_bytes=limit)
+    urls = [f"{stub.news_bases[i % len(stub.news_bases)]}/img/{i}.jpg" for i in range(n)]
+    for url in urls:
+        assert cache.get(url)
+    assert sum(size for _, size, _ in cache._entries()) <= limit
+    assert not os.path.exists(orphan)
+
+    before = _index_stamp(directory), stub.requests["img"]
+    for url in urls[-2:]:
+        assert os.path.exists(cache.get(url))
+    assert (_index_stamp(directory), stub.requests["img"]) == before
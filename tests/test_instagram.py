@@ -0,0 +1,70 @@
+"""InstagramSessions dengan Client palsu (bench._FakeInstagram) yang upload ke server stub."""
+import pytest
+
+import bench
+
+instagram = pytest.importorskip("scraper.platforms.instagram")
+from instagrapi.exceptions import LoginRequired  # noqa: E402
+
+
+class _ExpiringInstagram(bench._FakeInstagram):
+    """Client palsu yang menolak session di upload ke-`expire_at` (hitungan bersama)."""
+
+    calls = 0
+    expire_at = None
+
+    def photo_upload(self, path, caption):
+        type(self).calls += 1
+        if type(self).calls == self.expire_at:
+            raise LoginRequired("session expired")
+        return super().photo_upload(path, caption)
+
+
+@pytest.fixture
+def sessions(stub, tmp_path, monkeypatch):
+    _ExpiringInstagram.calls, _ExpiringInstagram.expire_at = 0, None
+    poster = tmp_path / "poster.jpg"
+    poster.write_bytes(stub.image)
+
+    def make():
+        sessions = instagram.InstagramSessions(str(tmp_path / "sessions"),
+                                               lambda: _ExpiringInstagram(stub.news_bases[0]))
+        monkeypatch.setattr(instagram, "_ig_sessions", sessions)
+        return sessions
+
+    def upload(username):
+        return instagram.upload_media(username, "rahasia", image_path=str(poster), caption="x")
+
+    return make, upload
+
+
+def test_one_login_per_account(sessions):
+    make, upload = sessions
+    current = make()
+    for i in range(30):
+        assert upload(f"ig_{i % 3}")
+    assert current.logins == 3
+
+
+def test_relogin_keeps_device(sessions):
+    make, upload = sessions
+    _ExpiringInstagram.expire_at = 5
+    current = make()
+    assert upload("ig_0")
+    uuids = current.clients["ig_0"].get_settings()["uuids"]
+    for _ in range(6):
+        assert upload("ig_0")
+    # Login ulang sekali, dengan device/UUID yang sama
+    assert current.logins == 2
+    assert current.clients["ig_0"].get_settings()["uuids"] == uuids
+
+
+def test_new_process_reuses_saved_session(sessions):
+    make, upload = sessions
+    first = make()
+    assert upload("ig_0")
+    uuids = first.clients["ig_0"].get_settings()["uuids"]
+
+    second = make()
+    assert upload("ig_0")
+    assert second.clients["ig_0"].get_settings()["uuids"] == uuids
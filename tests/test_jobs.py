@@ -0,0 +1,75 @@
+"""run_worker tetap jalan saat stage gagal; job yang sudah di-claim langsung kembali ke antrian."""
+import sqlite3
+import time
+
+import scraper
+from scraper import jobs
+
+
+ACCOUNT = {"sosmed": "IG", "username": "akun", "credentials": {"ig_username": "akun"}}
+
+
+class _Registry:
+    def get(self, key):
+        return ACCOUNT if key == "IG:akun" else None
+
+
+def _queue(tmp_path):
+    return scraper.JobQueue(str(tmp_path / "queue.db"))
+
+
+def _publish_queue(tmp_path, monkeypatch):
+    queue = _queue(tmp_path)
+    queue.enqueue("publish", "link|IG:akun", {"link": "link", "output_file": None, "title": "t",
+                                             "account": "IG:akun"})
+    monkeypatch.setattr(jobs, "get_account_registry", _Registry)
+    return queue
+
+
+def _job_rows(queue, stage):
+    return queue.conn.execute("SELECT status, attempts, error FROM jobs WHERE stage = ?", (stage,)).fetchall()
+
+
+def test_stage_error_returns_claimed_jobs(tmp_path, monkeypatch):
+    queue = _queue(tmp_path)
+    for i in range(3):
+        queue.enqueue("scrape", f"https://news.example.com/{i}", {"url": f"https://news.example.com/{i}"})
+
+    def locked(urls):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(jobs, "scrape_concurrent", locked)
+    jobs.run_worker(queue, stages=("scrape",), once=True, poll=0)
+
+    # Tidak menunggu lease habis: langsung pending lagi, dihitung satu percobaan
+    assert _job_rows(queue, "scrape") == [("pending", 1, "database is locked")] * 3
+
+
+def test_publish_error_releases_reserved_slot(tmp_path, monkeypatch):
+    queue = _publish_queue(tmp_path, monkeypatch)
+    published = []
+    monkeypatch.setattr(jobs, "publish_all", lambda *args, **kwargs: published.append(args))
+
+    def broken(*args):
+        raise OSError("poster rusak")
+
+    monkeypatch.setattr(jobs, "load_poster", broken)
+    jobs.run_worker(queue, stages=("publish",), once=True, poll=0)
+
+    assert not published
+    assert _job_rows(queue, "publish") == [("pending", 1, "poster rusak")]
+    # Slot cadence dilepas: akun boleh langsung posting lagi
+    assert queue.reserve_slot("IG:akun") == 0
+
+
+def test_unknown_publish_is_not_retried(tmp_path, monkeypatch):
+    queue = _publish_queue(tmp_path, monkeypatch)
+    monkeypatch.setattr(jobs, "load_poster", lambda *args: {"poster": b"jpeg"})
+    monkeypatch.setattr(jobs, "publish_all", lambda *args, **kwargs: [
+        {"sosmed": "IG", "username": "akun", "post_id": "", "url_sosmed": "", "status": "unknown",
+         "error": "timeout", "seconds": 1.0}])
+    monkeypatch.setattr(jobs, "record_publish_results", lambda *args: None)
+    jobs.run_worker(queue, stages=("publish",), once=True, poll=0)
+
+    assert _job_rows(queue, "publish") == [("unknown", 1, "timeout")]
+    assert queue.reserve_slot("IG:akun") > time.time()  # slot tetap terpakai
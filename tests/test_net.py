@@ -0,0 +1,25 @@
+"""get_session (keep-alive) dan conditional_get terhadap server stub."""
+import scraper
+
+
+def test_session_reuses_connection(stub):
+    base = stub.news_bases[0]
+    session = scraper.get_session()
+    before = stub.connections
+    for i in range(20):
+        assert session.get(f"{base}/news/{i}", timeout=30).status_code == 200
+    assert stub.connections - before == 1
+
+
+def test_conditional_get_304_only_after_save(stub, tmp_path):
+    cache = str(tmp_path / "http_cache.json")
+    rss = f"{stub.news_bases[0]}/rss?n=20"
+    first = scraper.conditional_get(rss, cache, save=False, timeout=30)
+    # "Crash" sebelum save_validators: request berikutnya tetap dapat feed penuh
+    retry = scraper.conditional_get(rss, cache, save=False, timeout=30)
+    assert (first.status_code, retry.status_code) == (200, 200)
+    assert retry.content == first.content
+
+    scraper.save_validators(rss, retry, cache)
+    again = scraper.conditional_get(rss, cache, timeout=30)
+    assert again.status_code == 304 and not again.content
@@ -0,0 +1,154 @@
+"""
+PosterRenderer dan helper teks poster dibandingkan dengan versi lama di
+bench.py, rendition per platform dan RenderCache.
+"""
+import os
+import random
+import re
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageChops, ImageFont
+
+import bench
+import scraper
+
+
+@pytest.mark.parametrize("title, body, size", [
+    (bench.SAMPLE_TITLE, bench.SAMPLE_BODY, (1200, 675)),
+    ("Singkat", "", (1200, 675)),
+    (bench.SAMPLE_BODY, bench.SAMPLE_TITLE, (1200, 675)),
+    (bench.SAMPLE_TITLE, bench.SAMPLE_BODY, (800, 450)),
+], ids=["berita", "singkat", "judul-panjang", "bg-800"])
+def test_poster_pixel_identical_to_legacy(fonts, tmp_path, title, body, size):
+    bg_path, logo_path = bench._make_assets(str(tmp_path), size)
+    old_path, new_path = str(tmp_path / "old.png"), str(tmp_path / "new.png")
+    bench._buat_poster_legacy(title, body, "#KAMUHARUSTAU", logo_path, bg_path, old_path)
+    scraper.buat_poster(title, body, "#KAMUHARUSTAU", logo_path, bg_path, new_path)
+    with Image.open(old_path) as old, Image.open(new_path) as new:
+        assert old.size == new.size
+        assert ImageChops.difference(old, new).getbbox() is None
+
+
+def test_wrap_text_matches_legacy(fonts):
+    draw = scraper.get_renderer().measure
+    rng = random.Random(42)
+    words = (bench.SAMPLE_TITLE + " " + bench.SAMPLE_BODY).split()
+    corpus = [" ".join(rng.choice(words) for _ in range(rng.randint(3, 60))) for _ in range(40)]
+    for font in (ImageFont.truetype(scraper.FONT_2, scraper.FONTSIZE_2),
+                 ImageFont.truetype(scraper.FONT_3, scraper.FONTSIZE_3)):
+        for max_width in (540, 972, 1080):
+            for text in corpus:
+                old = bench._wrap_text_legacy(draw, text, font, max_width)
+                if "" in old:
+                    continue  # kata lebih lebar dari max_width: versi lama menghasilkan baris kosong
+                assert scraper.wrap_text(draw, text, font, max_width) == old, (text, max_width)
+
+
+# (hasil scrape, body yang diharapkan). Semua muat di POSTER_BODY_HEIGHT
+# untuk font apa pun, jadi tidak bergantung metrik font.
+BODY_GOLDEN = [
+    ({"paragraphs": ["Gempa mengguncang Cianjur. Warga panik.", "BMKG: tidak berpotensi tsunami"], "meta": {}},
+     "Gempa mengguncang Cianjur. Warga panik. BMKG: tidak berpotensi tsunami"),
+    ({"paragraphs": [], "meta": {"og:description": "Harga emas naik lagi hari ini."}},
+     "Harga emas naik lagi hari ini."),
+    ({"paragraphs": ["  ", "Rp1.500 per gram! Apa kata pedagang?"], "meta": {}},
+     "Rp1.500 per gram! Apa kata pedagang?"),
+    ({"paragraphs": [], "meta": {"og:description": None}}, ""),
+]
+
+
+def _body_limits():
+    renderer = scraper.get_renderer()
+    font = renderer.font_body
+    return renderer.measure, font, scraper.POSTER_BODY_HEIGHT // (font.size + renderer.spacing_body)
+
+
+@pytest.mark.parametrize("result, expected", BODY_GOLDEN)
+def test_build_poster_body_golden(fonts, result, expected):
+    assert scraper.build_poster_body(result) == expected
+
+
+def test_fit_sentences_matches_bruteforce(fonts):
+    draw, font, _ = _body_limits()
+    max_width = int(scraper.POSTER_WIDTH * 0.9)
+    rng = random.Random(11)
+    sentences = [s for s in re.split(r'(?<=[.!?])\s+', bench.SAMPLE_BODY) if s]
+    for _ in range(100):
+        picked = [rng.choice(sentences) for _ in range(rng.randint(1, 12))]
+        lines = rng.randint(1, 8)
+        new = scraper.fit_sentences(draw, picked, font, max_width, lines)
+        assert len(scraper.wrap_text(draw, new, font, max_width)) <= lines
+        if len(scraper.wrap_text(draw, picked[0], font, max_width)) > lines:
+            # kalimat pertama sudah kepanjangan: dipotong per kata
+            assert new.endswith("...") and picked[0].startswith(new[:-3].rstrip(",;:")), (picked[0], new)
+            continue
+        assert new == bench._fit_sentences_bruteforce(draw, picked, font, max_width, lines), (picked, lines)
+
+
+@pytest.mark.parametrize("width", [640, 1080])
+def test_body_fits_background(fonts, tmp_path, width):
+    # Background lebih sempit dari POSTER_WIDTH (og:image kecil tidak di-upscale)
+    draw, font, max_lines = _body_limits()
+    bg_path, _ = bench._make_assets(str(tmp_path), (width, width * 9 // 16))
+    body = scraper.build_poster_body({"paragraphs": [bench.SAMPLE_BODY] * 40, "meta": {}}, bg_path=bg_path)
+    assert body
+    assert len(scraper.wrap_text(draw, body, font, int(width * 0.9))) <= max_lines
+
+
+@pytest.mark.parametrize("background", ["gradasi", "foto"])
+def test_renditions_within_budget(fonts, tmp_path, background):
+    size = (scraper.POSTER_WIDTH, scraper.POSTER_WIDTH * 9 // 16)
+    bg_path, logo_path = bench._make_assets(str(tmp_path), size)
+    if background == "foto":
+        bg_path = bench._photo_background(str(tmp_path), size)
+    img = scraper.PosterRenderer(logo_path).compose(bench.SAMPLE_TITLE, bench.SAMPLE_BODY, "#KAMUHARUSTAU", bg_path)
+    renditions = scraper.poster_renditions(img, sorted(scraper.RENDITIONS))
+    assert sorted(renditions) == sorted(scraper.RENDITIONS)
+    for platform, data in renditions.items():
+        canvas_size, max_kb = scraper.RENDITIONS[platform]
+        with Image.open(BytesIO(data)) as poster:
+            assert poster.size == (tuple(canvas_size) if canvas_size else img.size)
+        # Di atas batas hanya kalau kualitas terendah pun masih kebesaran
+        if len(data) > max_kb * 1024:
+            _, quality = scraper.encode_to_budget(scraper.fit_canvas(img, canvas_size), max_kb * 1024,
+                                                  progressive=scraper.POSTER_PROGRESSIVE)
+            assert quality == scraper.POSTER_QUALITY[0], platform
+
+
+@pytest.fixture
+def render_cache(tmp_path, monkeypatch):
+    """RenderCache di tmp_path dipakai render_poster_set selama test."""
+    cache = scraper.RenderCache(str(tmp_path / "cache"), max_bytes=200 * 1024 * 1024)
+    monkeypatch.setattr("scraper.poster._render_cache", cache)
+    return cache
+
+
+def test_render_cache_after_crash(fonts, tmp_path, monkeypatch, render_cache):
+    platforms = sorted(scraper.RENDITIONS)
+    bg_path, logo_path = bench._make_assets(str(tmp_path), (1200, 675))
+    titles = [f"{bench.SAMPLE_TITLE} ({i})" for i in range(6)]
+
+    def run(batch):
+        return [scraper.render_poster_set(title, bench.SAMPLE_BODY, "#KAMUHARUSTAU", bg_path, None,
+                                          platforms, logo_path) for title in batch]
+
+    run(titles[:3])  # batch "crash" setelah 3 poster
+    before = render_cache.stats()
+    results = run(titles)
+    after = render_cache.stats()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (3, 3)
+    assert [cached for _, _, cached in results] == [True] * 3 + [False] * 3
+    assert all(output is not None and sorted(posters) == platforms for output, posters, _ in results)
+
+    # Hasil dari cache sama persis dengan render ulang tanpa cache
+    monkeypatch.setattr("scraper.poster._render_cache", None)
+    assert run(titles[:1])[0][:2] == results[0][:2]
+
+
+def test_render_cache_stays_under_limit(tmp_path):
+    cache = scraper.RenderCache(str(tmp_path / "small"), max_bytes=2 * 1024 * 1024)
+    for i in range(40):
+        cache.put(f"k{i}", {"poster": os.urandom(100 * 1024)})
+    assert sum(size for _, size, _ in cache._entries()) <= cache.max_bytes
+    assert cache.get("k39", ["poster"]) is not None and cache.get("k0", ["poster"]) is None
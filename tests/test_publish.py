@@ -0,0 +1,22 @@
+"""publish_all dengan upload Facebook yang respon-nya terlambat (server stub /slow/, 1.5 s)."""
+from collections import Counter
+
+import pytest
+
+import scraper
+
+facebook = pytest.importorskip("scraper.platforms.facebook")
+
+
+def test_timeout_marks_started_uploads_unknown(stub, monkeypatch):
+    monkeypatch.setattr(facebook, "FB_GRAPH_URL", f"{stub.news_bases[0]}/slow")
+    n, timeout = scraper.PUBLISH_LIMITS["FB"] + 1, 0.5
+    accounts = [{"sosmed": "FB", "username": f"fb {i}", "credentials": {"fb_id": str(i), "fb_token": "t"}}
+                for i in range(n)]
+    results = scraper.publish_all(accounts, None, "caption", timeout=timeout, image_data=stub.image)
+
+    # Upload yang sudah terkirim = "unknown" (jangan di-retry), yang belum mulai = "failed"
+    started = scraper.PUBLISH_LIMITS["FB"]
+    assert Counter(r["status"] for r in results) == Counter({"unknown": started, "failed": n - started})
+    # Request upload ikut berhenti di batas waktu, jadi pool langsung bebas lagi
+    scraper.publish._publish_executors["FB"].submit(lambda: None).result(timeout=timeout)
@@ -0,0 +1,32 @@
+"""RenderPool: poster dirender di process pool sama dengan render di proses utama."""
+import os
+
+import bench
+import scraper
+
+
+def test_render_pool_matches_sequential(fonts, tmp_path):
+    bg_path, logo_path = bench._make_assets(str(tmp_path))
+    job = {"title": bench.SAMPLE_TITLE, "body": bench.SAMPLE_BODY, "hashtag": "#KAMUHARUSTAU", "bg_path": bg_path}
+    expected = str(tmp_path / "expected.jpg")
+    scraper.buat_poster(job["title"], job["body"], job["hashtag"], logo_path, bg_path, expected)
+    with open(expected, "rb") as f:
+        expected = f.read()
+
+    jobs = [dict(job, output_file=str(tmp_path / f"poster_{i}.jpg"), i=i) for i in range(2)]
+    jobs += [dict(job, output_file=None, i=i) for i in range(2, 4)]
+    jobs.append(dict(job, bg_path=str(tmp_path / "tidak-ada.jpg"), output_file=None, i=4))
+    with scraper.RenderPool(max_workers=2, logo_path=logo_path) as pool:
+        for item in jobs:
+            pool.submit(item)
+        done = {item["i"]: item for item in pool.drain()}
+        assert not pool.timings  # direset tiap drain
+
+    assert sorted(done) == list(range(5))
+    for i in range(2):
+        assert done[i]["ok"] and os.path.exists(done[i]["output_file"])
+        with open(done[i]["output_file"], "rb") as f:
+            assert f.read() == expected
+    for i in range(2, 4):
+        assert done[i]["ok"] and done[i]["data"]["poster"] == expected
+    assert not done[4]["ok"]
@@ -0,0 +1,41 @@
+"""ReportSink: journal + flush ke .xlsx, nomor `no` berurutan antar flush dan antar proses."""
+import multiprocessing
+
+from openpyxl import load_workbook
+
+import bench
+import scraper
+
+
+def _rows(path):
+    return list(load_workbook(path, read_only=True).active.iter_rows(min_row=2, values_only=True))
+
+
+def test_flush_appends_numbered_rows(tmp_path):
+    path = str(tmp_path / "report.xlsx")
+    sink = scraper.ReportSink(path)
+    sink.extend(bench._fake_report_row(i) for i in range(5))
+    sink.flush()
+    sink.extend(bench._fake_report_row(i) for i in range(5, 8))
+    sink.flush()
+
+    rows = _rows(path)
+    assert [row[0] for row in rows] == list(range(1, 9))
+    assert [row[3] for row in rows] == [bench._fake_report_row(i)["url_site"] for i in range(8)]
+
+
+def test_processes_share_numbering(tmp_path):
+    # Beberapa proses (worker + `report`) menulis ke file yang sama
+    path = str(tmp_path / "report.xlsx")
+    per_process = 100
+    procs = [multiprocessing.Process(target=bench._report_writer, args=(path, per_process, flush_every))
+             for flush_every in (0, 0, 25)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+    scraper.ReportSink(path).flush()
+
+    numbers = sorted(row[0] for row in _rows(path))
+    assert numbers == list(range(1, len(procs) * per_process + 1))
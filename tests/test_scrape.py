@@ -0,0 +1,111 @@
+"""Extractor HTML dan clean_text dibandingkan dengan versi referensi."""
+import random
+
+import pytest
+
+import bench
+import scraper
+
+PAGES = bench._synthetic_pages(5)
+
+
+def test_clean_text_matches_legacy():
+    # Teks acak (ASCII, kontrol, whitespace Unicode, CJK, emoji, surrogate), seed tetap
+    rng = random.Random(2024)
+    for _ in range(5000):
+        text = bench._random_text(rng)
+        assert scraper.clean_text(text) == bench._clean_text_legacy(text), repr(text)
+
+
+@pytest.mark.parametrize("name", sorted(scraper.EXTRACTORS))
+def test_extractors_match_reference(name):
+    reference = scraper.get_extractor("soup")
+    extract = scraper.get_extractor(name)
+    for page in PAGES:
+        assert extract(page) == reference(page)
+
+
+class _ChunkedResponse:
+    """Response streaming tanpa Content-Length; `sent` = byte yang sudah dibaca."""
+
+    status_code = 200
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    def __init__(self, body, chunk):
+        self.body, self.chunk, self.sent = body, chunk, 0
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self.body), self.chunk):
+            self.sent += min(self.chunk, len(self.body) - i)
+            yield self.body[i:i + self.chunk]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """scrape_website membaca `body` dalam chunk `chunk` byte; return response-nya."""
+    def serve(body, chunk):
+        response = _ChunkedResponse(body, chunk)
+        session = type("Session", (), {"get": lambda self, url, **kw: response})()
+        monkeypatch.setattr("scraper.scrape.get_session", lambda: session)
+        return response
+    return serve
+
+
+@pytest.mark.parametrize("chunk", [1, 100])
+def test_stream_extractor_matches_lxml(chunk):
+    pytest.importorskip("lxml")
+    from scraper.scrape import _StreamExtractor
+
+    reference = scraper.get_extractor("lxml")
+    for page in PAGES[:2]:
+        parser = _StreamExtractor(max_paragraphs=0)
+        for i in range(0, len(page), chunk):
+            parser.feed(page[i:i + chunk])
+        assert parser.close() == reference(page)
+
+
+@pytest.mark.parametrize("chunk", [1, 100])
+def test_stream_extractor_stops_after_max_paragraphs(chunk):
+    pytest.importorskip("lxml")
+    from scraper.scrape import _StreamExtractor
+
+    page = PAGES[0]
+    title, paragraphs, meta = scraper.get_extractor("lxml")(page)
+    parser = _StreamExtractor(max_paragraphs=3)
+    fed = 0
+    while not parser.done and fed < len(page):
+        parser.feed(page[fed:fed + chunk])
+        fed += chunk
+    assert parser.done and fed < len(page)
+    assert parser.close() == (title, paragraphs[:3], meta)
+
+
+@pytest.mark.parametrize("chunk", [1, 100])
+def test_scrape_website_stops_at_max_bytes(serve, chunk):
+    pytest.importorskip("lxml")
+    page = PAGES[0]
+    max_bytes = page.index(b"<article>") + 500
+    response = serve(page, chunk)
+    result = scraper.scrape_website("http://example.com/berita", max_bytes=max_bytes)
+    assert max_bytes <= response.sent < max_bytes + chunk
+    # Hasil = hasil extractor untuk bagian halaman yang sudah di-download
+    assert (result["title"], result["paragraphs"], result["meta"]) == \
+        scraper.get_extractor("lxml")(page[:response.sent])
+
+
+def test_scrape_website_stops_when_parser_done(serve):
+    pytest.importorskip("lxml")
+    page = max(PAGES, key=len)
+    title, paragraphs, meta = scraper.get_extractor("lxml")(page)
+    assert len(paragraphs) > scraper.SCRAPE_MAX_PARAGRAPHS
+    response = serve(page, 100)
+    result = scraper.scrape_website("http://example.com/berita")
+    assert response.sent < len(page)
+    assert result["paragraphs"] == paragraphs[:scraper.SCRAPE_MAX_PARAGRAPHS]
+    assert (result["title"], result["meta"]) == (title, meta)
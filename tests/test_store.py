@@ -0,0 +1,92 @@
+"""ArticleStore: simpan artikel, update status dan post_id dari beberapa proses, dedup."""
+import multiprocessing
+import random
+
+import pytest
+
+import bench
+import scraper
+
+WORDS = (bench.SAMPLE_TITLE + " " + bench.SAMPLE_BODY).split()
+
+
+def _merge_ids(path, worker, n):
+    store = scraper.ArticleStore(path)
+    for i in range(n):
+        store.merge_post_ids("https://news.example.com/a", [f"X:{worker}-{i}"])
+
+
+def test_add_and_update_status(tmp_path):
+    store = scraper.ArticleStore(str(tmp_path / "store.db"))
+    article = {"link": "https://news.example.com/a?utm_source=rss", "title": "Judul", "paragraphs": ["isi"],
+               "meta": {}}
+    assert store.add(article)
+    # URL kanonik sama (tanpa utm) = artikel yang sama
+    assert not store.add(dict(article, link="https://news.example.com/a"))
+    assert store.update_status(article["link"], "done", post_id="IG:1")
+    assert store.get(article["link"])["post_id"] == "IG:1"
+
+
+def test_merge_post_ids_across_processes(tmp_path):
+    path = str(tmp_path / "store.db")
+    store = scraper.ArticleStore(path)
+    store.add({"link": "https://news.example.com/a", "title": "Judul", "paragraphs": ["isi"], "meta": {}})
+    store.merge_post_ids("https://news.example.com/a", ["IG:1"])
+
+    procs = [multiprocessing.Process(target=_merge_ids, args=(path, w, 25)) for w in range(3)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+
+    entry = store.get("https://news.example.com/a")
+    post_ids = entry["post_id"].split(",")
+    assert entry["status"] == "done"
+    assert post_ids[0] == "IG:1" and len(post_ids) == len(set(post_ids)) == 1 + 3 * 25
+    assert not store.merge_post_ids("https://news.example.com/tidak-ada", ["IG:2"])
+
+
+def test_canonical_url_variants():
+    variants = [
+        "https://www.kompas.com/read/2024/01/01/abc?utm_source=trends&utm_medium=rss",
+        "http://m.kompas.com/read/2024/01/01/abc/amp#komentar",
+        "https://amp.kompas.com/amp/read/2024/01/01/abc/?fbclid=XYZ",
+        "https://www-kompas-com.cdn.ampproject.org/c/s/www.kompas.com/read/2024/01/01/abc",
+    ]
+    assert len({scraper.canonical_url(url) for url in variants}) == 1
+
+
+@pytest.fixture
+def dedup_store(tmp_path):
+    """Store berisi 500 artikel acak dengan kosakata yang sama."""
+    rng = random.Random(5)
+    store = scraper.ArticleStore(str(tmp_path / "store.db"))
+    articles = [bench._random_article(rng, i, WORDS) for i in range(500)]
+    for article in articles:
+        store.add(article)
+    yield rng, store, articles
+    store.close()
+
+
+def test_near_duplicate_finds_copies(dedup_store):
+    rng, store, articles = dedup_store
+    for _ in range(50):
+        original = rng.choice(articles)
+        copy = bench._edit_article(rng, original, 0, WORDS)
+        assert store.near_duplicate(scraper.article_sketch(copy)) == original["link"]
+
+    # Salinan yang diedit sedikit: sebagian besar (bukan semua) masih terdeteksi
+    found = 0
+    for _ in range(100):
+        original = rng.choice(articles)
+        copy = bench._edit_article(rng, original, 2, WORDS)
+        found += store.near_duplicate(scraper.article_sketch(copy)) == original["link"]
+    assert found >= 70
+
+
+def test_near_duplicate_no_false_positives(dedup_store):
+    rng, store, articles = dedup_store
+    for i in range(200):
+        other = bench._random_article(rng, len(articles) + i, WORDS)
+        assert store.near_duplicate(scraper.article_sketch(other)) is None
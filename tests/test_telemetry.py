@@ -0,0 +1,48 @@
+"""Metrics dan file export per proses."""
+import json
+import os
+
+import pytest
+
+import bench
+import scraper
+from scraper.cli import metrics_path
+
+
+def test_save_json_reaches_export(tmp_path):
+    db = str(tmp_path / "store.db")
+    before = scraper.metrics.summary().get("save_json", {}).get("count", 0)
+    for i in range(20):
+        scraper.save_to_json(bench._fake_article(i), db)
+    scraper.get_store(db).close()
+
+    with open(scraper.metrics.export(str(tmp_path / "metrics.prom")), encoding="utf-8") as f:
+        assert f'scraper_stage_seconds_count{{stage="save_json"}} {before + 20}' in f.read()
+    with open(scraper.metrics.export(str(tmp_path / "metrics.json")), encoding="utf-8") as f:
+        assert json.load(f)["save_json"]["count"] == before + 20
+
+
+def test_timer_counts_errors():
+    m = scraper.Metrics()
+    with m.timer("ok"):
+        pass
+    with pytest.raises(ValueError):
+        with m.timer("gagal"):
+            raise ValueError
+    summary = m.summary()
+    assert summary["ok"]["count"] == 1 and summary["gagal"]["errors"] == 1
+
+
+@pytest.mark.parametrize("path, long_running, expected", [
+    ("metrics.prom", False, "metrics.prom"),
+    ("metrics.prom", True, "metrics.{pid}.prom"),
+    ("m/{pid}.json", True, "m/{pid}.json"),
+    ("", True, ""),
+])
+def test_metrics_path(path, long_running, expected):
+    assert metrics_path(long_running, path) == expected
+
+
+def test_export_replaces_pid(tmp_path):
+    path = scraper.Metrics().export(str(tmp_path / "metrics.{pid}.prom"))
+    assert path == str(tmp_path / f"metrics.{os.getpid()}.prom") and os.path.exists(path)
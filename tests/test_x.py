@@ -0,0 +1,75 @@
+"""XClients dengan tweepy palsu (bench._FakeXApi/_FakeXClient) terhadap server stub."""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import bench
+import scraper
+
+x = pytest.importorskip("scraper.platforms.x")
+import tweepy  # noqa: E402
+
+CREDENTIALS = ("key", "secret", "access", "token", "bearer")
+
+
+@pytest.fixture
+def clients(stub, tmp_path, monkeypatch):
+    """XClients ke server stub; tunggu rate limit dicatat di `clients.waits`, tidak benar-benar sleep."""
+    waits = []
+    monkeypatch.setattr(x, "time", SimpleNamespace(
+        time=time.time, monotonic=time.monotonic, perf_counter=time.perf_counter, sleep=waits.append,
+    ))
+    base = stub.news_bases[0]
+    clients = x.XClients(max_wait=60, api_factory=lambda *c: bench._FakeXApi(base),
+                         client_factory=lambda *c: bench._FakeXClient(base))
+    clients.waits = waits
+    poster = tmp_path / "poster.jpg"
+    poster.write_bytes(stub.image)
+    clients.post_poster = lambda: clients.post(CREDENTIALS, str(poster), "tweet")
+    return clients
+
+
+def test_exhausted_limit_waits_for_reset(stub, clients):
+    reset = int(time.time()) + 30
+    stub.x_responses.extend([
+        (200, {"x-rate-limit-remaining": "100", "x-rate-limit-reset": "0"}),        # upload
+        (200, {"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(reset)}),   # tweet
+    ])
+    assert clients.post_poster()
+    assert 0 < clients.wait_time(CREDENTIALS) <= 30
+    assert clients.post_poster()
+    assert len(clients.waits) == 1 and 0 < clients.waits[0] <= 30
+
+
+def test_limit_beyond_max_wait_fails(stub, clients):
+    stub.x_responses.extend([
+        (200, {}),
+        (200, {"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(int(time.time()) + 3600)}),
+    ])
+    assert clients.post_poster()
+    uploads = stub.requests["upload_x_media"]
+    with pytest.raises(RuntimeError):
+        clients.post_poster()
+    assert stub.requests["upload_x_media"] == uploads + 1  # upload jalan, tweet tidak
+    assert not clients.waits
+
+
+def test_429_retried_once(stub, clients):
+    reset = str(int(time.time()) + 5)
+    stub.x_responses.append((429, {"x-rate-limit-remaining": "0", "x-rate-limit-reset": reset}))
+    assert clients.post_poster()
+    assert len(clients.waits) == 1
+
+    stub.x_responses.extend([(429, {"x-rate-limit-reset": reset})] * 2)
+    with pytest.raises(tweepy.TooManyRequests):
+        clients.post_poster()
+
+
+def test_latency_reaches_metrics_export(stub, clients):
+    before = scraper.metrics.summary().get("x_tweet", {}).get("count", 0)
+    for _ in range(3):
+        clients.post_poster()
+    assert clients.metrics()["tweet"]["count"] == 3
+    assert scraper.metrics.summary()["x_tweet"]["count"] == before + 3
+    assert 'stage="x_upload"' in scraper.metrics.prometheus()